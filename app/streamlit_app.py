@@ -27,12 +27,14 @@ import sys
 if 'backend.services.jd_ai' in sys.modules:
     importlib.reload(sys.modules['backend.services.jd_ai'])
 from backend.services.jd_ai import generate_jd_bundle, construct_full_ability_list
-from backend.services.resume_parser import parse_uploaded_files_to_df
+from backend.services.resume_parser import parse_uploaded_files_with_signatures
+from backend.core.dedup import dedup_frame
+from backend.core.near_dup import mark_near_duplicates, near_dup_enabled, propagate_scores, split_representatives
 # 🔄 确保 AI 匹配逻辑更新时立即生效
 if 'backend.services.ai_matcher' in sys.modules:
     importlib.reload(sys.modules['backend.services.ai_matcher'])
 from backend.services.ai_matcher import ai_match_resumes_df
-from backend.services.ai_matcher_ultra import ai_match_resumes_df_ultra
+from backend.services.ai_matcher_ultra import ai_match_resumes_df_ultra_batch
 from backend.services.ai_core import generate_ai_summary, generate_ai_email
 # 🔄 强制重新加载日历工具模块，确保使用最新版本
 if 'backend.services.calendar_utils' in sys.modules:
@@ -1261,12 +1263,16 @@ with tab2:
     st.subheader("导入简历（CSV/TXT 示例）并匹配打分")
     uploaded = st.file_uploader("上传简历 CSV（见 data/samples/sample_resumes.csv）或 TXT（单个）", type=["csv","txt"], accept_multiple_files=True)
     if uploaded:
+        skipped = 0
         for f in uploaded:
             if f.name.endswith(".csv"):
-                df = pd.read_csv(f); pipe.ingest_resumes_df(df)
+                pipe.ingest_resumes_csv(f)
             else:
                 txt = f.read().decode("utf-8", errors="ignore"); pipe.ingest_text_resume(txt)
+            skipped += pipe.last_ingest["skipped_duplicates"]
         st.success("已导入")
+        if skipped:
+            st.info(f"按 {'/'.join(pipe.cfg.get('dedup_keys', []))} 跳过 {skipped} 份重复简历，节省 {skipped} 次评分")
     if st.button("批量评分"):
         start = time.time()
         result_df = pipe.score_all(st.session_state.get("job_name"))
@@ -1301,7 +1307,21 @@ with tab2:
 
     if uploaded_files:
         with st.spinner("正在解析简历文件…"):
-            resumes_df = parse_uploaded_files_to_df(uploaded_files)
+            resumes_df, resume_signatures = parse_uploaded_files_with_signatures(uploaded_files)
+        if not resumes_df.empty:
+            # AI 评分前按 dedup_keys 去重，重复简历不再消耗 LLM 调用
+            resumes_df, duplicate_df = dedup_frame(resumes_df, pipe.cfg.get("dedup_keys"))
+            if not duplicate_df.empty:
+                st.info(
+                    f"检测到 {len(duplicate_df)} 份重复简历（{'、'.join(duplicate_df['file'].astype(str))}），"
+                    f"已合并到首份简历，节省 {len(duplicate_df)} 次 AI 评分调用。"
+                )
+            if near_dup_enabled():
+                # 内容近似（小改重投、PDF/DOCX 各一份）的简历聚簇，每簇只评分代表简历
+                resumes_df = mark_near_duplicates(resumes_df, resume_signatures)
+                near_dup_count = int((resumes_df["near_dup_of"] != resumes_df["candidate_id"]).sum())
+                if near_dup_count:
+                    st.info(f"检测到 {near_dup_count} 份内容近似的简历，将复用同簇代表简历的评分，节省 {near_dup_count} 次 AI 评分调用。")
         if resumes_df.empty:
             st.warning("没有解析到有效简历，请检查文件格式。")
         else:
@@ -1333,23 +1353,25 @@ with tab2:
                         _update_job_meta(job_name=job_title)
                     # 添加日志查看器（用于调试）
                     with st.expander("🔍 调试日志（点击查看后端日志）", expanded=False):
-                        st.info("💡 Python的print()输出在运行Streamlit的终端/控制台中，不在浏览器控制台。")
-                        st.info("💡 请查看启动Streamlit的终端窗口，应该能看到 [DEBUG] 开头的日志。")
+                        st.info("💡 后端日志输出在运行Streamlit的终端/控制台（stderr）中，不在浏览器控制台。")
+                        st.info("💡 默认只输出 INFO 及以上级别；启动前设置环境变量 LOG_LEVEL=DEBUG 可看到 [DEBUG] 日志，LOG_JSON=1 输出 JSON 行。")
                         st.code("""
-示例日志格式：
-[DEBUG] ai_match_resumes_df_ultra: 开始批量匹配，共2份简历
-[DEBUG] 简历1/2: 开始评分，文本长度=XXX
-[DEBUG] Ultra引擎.score() 开始: resume_length=XXX
-[DEBUG] S2: 开始动作识别...
-[DEBUG] S9: 构建证据链完成，evidence_chain数量=X
-[DEBUG] 简历1/2: 评分完成，ai_review=True, highlight_tags=X
+示例日志格式（LOG_LEVEL=DEBUG）：
+[DEBUG] backend.services.ai_matcher_ultra: ai_match_resumes_df_ultra: 开始批量匹配，共2份简历
+[DEBUG] backend.services.ai_matcher_ultra: --- 简历1/2: 开始评分，文本长度=XXX ---
+[DEBUG] backend.services.ultra_scoring_engine: Ultra引擎.score() 开始: resume_length=XXX
+[DEBUG] backend.services.scoring_graph: S2: 开始动作识别，cleaned_text长度=XXX
+[DEBUG] backend.services.scoring_graph: S9: 构建证据链完成，evidence_chain数量=X
+[DEBUG] backend.services.ai_matcher_ultra: --- 简历1/2: 评分完成 --- highlight_tags=X, evidence_chains=X
                         """, language="text")
                     
                     with st.spinner("AI 正在智能分析匹配度（Ultra引擎），请稍候…"):
                         # 优先使用Ultra版评分引擎
                         scored_df = None
+                        score_input_df, near_dup_df = split_representatives(resumes_df)
                         try:
-                            scored_df = ai_match_resumes_df_ultra(jd_text, resumes_df, job_title)
+                            # 未配置 LLM Key 时为纯规则评分，按 ULTRA_SCORE_WORKERS 多进程并行；配置了 Key 时内部走逐份评分
+                            scored_df = ai_match_resumes_df_ultra_batch(jd_text, score_input_df, job_title)
                         except Exception as e:
                             import traceback
                             error_trace = traceback.format_exc()
@@ -1360,7 +1382,8 @@ with tab2:
                         
                         # 只有在Ultra引擎失败时才使用标准版本
                         if scored_df is None or scored_df.empty:
-                            scored_df = ai_match_resumes_df(jd_text, resumes_df, job_title)
+                            scored_df = ai_match_resumes_df(jd_text, score_input_df, job_title)
+                        scored_df = propagate_scores(scored_df, near_dup_df)
                     # 确保所有必需字段存在（优先使用Ultra字段，兼容旧字段）
                     score_columns = [
                         "candidate_id",
@@ -0,0 +1,142 @@
+"""
+候选人去重（model_config.json 的 dedup_keys）
+手机号 / 邮箱先归一化再取哈希：
+- 入库时对照 resume 表上 phone_hash / email_hash 索引，并用内存集合拦截同一批次内的重复
+- 上传简历解析后、AI 评分前用内存集合去重，重复简历不再消耗 LLM 调用
+任一去重字段相同即视为同一候选人，保留最先出现的一份。
+"""
+
+import hashlib
+import math
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+
+DEFAULT_DEDUP_KEYS = ("phone", "email")
+
+# 每条 IN 查询的参数上限（低于 SQLite 旧版本 999 的限制）
+_SQL_BATCH = 500
+
+
+def contact_text(value) -> str:
+    """
+    联系方式单元格转字符串：缺失值（None / NaN）为空串；
+    整数值的浮点数（含缺失值的手机号列会被 pandas 读成 float）去掉小数部分，13800000000.0 -> "13800000000"
+    """
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ""
+        if value.is_integer():
+            return str(int(value))
+    return str(value)
+
+
+def normalize_phone(value) -> str:
+    # 字符串形式的 "13800000000.0" 同样去掉小数部分，否则末尾的 0 会被当成号码的一位
+    text = re.sub(r"\.0+$", "", contact_text(value).strip())
+    digits = re.sub(r"\D", "", text)
+    if len(digits) == 13 and digits.startswith("86"):
+        digits = digits[2:]
+    return digits if len(digits) >= 7 else ""
+
+
+def normalize_email(value) -> str:
+    email = contact_text(value).strip().lower()
+    return email if "@" in email else ""
+
+
+NORMALIZERS = {
+    "phone": normalize_phone,
+    "email": normalize_email,
+}
+
+
+def key_hash(field: str, value) -> str:
+    """归一化后的取值哈希；无法归一化（空值、格式不对）时返回空串，不参与去重"""
+    normalized = NORMALIZERS[field](value)
+    if not normalized:
+        return ""
+    return hashlib.sha1(f"{field}:{normalized}".encode("utf-8")).hexdigest()
+
+
+def resolve_dedup_keys(keys: Optional[Iterable[str]]) -> List[str]:
+    """配置中的 dedup_keys 只保留支持的字段；未配置时使用默认值"""
+    if keys is None:
+        keys = DEFAULT_DEDUP_KEYS
+    return [k for k in keys if k in NORMALIZERS]
+
+
+class DedupIndex:
+    """按去重字段哈希记录已见过的候选人；可选地对照数据库中的 {field}_hash 索引"""
+
+    def __init__(self, keys: Optional[Iterable[str]] = None):
+        self.keys = resolve_dedup_keys(keys)
+        self._seen: Dict[str, set] = {k: set() for k in self.keys}
+        self.skipped = 0
+
+    def hashes(self, record: Mapping) -> Dict[str, str]:
+        out = {}
+        for key in self.keys:
+            h = key_hash(key, record.get(key))
+            if h:
+                out[key] = h
+        return out
+
+    def match(self, hashes: Mapping[str, str]) -> Optional[str]:
+        """返回命中的去重字段名，未命中返回 None"""
+        for key, h in hashes.items():
+            if h in self._seen[key]:
+                return key
+        return None
+
+    def add(self, hashes: Mapping[str, str]) -> None:
+        for key, h in hashes.items():
+            self._seen[key].add(h)
+
+    def check_and_add(self, hashes: Mapping[str, str]) -> Optional[str]:
+        matched = self.match(hashes)
+        if matched:
+            self.skipped += 1
+        else:
+            self.add(hashes)
+        return matched
+
+    def load_existing(self, conn, hashes: Iterable[Mapping[str, str]]) -> None:
+        """把这批哈希中已存在于 resume 表的值载入内存集合（走 {field}_hash 索引）"""
+        for key in self.keys:
+            wanted = list({h[key] for h in hashes if key in h} - self._seen[key])
+            for i in range(0, len(wanted), _SQL_BATCH):
+                part = wanted[i:i + _SQL_BATCH]
+                marks = ",".join("?" * len(part))
+                rows = conn.execute(f"SELECT {key}_hash FROM resume WHERE {key}_hash IN ({marks})", part)
+                self._seen[key].update(r[0] for r in rows)
+
+
+def dedup_frame(df: pd.DataFrame, keys: Optional[Sequence[str]] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    上传批次内去重：返回 (保留的简历, 被跳过的简历)。
+    保留行的 duplicate_files 列记录被合并进来的文件名；跳过行的 duplicate_of / dedup_key 说明原因。
+    """
+    index = DedupIndex(keys)
+    kept_rows: List[int] = []
+    dropped: List[Dict] = []
+    owner: Dict[Tuple[str, str], int] = {}
+    merged: Dict[int, List[str]] = {}
+    for pos, record in enumerate(df.to_dict("records")):
+        hashes = index.hashes(record)
+        matched = index.check_and_add(hashes)
+        if matched:
+            first = owner[(matched, hashes[matched])]
+            merged.setdefault(first, []).append(str(record.get("file", "")))
+            dropped.append({**record, "dedup_key": matched, "duplicate_of": df.iloc[first].get("file", "")})
+            continue
+        kept_rows.append(pos)
+        for key, h in hashes.items():
+            owner[(key, h)] = pos
+
+    kept = df.iloc[kept_rows].copy()
+    kept["duplicate_files"] = ["; ".join(merged.get(pos, [])) for pos in kept_rows]
+    return kept.reset_index(drop=True), pd.DataFrame(dropped)
@@ -27,7 +27,7 @@ def call_openai(
     base_url: Optional[str] = None,
 ) -> str:
     try:
-        from openai import OpenAI
+        from backend.services.llm_pool import get_openai_client
     except ImportError as exc:
         raise ImportError("请安装 openai：pip install openai") from exc
 
@@ -36,7 +36,7 @@ def call_openai(
     if not api_key:
         raise ValueError("未设置 OPENAI_API_KEY")
 
-    client = OpenAI(api_key=api_key, base_url=base_url or "https://api.openai.com/v1")
+    client = get_openai_client(api_key, base_url or "https://api.openai.com/v1")
     try:
         response = client.chat.completions.create(
             model=model,
@@ -50,7 +50,7 @@ def call_openai(
 
 def call_siliconflow(prompt: str, model: str = "deepseek-chat", temperature: float = 0.7) -> str:
     try:
-        from openai import OpenAI
+        from backend.services.llm_pool import get_openai_client
     except ImportError as exc:
         raise ImportError("请安装 openai：pip install openai") from exc
 
@@ -63,7 +63,7 @@ def call_siliconflow(prompt: str, model: str = "deepseek-chat", temperature: flo
     if not api_key:
         raise ValueError("未配置 siliconflow_api_key 或 SILICONFLOW_API_KEY")
 
-    client = OpenAI(api_key=api_key, base_url=base_url)
+    client = get_openai_client(api_key, base_url)
     try:
         response = client.chat.completions.create(
             model=model,
@@ -77,7 +77,7 @@ def call_siliconflow(prompt: str, model: str = "deepseek-chat", temperature: flo
 
 def call_claude(prompt: str, model: str = "claude-3-5-sonnet-20241022", temperature: float = 0.7) -> str:
     try:
-        from anthropic import Anthropic
+        from backend.services.llm_pool import get_anthropic_client
     except ImportError as exc:
         raise ImportError("请安装 anthropic：pip install anthropic") from exc
 
@@ -85,7 +85,7 @@ def call_claude(prompt: str, model: str = "claude-3-5-sonnet-20241022", temperat
     if not api_key:
         raise ValueError("未设置 ANTHROPIC_API_KEY")
 
-    client = Anthropic(api_key=api_key)
+    client = get_anthropic_client(api_key)
     try:
         response = client.messages.create(
             model=model,
@@ -0,0 +1,174 @@
+"""
+近似重复简历检测（MinHash + LSH）
+同一份简历小改后重投、或 PDF / DOCX 各投一份时，手机号 / 邮箱 / 文件名去重识别不了。
+这里对 resume_text 取字符 shingle 的 MinHash 签名，LSH 分桶找候选对，
+再用签名估计的 Jaccard 相似度确认，聚成簇后每簇只评分一份代表简历，分数回填到其余成员。
+
+签名在解析工作进程里随文本一起计算（与解析并行），命中缓存的结果在主进程补算；
+签名按 candidate_id 单独返回（parse_uploaded_files_with_signatures），不进入简历 DataFrame。
+
+环境变量：
+- RESUME_NEAR_DUP：0 关闭近似去重（默认开启）
+- RESUME_NEAR_DUP_THRESHOLD：判定为近似重复的 Jaccard 相似度（默认 0.85）
+"""
+
+import os
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+NUM_PERM = 128
+# 16 个 band × 8 行：Jaccard≈0.7 以上的对大概率落入同一桶，之后再按阈值精确确认
+LSH_BANDS = 16
+LSH_ROWS = 8
+SHINGLE_SIZE = 5
+SIGNATURE_COLUMN = "minhash"
+CLUSTER_COLUMN = "near_dup_of"
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+_rng = np.random.default_rng(20240601)
+# multiply-shift 哈希族：h(x) = (a * x + b) >> 32，a 取奇数，uint64 溢出即取模 2^64
+_PERM_A = _rng.integers(1, 2 ** 63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2 ** 63, size=NUM_PERM, dtype=np.uint64)
+_SHINGLE_BASE = np.uint64(1000003)
+
+
+def near_dup_enabled() -> bool:
+    return os.getenv("RESUME_NEAR_DUP", "1").strip() not in ("0", "false", "False", "off")
+
+
+def default_threshold() -> float:
+    try:
+        return float(os.getenv("RESUME_NEAR_DUP_THRESHOLD", "0.85"))
+    except ValueError:
+        return 0.85
+
+
+def _shingle_hashes(text: str, k: int = SHINGLE_SIZE) -> np.ndarray:
+    """去掉空白与标点后取长度 k 的字符 shingle，返回去重后的 32 位滚动哈希"""
+    cleaned = re.sub(r"[\W_]+", "", (text or "").lower())
+    if not cleaned:
+        return np.empty(0, dtype=np.uint64)
+    codes = np.frombuffer(cleaned.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    if len(codes) < k:
+        k = len(codes)
+    n = len(codes) - k + 1
+    h = np.zeros(n, dtype=np.uint64)
+    for j in range(k):
+        h = h * _SHINGLE_BASE + codes[j:j + n]
+    return np.unique(h & _MASK32)
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """文本的 MinHash 签名（NUM_PERM 个 uint32）；空文本返回 None"""
+    shingles = _shingle_hashes(text)
+    if not len(shingles):
+        return None
+    hashed = (_PERM_A[:, None] * shingles[None, :] + _PERM_B[:, None]) >> np.uint64(32)
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def estimate_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def cluster_signatures(signatures: Sequence[Optional[np.ndarray]], threshold: Optional[float] = None) -> List[int]:
+    """
+    返回每个位置所属簇的代表位置（簇内最早出现的一份）。
+    没有签名的位置自成一簇。
+    """
+    threshold = default_threshold() if threshold is None else threshold
+    parent = list(range(len(signatures)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets: Dict[tuple, List[int]] = {}
+    for i, sig in enumerate(signatures):
+        if sig is None:
+            continue
+        for band in range(LSH_BANDS):
+            key = (band, sig[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes())
+            buckets.setdefault(key, []).append(i)
+
+    checked = set()
+    for members in buckets.values():
+        for pos, i in enumerate(members):
+            for j in members[pos + 1:]:
+                if (i, j) in checked:
+                    continue
+                checked.add((i, j))
+                ri, rj = find(i), find(j)
+                if ri != rj and estimate_jaccard(signatures[i], signatures[j]) >= threshold:
+                    # 较早出现的一份作为代表
+                    parent[max(ri, rj)] = min(ri, rj)
+    return [find(i) for i in range(len(signatures))]
+
+
+def mark_near_duplicates(
+    df: pd.DataFrame,
+    signatures: Optional[Mapping[Any, np.ndarray]] = None,
+    id_col: str = "candidate_id",
+    text_col: str = "resume_text",
+    threshold: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    增加 near_dup_of 列：所属簇代表简历的 id（代表自身即为自己的 id）。
+    signatures 为解析阶段算好的 {id: 签名}，缺失的按 text_col 补算。
+    """
+    out = df.copy()
+    if out.empty:
+        out[CLUSTER_COLUMN] = []
+        return out
+    signatures = signatures or {}
+    ids = list(out[id_col])
+    texts = out[text_col] if text_col in out.columns else [""] * len(out)
+    row_signatures = [
+        signatures[i] if isinstance(signatures.get(i), np.ndarray) else minhash_signature(str(text or ""))
+        for i, text in zip(ids, texts)
+    ]
+    reps = cluster_signatures(row_signatures, threshold)
+    out[CLUSTER_COLUMN] = [ids[r] for r in reps]
+    return out
+
+
+def split_representatives(df: pd.DataFrame, id_col: str = "candidate_id"):
+    """拆成 (需要评分的代表简历, 近似重复简历)"""
+    if CLUSTER_COLUMN not in df.columns:
+        return df, df.iloc[0:0]
+    is_rep = df[CLUSTER_COLUMN] == df[id_col]
+    return df[is_rep].copy(), df[~is_rep].copy()
+
+
+def propagate_scores(
+    scored: pd.DataFrame,
+    duplicates: pd.DataFrame,
+    id_col: str = "candidate_id",
+    identity_cols: Iterable[str] = ("candidate_id", "name", "file", "email", "phone", "resume_text", "text_len"),
+) -> pd.DataFrame:
+    """把代表简历的评分结果复制给同簇的近似重复简历（身份字段保留各自的值），按 id 排序返回"""
+    if duplicates.empty or scored.empty or id_col not in scored.columns:
+        return scored
+    by_id = {row[id_col]: row for row in scored.to_dict("records")}
+    rep_files = dict(zip(scored[id_col], scored["file"])) if "file" in scored.columns else {}
+    copies = []
+    for dup in duplicates.to_dict("records"):
+        rep = by_id.get(dup.get(CLUSTER_COLUMN))
+        if rep is None:
+            continue
+        row = dict(rep)
+        for col in identity_cols:
+            if col in dup:
+                row[col] = dup[col]
+        row[CLUSTER_COLUMN] = dup.get(CLUSTER_COLUMN)
+        row["near_duplicate_of"] = rep_files.get(dup.get(CLUSTER_COLUMN), "")
+        copies.append(row)
+    if not copies:
+        return scored
+    merged = pd.concat([scored, pd.DataFrame(copies)], ignore_index=True)
+    return merged.sort_values(id_col, kind="stable").reset_index(drop=True)
@@ -1,9 +1,23 @@
-from typing import Dict, List, Tuple
-from backend.utils.text_utils import contains_any
+import hashlib, json
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+import pandas as pd
+from backend.utils.text_utils import compile_keywords, keyword_pattern, normalize
 
-def _ratio_hits(text: str, kws: List[str]) -> float:
+# 评分逻辑变化时递增，已有评分随之失效并重新计算
+SCORING_VERSION = "1"
+
+GROWTH_KEYWORDS = ["复盘","证书","学习","培训","带队","负责","主导","从0到1","增长","ROI","转化"]
+
+def _hits(text: str, kws: List[str], found: Optional[Set[str]] = None) -> List[str]:
+    # found 为整份文本单次扫描得到的命中模式；未提供时对 text 单独扫描
+    if found is None:
+        return compile_keywords(kws).hits(text)
+    return [k for k in kws if k and keyword_pattern(k) in found]
+
+def _ratio_hits(text: str, kws: List[str], found: Optional[Set[str]] = None) -> float:
     if not kws: return 0.0
-    hits = contains_any(text, kws)
+    hits = _hits(text, kws, found)
     valid = len([k for k in kws if k])
     return len(hits) / max(valid, 1)
 
@@ -12,32 +26,37 @@ def _stability(years: float, companies: str) -> float:
     c = max(len([x for x in (companies or '').split('/') if x.strip()]), 1)
     return min(years/(c*3.0), 1.0)
 
-def _growth(text: str) -> float:
-#     kws = ["复盘","证书","学习","培训","带队","负责","主导","从0到1","增长","ROI","转化"]
-    return min(1.0, len(contains_any(text, kws))/5.0)
+def _growth(text: str, found: Optional[Set[str]] = None) -> float:
+    return min(1.0, len(_hits(text, GROWTH_KEYWORDS, found))/5.0)
+
+def _split_rule(job_rule: Dict, key: str) -> List[str]:
+    return [x.strip() for x in (job_rule.get(key) or '').split(';') if x.strip()]
 
 def compute_scores(job_rule: Dict, row: Dict, weights: Dict[str,float], whitelist: List[str], evidence_max: int=3) -> Tuple[Dict, List[str], float]:
-    must = [x.strip() for x in (job_rule.get('must_have') or '').split(';') if x.strip()]
-    nice = [x.strip() for x in (job_rule.get('nice_to_have') or '').split(';') if x.strip()]
-    exclude = [x.strip() for x in (job_rule.get('exclude_keywords') or '').split(';') if x.strip()]
+    must = _split_rule(job_rule, 'must_have')
+    nice = _split_rule(job_rule, 'nice_to_have')
+    exclude = _split_rule(job_rule, 'exclude_keywords')
     min_years = float(job_rule.get('min_years') or 0)
 
     text_all = ' '.join([str(row.get('skills','')), str(row.get('projects','')), str(row.get('text_raw','')), str(row.get('companies',''))])
 
-    must_ratio = _ratio_hits(text_all, must)
-    nice_ratio = _ratio_hits(text_all, nice)
+    # 文本只 normalize 一次，所有关键词集合合并为一个自动机单次扫描
+    found = compile_keywords(must + nice + exclude + list(whitelist or []) + GROWTH_KEYWORDS).find(normalize(text_all))
+
+    must_ratio = _ratio_hits(text_all, must, found)
+    nice_ratio = _ratio_hits(text_all, nice, found)
     skill_fit  = 0.75*must_ratio + 0.25*nice_ratio
 
-    excluded_hits = contains_any(text_all, exclude)
+    excluded_hits = _hits(text_all, exclude, found)
     if excluded_hits: skill_fit *= 0.5
 
     years = float(row.get('years') or 0)
     exp_year = min(max((years - min_years + 1)/5.0, 0), 1)
-    wl_ratio = _ratio_hits(text_all, whitelist)
+    wl_ratio = _ratio_hits(text_all, whitelist, found)
     exp_rel = 0.7*exp_year + 0.3*wl_ratio
 
     stability = _stability(years, row.get('companies',''))
-    growth    = _growth(text_all)
+    growth    = _growth(text_all, found)
 
     confidence = min(1.0, 0.5 + 0.4*must_ratio - 0.3*len(excluded_hits))
 
@@ -45,9 +64,99 @@ def compute_scores(job_rule: Dict, row: Dict, weights: Dict[str,float], whitelis
 
     evidence=[]
     for kw in must + nice:
-#         if kw and kw in text_all: evidence.append(f"命中:{kw}")
+        if kw and keyword_pattern(kw) in found: evidence.append(f"命中:{kw}")
         if len(evidence)>=evidence_max: break
-#     if excluded_hits: evidence.append("触发排除:" + ",".join(excluded_hits))
+    if excluded_hits: evidence.append("触发排除:" + ",".join(excluded_hits))
 
     return {'score_total': total,'skill_fit': round(skill_fit,4),'exp_relevance': round(exp_rel,4),'stability': round(stability,4),'growth': round(growth,4)}, evidence, round(confidence,4)
 
+
+SCORE_COMPONENTS = ['skill_fit', 'exp_relevance', 'stability', 'growth']
+
+def _column(df: pd.DataFrame, col: str) -> pd.Series:
+    # 与 str(row.get(col, '')) 一致：缺列为空串，其余值按 str() 转换
+    if col not in df.columns:
+        return pd.Series([''] * len(df), index=df.index, dtype=object)
+    return pd.Series([str(v) for v in df[col]], index=df.index, dtype=object)
+
+def _hit_counts(hit: Dict[str, np.ndarray], kws: List[str], n: int) -> np.ndarray:
+    counts = np.zeros(n)
+    for k in kws:
+        if k:
+            counts += hit[keyword_pattern(k)]
+    return counts
+
+def _ratio_columns(hit: Dict[str, np.ndarray], kws: List[str], n: int) -> np.ndarray:
+    if not kws: return np.zeros(n)
+    valid = len([k for k in kws if k])
+    return _hit_counts(hit, kws, n) / max(valid, 1)
+
+def compute_scores_frame(job_rule: Dict, df: pd.DataFrame, weights: Dict[str,float], whitelist: List[str], evidence_max: int=3) -> pd.DataFrame:
+    """
+    compute_scores 的向量化版本：对整张简历表按列计算各维度，再与 scoring_weights 做一次矩阵乘法。
+    返回与 df 同索引的 score_total / skill_fit / exp_relevance / stability / growth / evidence / confidence 列，
+    结果与逐行调用 compute_scores 在四舍五入精度内一致。
+    """
+    must = _split_rule(job_rule, 'must_have')
+    nice = _split_rule(job_rule, 'nice_to_have')
+    exclude = _split_rule(job_rule, 'exclude_keywords')
+    whitelist = list(whitelist or [])
+    min_years = float(job_rule.get('min_years') or 0)
+    n = len(df)
+
+    text_all = _column(df, 'skills') + ' ' + _column(df, 'projects') + ' ' + _column(df, 'text_raw') + ' ' + _column(df, 'companies')
+    norm = text_all.str.lower().str.strip().str.replace(r"\s+", " ", regex=True)
+
+    # 关键词命中矩阵：每个去重后的匹配模式一列
+    patterns = {keyword_pattern(k) for k in must + nice + exclude + whitelist + GROWTH_KEYWORDS if k}
+    hit = {p: norm.str.contains(p, regex=False).to_numpy(dtype=float) for p in patterns}
+
+    must_ratio = _ratio_columns(hit, must, n)
+    nice_ratio = _ratio_columns(hit, nice, n)
+    excluded = _hit_counts(hit, exclude, n)
+    skill_fit = (0.75*must_ratio + 0.25*nice_ratio) * np.where(excluded > 0, 0.5, 1.0)
+
+    years = pd.to_numeric(df['years'], errors='coerce').fillna(0).to_numpy(dtype=float) if 'years' in df.columns else np.zeros(n)
+    exp_year = np.clip((years - min_years + 1)/5.0, 0, 1)
+    exp_rel = 0.7*exp_year + 0.3*_ratio_columns(hit, whitelist, n)
+
+    companies = df['companies'].fillna('').astype(str) if 'companies' in df.columns else pd.Series([''] * n, index=df.index)
+    company_count = np.maximum(companies.str.count(r"[^/]*[^/\s][^/]*").to_numpy(dtype=float), 1)
+    stability = np.where(years <= 0, 0.0, np.minimum(years/(company_count*3.0), 1.0))
+
+    growth = np.minimum(1.0, _hit_counts(hit, GROWTH_KEYWORDS, n)/5.0)
+    confidence = np.minimum(1.0, 0.5 + 0.4*must_ratio - 0.3*excluded)
+
+    components = np.column_stack([skill_fit, exp_rel, stability, growth])
+    total = components @ np.array([weights[c] for c in SCORE_COMPONENTS], dtype=float)
+
+    # 证据文本只涉及少量关键词，按行拼接
+    evidence_kws = [(k, hit[keyword_pattern(k)]) for k in must + nice if k]
+    exclude_kws = [(k, hit[keyword_pattern(k)]) for k in exclude if k]
+    evidence = []
+    for i in range(n):
+        ev = []
+        for kw, col in evidence_kws:
+            if col[i]: ev.append(f"命中:{kw}")
+            if len(ev)>=evidence_max: break
+        excluded_hits = [kw for kw, col in exclude_kws if col[i]]
+        if excluded_hits: ev.append("触发排除:" + ",".join(excluded_hits))
+        evidence.append(ev)
+
+    out = pd.DataFrame(np.round(components, 4), columns=SCORE_COMPONENTS, index=df.index)
+    out.insert(0, 'score_total', np.round(total, 4))
+    out['evidence'] = evidence
+    out['confidence'] = np.round(confidence, 4)
+    return out
+
+def _fingerprint(payload) -> str:
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+def rules_fingerprint(job_rule: Dict, whitelist: List[str], evidence_max: int=3) -> str:
+    """岗位规则集哈希：影响得分的规则字段 + 白名单 + 证据条数 + 评分版本"""
+    rule = {k: (job_rule or {}).get(k) for k in ('must_have', 'nice_to_have', 'exclude_keywords', 'min_years')}
+    return _fingerprint({"rule": rule, "whitelist": list(whitelist or []), "evidence_max": evidence_max, "version": SCORING_VERSION})
+
+def weights_fingerprint(weights: Dict[str,float]) -> str:
+    return _fingerprint({c: float(weights[c]) for c in SCORE_COMPONENTS})
@@ -1,9 +1,67 @@
 """
 能力池映射模块
 将动作映射到能力维度
+
+关键词匹配走预编译的 AbilityIndex：所有能力关键词合成一条正则，扫一遍文本得到能力位掩码。
+AbilityPool / ActionMapping 本身无状态，评分引擎共享模块级的 ABILITY_POOL / ACTION_MAPPING。
 """
 
-from typing import List, Dict, Set
+import re
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional, Set, Tuple
+
+
+@dataclass(frozen=True)
+class AbilityIndex:
+    """关键词 → 能力位掩码的只读索引（第 i 位对应 abilities[i]）"""
+    abilities: Tuple[str, ...]
+    pattern: "re.Pattern"
+    keyword_masks: Mapping[str, int]
+    full_mask: int
+
+    @classmethod
+    def build(cls, ability_keywords: Mapping[str, List[str]]) -> "AbilityIndex":
+        abilities = tuple(ability_keywords)
+        masks: Dict[str, int] = {}
+        for bit, ability in enumerate(abilities):
+            for kw in ability_keywords[ability]:
+                if kw:
+                    masks[kw] = masks.get(kw, 0) | (1 << bit)
+        # 命中较长关键词时，包含在其中的较短关键词也算命中（正则同一位置只会报告一个）
+        keyword_masks: Dict[str, int] = {}
+        for kw in masks:
+            combined = 0
+            for other, m in masks.items():
+                if other in kw:
+                    combined |= m
+            keyword_masks[kw] = combined
+        keywords = sorted(keyword_masks, key=len, reverse=True)
+        pattern = re.compile("|".join(re.escape(kw) for kw in keywords)) if keywords else re.compile(r"(?!)")
+        return cls(
+            abilities=abilities,
+            pattern=pattern,
+            keyword_masks=MappingProxyType(keyword_masks),
+            full_mask=(1 << len(abilities)) - 1,
+        )
+
+    def match_mask(self, text: str) -> int:
+        """一次扫描返回文本命中的能力位掩码"""
+        mask = 0
+        search = self.pattern.search
+        masks = self.keyword_masks
+        m = search(text)
+        while m:
+            mask |= masks[m.group()]
+            if mask == self.full_mask:
+                break
+            # 从下一个字符继续，重叠出现的关键词也不会漏掉
+            m = search(text, m.start() + 1)
+        return mask
+
+    def abilities_from_mask(self, mask: int) -> List[str]:
+        """位掩码按能力定义顺序还原为能力列表"""
+        return [ability for bit, ability in enumerate(self.abilities) if mask >> bit & 1]
 
 
 class AbilityPool:
@@ -61,28 +119,30 @@ class AbilityPool:
         # 默认返回通用能力
         return ["执行力", "服务意识", "组织协调"]
     
+    def match_mask(self, text: str) -> int:
+        """文本命中的能力位掩码（位序见 ABILITY_INDEX.abilities）"""
+        return ABILITY_INDEX.match_mask(text)
+    
     def match_abilities(self, text: str) -> List[str]:
         """匹配文本中的能力"""
-        matched = []
-        
-        for ability, keywords in self.ABILITY_KEYWORDS.items():
-            if any(kw in text for kw in keywords):
-                matched.append(ability)
-        
-        return matched
+        return ABILITY_INDEX.abilities_from_mask(ABILITY_INDEX.match_mask(text))
+
+
+ABILITY_INDEX = AbilityIndex.build(AbilityPool.ABILITY_KEYWORDS)
+ABILITY_POOL = AbilityPool()
 
 
 class ActionMapping:
     """动作到能力的映射"""
     
-    def __init__(self):
-        self.ability_pool = AbilityPool()
+    def __init__(self, ability_pool: Optional[AbilityPool] = None):
+        self.ability_pool = ability_pool or ABILITY_POOL
     
     def map_action_to_abilities(self, action: str, context: str = "") -> List[str]:
         """将动作映射到能力"""
-        # 结合动作和上下文进行匹配
-        text = f"{action} {context}"
-        abilities = self.ability_pool.match_abilities(text)
+        # 结合动作和上下文进行匹配（关键词不含空格，分别匹配再合并与拼接后匹配结果相同）
+        mask = self.ability_pool.match_mask(action) | self.ability_pool.match_mask(context)
+        abilities = ABILITY_INDEX.abilities_from_mask(mask)
         
         # 如果没有匹配到，返回通用能力
         if not abilities:
@@ -104,3 +164,5 @@ class ActionMapping:
         
         return [ability for ability, _ in sorted_abilities[:limit]]
 
+
+ACTION_MAPPING = ActionMapping()
@@ -1,10 +1,18 @@
 # backend/services/ai_client.py
+import asyncio
 import os
 from pathlib import Path
 from dataclasses import dataclass
 
 from dotenv import load_dotenv
-from openai import OpenAI
+
+from backend.services.llm_cache import get_llm_cache, make_cache_key, should_cache
+from backend.services import rate_limiter
+from backend.services.llm_pool import (
+    get_async_anthropic_client,
+    get_async_openai_client,
+    get_openai_client,
+)
 
 # 可靠加载 .env
 ROOT = Path(__file__).resolve().parents[2]
@@ -61,47 +69,82 @@ def fix_messages_for_siliconflow(messages):
 
 
 def get_client_and_cfg():
-    """统一创建 client"""
+    """统一创建 client（进程内复用同一连接池，不再每次新建 OpenAI 实例）"""
     cfg = AIConfig()
-    client = OpenAI(
-        api_key=cfg.api_key,
-        base_url=cfg.base_url
-    )
+    client = get_openai_client(cfg.api_key, cfg.base_url)
     return client, cfg
 
 
+def _build_params(cfg, messages, kwargs):
+    """chat_completion / achat_completion 共用的请求参数规整"""
+    if cfg.provider == "siliconflow":
+        messages = fix_messages_for_siliconflow(messages)
+    kwargs.pop("response_format", None)
+
+    params = {
+        "model": kwargs.pop("model", getattr(cfg, "model", None)),
+        "messages": messages,
+        "temperature": kwargs.pop("temperature", getattr(cfg, "temperature", 0.7)),
+    }
+    if "max_tokens" in kwargs:
+        params["max_tokens"] = kwargs.pop("max_tokens")
+    params.update(kwargs)
+    return {k: v for k, v in params.items() if v is not None}
+
+
+def _cache_lookup(cfg, params, cache):
+    """返回 (cache_key, 命中的响应)；不需要缓存或缓存不可用时 cache_key 为 None"""
+    if not should_cache(params.get("temperature"), cache):
+        return None, None
+    try:
+        extra = {k: v for k, v in params.items() if k not in ("model", "messages", "temperature", "max_tokens")}
+        cache_key = make_cache_key(
+            cfg.provider, params.get("model"), params.get("messages"),
+            params.get("temperature"), params.get("max_tokens"), extra,
+        )
+        return cache_key, get_llm_cache().get(cache_key)
+    except Exception as e:
+        # 缓存不可用时直接走网络请求
+        print(f"[WARNING] LLM缓存读取失败: {str(e)}", flush=True)
+        return None, None
+
+
+def _cache_store(cache_key, result, cfg, params):
+    if not cache_key:
+        return
+    try:
+        get_llm_cache().put(cache_key, result, provider=cfg.provider, model=params.get("model"))
+    except Exception as e:
+        print(f"[WARNING] LLM缓存写入失败: {str(e)}", flush=True)
+
+
 def chat_completion(client, cfg, messages, **kwargs):
     """
     🚀 统一入口:硅基自动修复 messages
     使用新版本的 OpenAI SDK (>=1.0.0) 兼容格式
+    cache: None=按 LLM_CACHE_MODE 决定（默认只缓存 temperature=0）, True=强制缓存, False=绕过缓存
     """
+    cache = kwargs.pop("cache", None)
+
     # 确保 client 是 OpenAI 实例，而不是 openai 模块
     if not hasattr(client, 'chat') or not hasattr(client.chat, 'completions'):
-        # 如果传入的不是正确的 OpenAI 客户端，尝试重新创建
+        # 如果传入的不是正确的 OpenAI 客户端，改用连接池中的客户端
         if cfg.api_key and cfg.base_url:
-            client = OpenAI(
-                api_key=cfg.api_key,
-                base_url=cfg.base_url
-            )
+            client = get_openai_client(cfg.api_key, cfg.base_url)
         else:
             raise ValueError(
                 "客户端对象无效。请确保使用 OpenAI() 实例，而不是 openai 模块。"
                 "如果使用 get_client_and_cfg()，它会返回正确的客户端。"
             )
-    
-    if cfg.provider == "siliconflow":
-        messages = fix_messages_for_siliconflow(messages)
-    kwargs.pop("response_format", None)
 
-    params = {
-        "model": kwargs.pop("model", getattr(cfg, "model", None)),
-        "messages": messages,
-        "temperature": kwargs.pop("temperature", getattr(cfg, "temperature", 0.7)),
-    }
-    if "max_tokens" in kwargs:
-        params["max_tokens"] = kwargs.pop("max_tokens")
-    params.update(kwargs)
-    params = {k: v for k, v in params.items() if v is not None}
+    params = _build_params(cfg, messages, kwargs)
+
+    cache_key, cached = _cache_lookup(cfg, params, cache)
+    if cached is not None:
+        return cached
+
+    # 按 provider 限流（缓存命中不占用配额）
+    rate_limiter.acquire(cfg.provider)
 
     try:
         # 使用新版本的 OpenAI API (>=1.0.0)
@@ -109,7 +152,7 @@ def chat_completion(client, cfg, messages, **kwargs):
         response = client.chat.completions.create(**params)
         
         # 转换为旧格式以保持兼容性
-        return {
+        result = {
             "choices": [{
                 "message": {
                     "content": response.choices[0].message.content,
@@ -117,6 +160,8 @@ def chat_completion(client, cfg, messages, **kwargs):
                 }
             }]
         }
+        _cache_store(cache_key, result, cfg, params)
+        return result
     except AttributeError as e:
         error_msg = str(e)
         if "ChatCompletion" in error_msg or "chat.completions" in error_msg:
@@ -142,3 +187,51 @@ def chat_completion(client, cfg, messages, **kwargs):
             ) from e
         # 重新抛出异常，保留原始错误信息
         raise
+
+
+ANTHROPIC_PROVIDERS = ("claude", "anthropic")
+
+
+async def achat_completion(cfg, messages, **kwargs):
+    """
+    chat_completion 的异步版本，基于连接池中的 AsyncOpenAI / AsyncAnthropic 客户端。
+    返回结构与 chat_completion 相同；缓存与限流规则一致。
+    """
+    cache = kwargs.pop("cache", None)
+    params = _build_params(cfg, messages, kwargs)
+
+    cache_key, cached = _cache_lookup(cfg, params, cache)
+    if cached is not None:
+        return cached
+
+    # 令牌桶是阻塞实现，放到线程里等待，避免卡住事件循环
+    await asyncio.to_thread(rate_limiter.acquire, cfg.provider)
+
+    if cfg.provider in ANTHROPIC_PROVIDERS:
+        client = get_async_anthropic_client(cfg.api_key, cfg.base_url)
+        system_prompt = "\n\n".join(m["content"] for m in params["messages"] if m.get("role") == "system")
+        request = {
+            "model": params["model"],
+            "messages": [m for m in params["messages"] if m.get("role") != "system"],
+            "max_tokens": params.get("max_tokens", 4096),
+            "temperature": params.get("temperature"),
+        }
+        if system_prompt:
+            request["system"] = system_prompt
+        response = await client.messages.create(**{k: v for k, v in request.items() if v is not None})
+        content = "".join(getattr(block, "text", "") for block in response.content)
+        result = {"choices": [{"message": {"content": content, "role": "assistant"}}]}
+    else:
+        client = get_async_openai_client(cfg.api_key, cfg.base_url)
+        response = await client.chat.completions.create(**params)
+        result = {
+            "choices": [{
+                "message": {
+                    "content": response.choices[0].message.content,
+                    "role": response.choices[0].message.role
+                }
+            }]
+        }
+
+    _cache_store(cache_key, result, cfg, params)
+    return result
@@ -1,6 +1,7 @@
 import json
+import os
 import textwrap
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 
 from backend.services.ai_client import get_client_and_cfg, chat_completion
 
@@ -119,25 +120,9 @@ def _parse_llm_json(raw: str) -> Dict[str, Any]:
     raise ValueError("unable to parse ai insights json")
 
 
-def _call_insight_llm(job_title: str, resume_text: str, ability_model: Dict[str, Any], jd_text: str = "") -> Dict[str, Any]:
-    client, cfg = get_client_and_cfg()
-    prompt = textwrap.dedent(
-        f"""
-        你现在是一名专业的 AI 招聘评估官（能力模型专家 + 简历分析专家）。
-        请基于岗位 JD 和候选人简历，按照下述结构化规则输出结果。
-
-        【岗位名称】
-        {job_title}
-
-        【岗位 JD】
-        {jd_text if jd_text else "未提供详细JD"}
-
-        【岗位能力模型（参考）】
-        {json.dumps(ability_model, ensure_ascii=False, indent=2)}
-
-        【候选人简历】
-        {resume_text}
-
+# 评分规则与输出结构：单份与批量模式共用
+_INSIGHT_RULES = textwrap.dedent(
+    """
         ----------------------------------------------
         【评分核心原则】
         ----------------------------------------------
@@ -180,11 +165,11 @@ def _call_insight_llm(job_title: str, resume_text: str, ability_model: Dict[str,
         - 任何岗位相关的行为词
 
         每条证据必须包含：
-        {{
+        {
           "action": "识别的动作",
           "resume_quote": "简历中对应的原文片段",
           "reason": "该动作与岗位的关系解释"
-        }}
+        }
 
         ----------------------------------------------
         【风险识别（最多 3 条）】
@@ -197,11 +182,11 @@ def _call_insight_llm(job_title: str, resume_text: str, ability_model: Dict[str,
         - 与岗位关键动作无证据支撑
 
         格式：
-        {{
+        {
           "risk_type": "风险类型",
           "evidence": "对应的简历内容",
           "reason": "风险原因说明"
-        }}
+        }
 
         ----------------------------------------------
         【人才画像标签（3-6 个）】
@@ -218,61 +203,61 @@ def _call_insight_llm(job_title: str, resume_text: str, ability_model: Dict[str,
         ----------------------------------------------
         请严格输出以下 JSON，不要多字段，不要缺字段：
 
-        {{
-          "score_detail": {{
-            "skill_match": {{
+        {
+          "score_detail": {
+            "skill_match": {
               "score": <0-25>,
               "evidence": [
-                {{
+                {
                   "action": "识别的动作",
                   "resume_quote": "简历原文片段",
                   "reason": "该动作与岗位的关系"
-                }}
+                }
               ]
-            }},
-            "experience_match": {{
+            },
+            "experience_match": {
               "score": <0-25>,
               "evidence": [
-                {{
+                {
                   "action": "识别的动作",
                   "resume_quote": "简历原文片段",
                   "reason": "该动作与岗位的关系"
-                }}
+                }
               ]
-            }},
-            "stability": {{
+            },
+            "stability": {
               "score": <0-25>,
               "evidence": [
-                {{
+                {
                   "action": "任职时长/跳槽频率等",
                   "resume_quote": "简历原文片段",
                   "reason": "稳定性分析"
-                }}
+                }
               ]
-            }},
-            "growth_potential": {{
+            },
+            "growth_potential": {
               "score": <0-25>,
               "evidence": [
-                {{
+                {
                   "action": "学习/总结/扩展等动作",
                   "resume_quote": "简历原文片段",
                   "reason": "成长潜力分析"
-                }}
+                }
               ]
-            }},
+            },
             "final_score": <0-100>
-          }},
+          },
           "risks": [
-            {{
+            {
               "risk_type": "风险类型",
               "evidence": "简历内容",
               "reason": "风险原因"
-            }}
+            }
           ],
           "persona_tags": ["标签1", "标签2", "标签3"],
           "resume_mini": "简历的简短 2–3 行摘要",
           "match_summary": "一句话总结（推荐/需重点关注/不匹配）"
-        }}
+        }
 
         ----------------------------------------------
         【注意事项】
@@ -282,8 +267,36 @@ def _call_insight_llm(job_title: str, resume_text: str, ability_model: Dict[str,
         - match_summary 应为一句话总结（推荐/需重点关注/不匹配）
         - 不要输出额外解释文本，只输出 JSON
         - final_score = skill_match + experience_match + stability + growth_potential
+    """
+)
+
+
+def _insight_header(job_title: str, ability_model: Dict[str, Any], jd_text: str = "") -> str:
+    """岗位名称 + JD + 能力模型前言（批量模式下只出现一次）"""
+    return textwrap.dedent(
+        f"""
+        你现在是一名专业的 AI 招聘评估官（能力模型专家 + 简历分析专家）。
+        请基于岗位 JD 和候选人简历，按照下述结构化规则输出结果。
+
+        【岗位名称】
+        {job_title}
+
+        【岗位 JD】
+        {jd_text if jd_text else "未提供详细JD"}
+
+        【岗位能力模型（参考）】
+        {json.dumps(ability_model, ensure_ascii=False, indent=2)}
         """
     )
+
+
+def _call_insight_llm(job_title: str, resume_text: str, ability_model: Dict[str, Any], jd_text: str = "") -> Dict[str, Any]:
+    client, cfg = get_client_and_cfg()
+    prompt = (
+        _insight_header(job_title, ability_model, jd_text)
+        + f"\n【候选人简历】\n{resume_text}\n"
+        + _INSIGHT_RULES
+    )
     response = chat_completion(
         client,
         cfg,
@@ -355,7 +368,11 @@ def generate_ai_insights(job_title: str, resume_text: str, jd_text: str = "") ->
         import sys
         print(f"[ERROR] AI insights generation failed: {e}", file=sys.stderr)
         return FALLBACK_RESPONSE.copy()
+    return _payload_to_insights(payload, ability_model)
+
 
+def _payload_to_insights(payload: Dict[str, Any], ability_model: Dict[str, Any]) -> Dict[str, Any]:
+    """把 LLM 返回的 JSON 规整成前端使用的 insights 结构"""
     # 解析新的 score_detail 格式
     score_detail = payload.get("score_detail", {})
     if not score_detail:
@@ -414,3 +431,151 @@ def generate_ai_insights(job_title: str, resume_text: str, jd_text: str = "") ->
     }
     return insights
 
+
+INSIGHT_DIMENSIONS = ("skill_match", "experience_match", "stability", "growth_potential")
+
+
+def _is_valid_insight_payload(payload: Any) -> bool:
+    """批量结果逐条校验：必须是对象，且四个维度都有数字分数"""
+    if not isinstance(payload, dict):
+        return False
+    score_detail = payload.get("score_detail")
+    if not isinstance(score_detail, dict):
+        return False
+    for dim in INSIGHT_DIMENSIONS:
+        item = score_detail.get(dim)
+        if not isinstance(item, dict):
+            return False
+        try:
+            float(item.get("score"))
+        except (TypeError, ValueError):
+            return False
+    return True
+
+
+def _parse_llm_json_array(raw: str) -> List[Any]:
+    if not raw:
+        raise ValueError("empty content")
+    text = raw.strip()
+    if text.startswith("```"):
+        text = text.strip("`").replace("json", "", 1).strip()
+    candidates = [text]
+    start = text.find("[")
+    end = text.rfind("]")
+    if 0 <= start < end:
+        candidates.append(text[start : end + 1])
+    for cand in candidates:
+        try:
+            data = json.loads(cand)
+        except Exception:
+            continue
+        if isinstance(data, dict):
+            # 部分模型会包一层 {"results": [...]}
+            data = next((v for v in data.values() if isinstance(v, list)), None)
+        if isinstance(data, list):
+            return data
+    raise ValueError("unable to parse ai insights json array")
+
+
+def _call_insight_llm_batch(
+    job_title: str,
+    candidates: List[Tuple[str, str]],
+    ability_model: Dict[str, Any],
+    jd_text: str = "",
+) -> Dict[str, Any]:
+    """一次请求评估多份简历，返回 {candidate_id: 原始 payload}"""
+    client, cfg = get_client_and_cfg()
+    resume_blocks = "\n\n".join(
+        f'<candidate id="{cid}">\n{text}\n</candidate>' for cid, text in candidates
+    )
+    batch_rules = textwrap.dedent(
+        f"""
+        ----------------------------------------------
+        【批量输出要求】
+        ----------------------------------------------
+        - 以上共 {len(candidates)} 位候选人，请对每位候选人分别独立评估，互不参考
+        - 每位候选人输出一个上述 JSON 对象，并额外包含 "candidate_id" 字段（取 <candidate id> 的值）
+        - 最终只输出一个 JSON 数组，按候选人顺序排列，不要输出任何其他内容
+        """
+    )
+    prompt = (
+        _insight_header(job_title, ability_model, jd_text)
+        + f"\n【候选人简历列表】\n{resume_blocks}\n"
+        + _INSIGHT_RULES
+        + batch_rules
+    )
+    response = chat_completion(
+        client,
+        cfg,
+        messages=[
+            {"role": "system", "content": "你是一名能够输出结构化人才洞察的AI人才顾问。"},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=cfg.temperature,
+        max_tokens=min(1500 * len(candidates), 8000),
+    )
+    content = response["choices"][0]["message"]["content"]
+    payloads: Dict[str, Any] = {}
+    for item in _parse_llm_json_array(content):
+        if isinstance(item, dict) and item.get("candidate_id") is not None:
+            payloads[str(item["candidate_id"])] = item
+    return payloads
+
+
+def default_insight_batch_size() -> int:
+    """AI_INSIGHTS_BATCH_SIZE：每次请求打包的简历数，<=1 表示不启用批量模式"""
+    try:
+        return max(1, int(os.getenv("AI_INSIGHTS_BATCH_SIZE", "1")))
+    except ValueError:
+        return 1
+
+
+def generate_ai_insights_batch(
+    job_title: str,
+    candidates: List[Tuple[str, str]],
+    jd_text: str = "",
+    batch_size: Optional[int] = None,
+    resume_char_limit: int = 3000,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    批量模式：每 batch_size 份截断后的简历共用一份 JD + 能力模型前言，合并为一次请求。
+    candidates 为 [(candidate_id, resume_text), ...]，返回 {candidate_id: insights}。
+    批量结果中缺失或校验失败的候选人，单独调用 generate_ai_insights 重新请求。
+    """
+    job_title = (job_title or "").strip()
+    jd_text = (jd_text or "").strip()
+    batch_size = batch_size or default_insight_batch_size()
+    ability_model = ability_model_generator(job_title)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    retry: List[Tuple[str, str]] = []
+    valid = []
+    for cid, text in candidates:
+        text = (text or "").strip()
+        if not job_title or not text:
+            results[str(cid)] = FALLBACK_RESPONSE.copy()
+        else:
+            valid.append((str(cid), text))
+
+    for start in range(0, len(valid), max(batch_size, 1)):
+        chunk = valid[start : start + batch_size]
+        if len(chunk) == 1:
+            retry.extend(chunk)
+            continue
+        trimmed = [(cid, _trim(text, resume_char_limit)) for cid, text in chunk]
+        try:
+            payloads = _call_insight_llm_batch(job_title, trimmed, ability_model, jd_text)
+        except Exception as e:
+            import sys
+            print(f"[ERROR] AI insights batch generation failed: {e}", file=sys.stderr)
+            payloads = {}
+        for cid, text in chunk:
+            payload = payloads.get(cid)
+            if _is_valid_insight_payload(payload):
+                results[cid] = _payload_to_insights(payload, ability_model)
+            else:
+                retry.append((cid, text))
+
+    for cid, text in retry:
+        results[cid] = generate_ai_insights(job_title, text, jd_text)
+    return results
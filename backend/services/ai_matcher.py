@@ -16,7 +16,12 @@ from typing import Any, Dict, Iterable, List, Sequence, Tuple
 
 import pandas as pd
 
-from backend.services.ai_insights import FALLBACK_RESPONSE, generate_ai_insights
+from backend.services.ai_insights import (
+    FALLBACK_RESPONSE,
+    default_insight_batch_size,
+    generate_ai_insights,
+    generate_ai_insights_batch,
+)
 from backend.services.text_rules import sanitize_for_job, strip_competition_terms
 
 
@@ -430,6 +435,26 @@ def _heuristic_score_from_text(
     }
 
 
+def _graph_score_from_text(graph, resume_text: str) -> Dict[str, Any]:
+    """用 ScoringGraph 规则推理给出与启发式评分同结构的结果（级联 Stage 1 使用）"""
+    result = graph.execute(resume_text or "")
+    short_eval = (
+        f"[规则引擎] 总体 {result.final_score:.0f} 分｜{result.match_level}"
+    )
+    return {
+        "总分": round(result.final_score, 1),
+        "维度得分": {
+            "技能匹配度": round(result.skill_match_score, 1),
+            "经验相关性": round(result.experience_match_score, 1),
+            "成长潜力": round(result.growth_potential_score, 1),
+            "稳定性": round(result.stability_score, 1),
+        },
+        "证据": [ev.resume_quote for ev in result.evidence_chain[:3] if ev.resume_quote],
+        "简评": short_eval,
+        "short_eval": short_eval,
+    }
+
+
 def _normalize_ai_scores(data: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
     """
     将大模型返回的 0-30 / 0-20 分制，统一映射到 0-100。
@@ -549,6 +574,8 @@ except Exception:
     pass  # 如果设置失败，继续执行
 
 from backend.services.ai_client import get_client_and_cfg, chat_completion
+from backend.services.batch_executor import default_row_timeout, run_bounded
+from backend.services import cascade_scorer
 from backend.services.competency_utils import determine_competency_strategy
 from backend.utils.sanitize import sanitize_ai_output, SYSTEM_PROMPT
 from backend.services.text_rules import sanitize_for_job, infer_job_family
@@ -737,8 +764,18 @@ def _generate_short_eval(client, cfg, resume_text: str, jd_text: str, job_title:
         return f"【优势】\n1. 无明显优势\n\n【劣势】\n1. 无明显劣势\n\n【匹配度】\n低 {error_msg}"
 
 
-def ai_score_one(client, cfg, jd_text: str, resume_text: str, job_title: str = "") -> Dict[str, Any]:
-    """综合启发式匹配和智能诊断，输出统一结构。"""
+def ai_score_one(
+    client,
+    cfg,
+    jd_text: str,
+    resume_text: str,
+    job_title: str = "",
+    insights: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
+    """
+    综合启发式匹配和智能诊断，输出统一结构。
+    insights: 已由批量模式生成的 AI 洞察，传入时不再单独请求 LLM。
+    """
     safe_resume_text = _safe_str(resume_text or "")
     jd_clean = (jd_text or "").strip()
     job_title_clean = (job_title or "").strip()
@@ -758,7 +795,8 @@ def ai_score_one(client, cfg, jd_text: str, resume_text: str, job_title: str = "
         insights = FALLBACK_RESPONSE.copy()
     else:
         heuristic_scores = _heuristic_score_from_text(jd_text, safe_resume_text, job_title_clean)
-        insights = generate_ai_insights(job_title_clean, safe_resume_text, jd_clean)
+        if insights is None:
+            insights = generate_ai_insights(job_title_clean, safe_resume_text, jd_clean)
 
     data = dict(heuristic_scores)
     data["ability_model"] = insights.get("ability_model", {})
@@ -842,9 +880,23 @@ def ai_score_one(client, cfg, jd_text: str, resume_text: str, job_title: str = "
 
 
 
-def ai_match_resumes_df(jd_text: str, resumes_df: pd.DataFrame, job_title: str = "") -> pd.DataFrame:
+def ai_match_resumes_df(
+    jd_text: str,
+    resumes_df: pd.DataFrame,
+    job_title: str = "",
+    max_workers: int | None = None,
+    row_timeout: float | None = None,
+    insight_batch_size: int | None = None,
+    cascade: Dict[str, Any] | None = None,
+) -> pd.DataFrame:
     """
     对外统一入口：基于 AI 打分，失败时自动回退到启发式评分，避免“全 0 分”。
+
+    多份简历并发调用 ai_score_one（max_workers 默认取 AI_BATCH_CONCURRENCY），
+    输出行顺序与输入一致；单条失败或超过 row_timeout 秒只回退该条到启发式评分。
+    insight_batch_size > 1（默认取 AI_INSIGHTS_BATCH_SIZE）时，AI 洞察按批打包请求。
+    cascade: 级联评分配置（默认读取 model_config.json 的 cascade 段）；启用后只有
+    Stage 1 的 Top-K 与不确定区间简历调用 LLM，score_stage 列记录每行由哪一级决定。
     """
     # 在函数开始时设置 stdout 编码，避免后续编码错误
     try:
@@ -899,20 +951,80 @@ def ai_match_resumes_df(jd_text: str, resumes_df: pd.DataFrame, job_title: str =
         else:
             resumes_df["resume_text"] = ""
 
-    rows = []
-    for idx in resumes_df.index:
-        resume_text = _safe_str(resumes_df.loc[idx, "resume_text"] or "")
-        file_name = resumes_df.loc[idx, "file"] if "file" in resumes_df.columns else ""
+    resume_texts = [_safe_str(resumes_df.loc[idx, "resume_text"] or "") for idx in resumes_df.index]
+    positions = list(range(len(resume_texts)))
+
+    # 级联评分：Stage 1 本地打分，只把 Top-K 与不确定区间交给 LLM
+    stage1_results: Dict[int, Dict[str, Any]] = {}
+    llm_positions = positions
+    cascade_cfg = cascade if cascade is not None else cascade_scorer.load_cascade_config()
+    if ai_available and cascade_cfg.get("enabled"):
+        if cascade_cfg.get("stage1") == "graph":
+            from backend.services.scoring_graph import ScoringGraph
 
-        if ai_available:
-            try:
-                result = ai_score_one(client, cfg, jd_text, resume_text, effective_job_label)
-            except Exception as e:
-                # 如果单条 AI 调用失败，回退到启发式评分
-                result = _heuristic_score_from_text(jd_text, resume_text, effective_job_label)
-                result["short_eval"] = result.get("short_eval") or f"AI智能评价失败：{_safe_str(e)}"
+            graph = ScoringGraph(effective_job_label, jd_text)
+            stage1_label = cascade_scorer.STAGE_GRAPH
+            stage1_all = [_graph_score_from_text(graph, text) for text in resume_texts]
         else:
-            result = _heuristic_score_from_text(jd_text, resume_text, effective_job_label)
+            stage1_label = cascade_scorer.STAGE_HEURISTIC
+            stage1_all = [_heuristic_score_from_text(jd_text, text, effective_job_label) for text in resume_texts]
+        selected = cascade_scorer.select_for_llm([float(r.get("总分", 0)) for r in stage1_all], cascade_cfg)
+        llm_positions = [pos for pos in positions if pos in selected]
+        for pos in positions:
+            if pos not in selected:
+                stage1_results[pos] = dict(stage1_all[pos], score_stage=stage1_label)
+        _safe_print(f"[AI matcher] 级联评分：{len(resume_texts)} 份简历中 {len(llm_positions)} 份进入 LLM 精评")
+
+    # 批量模式：先按批生成 AI 洞察（多批之间同样并发），再逐条合并评分
+    precomputed: List[Dict[str, Any] | None] = [None] * len(resume_texts)
+    batch_size = insight_batch_size if insight_batch_size is not None else default_insight_batch_size()
+    if ai_available and batch_size > 1 and len(llm_positions) > 1 and jd_text and jd_text.strip():
+        chunks = [llm_positions[i:i + batch_size] for i in range(0, len(llm_positions), batch_size)]
+
+        def _chunk_insights(chunk: List[int]) -> Dict[str, Any]:
+            return generate_ai_insights_batch(
+                effective_job_label,
+                [(str(i), resume_texts[i]) for i in chunk],
+                jd_text,
+                batch_size=len(chunk),
+            )
+
+        for chunk_result in run_bounded(chunks, _chunk_insights, lambda chunk, err: {}, max_workers=max_workers):
+            for key, value in (chunk_result or {}).items():
+                precomputed[int(key)] = value
+
+    def _score(pos: int) -> Dict[str, Any]:
+        result = ai_score_one(client, cfg, jd_text, resume_texts[pos], effective_job_label, insights=precomputed[pos])
+        result["score_stage"] = cascade_scorer.STAGE_LLM
+        return result
+
+    def _fallback(pos: int, err: BaseException) -> Dict[str, Any]:
+        # 如果单条 AI 调用失败，回退到启发式评分
+        result = _heuristic_score_from_text(jd_text, resume_texts[pos], effective_job_label)
+        result["short_eval"] = result.get("short_eval") or f"AI智能评价失败：{_safe_str(err)}"
+        result["score_stage"] = cascade_scorer.STAGE_LLM_FALLBACK
+        return result
+
+    if ai_available:
+        llm_results = run_bounded(
+            llm_positions,
+            _score,
+            _fallback,
+            max_workers=max_workers,
+            timeout=row_timeout if row_timeout is not None else default_row_timeout(),
+        )
+        by_position = dict(stage1_results)
+        by_position.update(zip(llm_positions, llm_results))
+        results = [by_position[pos] for pos in positions]
+    else:
+        results = [
+            dict(_heuristic_score_from_text(jd_text, text, effective_job_label), score_stage=cascade_scorer.STAGE_HEURISTIC)
+            for text in resume_texts
+        ]
+
+    rows = []
+    for idx, resume_text, result in zip(resumes_df.index, resume_texts, results):
+        file_name = resumes_df.loc[idx, "file"] if "file" in resumes_df.columns else ""
 
         # 构建行数据
         short_eval_struct = result.get("short_eval_struct") or {}
@@ -942,6 +1054,8 @@ def ai_match_resumes_df(jd_text: str, resumes_df: pd.DataFrame, job_title: str =
                 "text_len": resumes_df.loc[idx, "text_len"] if "text_len" in resumes_df.columns else len(resume_text),
             }
         
+        row_data["score_stage"] = result.get("score_stage", cascade_scorer.STAGE_LLM)
+
         # 添加新格式的字段（如果存在）
         if "score_explain" in result:
             row_data["score_explain"] = result["score_explain"]
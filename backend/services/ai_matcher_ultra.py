@@ -2,59 +2,82 @@
 Ultra版 AI 匹配器 - 集成新的评分引擎
 """
 
-from typing import Dict, Any
+import logging
+import math
+import os
+import time
+from typing import Dict, Any, List, Optional, Tuple
 import pandas as pd
 
+from backend.services.ai_client import AIConfig
+from backend.services.batch_executor import run_bounded_processes
 from backend.services.ultra_scoring_engine import UltraScoringEngine
+from backend.utils.log import get_logger
 
+logger = get_logger(__name__)
 
-def ai_score_one_ultra(jd_text: str, resume_text: str, job_title: str = "") -> Dict[str, Any]:
+
+def _log_chain_status(result: Dict[str, Any]) -> None:
+    """调试日志：Ultra字段与推理链状态（调用方已确认 DEBUG 开启）"""
+    logger.debug(
+        "Ultra字段状态: ai_review=%s, highlight_tags=%d, persona_tags=%d",
+        bool(result.get('ai_review')), len(result.get('highlight_tags', [])), len(result.get('persona_tags', [])),
+    )
+    for label, key in (("strengths_chain", "strengths_reasoning_chain"), ("weaknesses_chain", "weaknesses_reasoning_chain")):
+        chain = result.get(key, {})
+        is_dict = isinstance(chain, dict)
+        logger.debug(
+            "%s存在: %s, conclusion=%s, ai_reasoning长度=%d",
+            label, bool(chain),
+            chain.get('conclusion', 'N/A') if is_dict else 'N/A',
+            len(chain.get('ai_reasoning', '')) if is_dict else 0,
+        )
+
+
+def ai_score_one_ultra(
+    jd_text: str,
+    resume_text: str,
+    job_title: str = "",
+    engine: Optional[UltraScoringEngine] = None,
+) -> Dict[str, Any]:
     """
     Ultra版评分函数
     
     使用新的标准化推理框架（S1-S9）和Ultra字段生成器
+    engine: 可选的岗位级引擎，批量评分时传入同一个实例以复用岗位标准能力模型
     """
     try:
-        import time
-        import sys
         start_time = time.time()
-        # 强制刷新输出，确保日志立即显示
-        print(f"[DEBUG] >>> 开始Ultra引擎评分: job_title={job_title}, resume_length={len(resume_text)}", flush=True)
-        sys.stdout.flush()
+        logger.debug("开始Ultra引擎评分: job_title=%s, resume_length=%d", job_title, len(resume_text))
         
-        engine = UltraScoringEngine(job_title, jd_text)
+        if engine is None:
+            engine = UltraScoringEngine(job_title, jd_text)
         result = engine.score(resume_text)
         
         elapsed_time = time.time() - start_time
-        print(f"[DEBUG] >>> Ultra引擎评分完成，耗时: {elapsed_time:.2f}秒", flush=True)
-        sys.stdout.flush()
+        logger.debug("Ultra引擎评分完成，耗时: %.2f秒", elapsed_time)
         
-        # 调试：输出原始结果的关键字段（强制刷新）
-        import sys
-        print(f"[DEBUG] >>> RAW ULTRA RESULT:", flush=True)
-        print(f"  - error_code: {result.get('error_code')}", flush=True)
-        print(f"  - 总分: {result.get('总分', 0)}", flush=True)
-        print(f"  - ai_review存在: {bool(result.get('ai_review'))}", flush=True)
-        print(f"  - highlight_tags数量: {len(result.get('highlight_tags', []))}", flush=True)
-        print(f"  - evidence_chain数量: {len(result.get('evidence_chains', {}))}", flush=True)
-        print(f"  - detected_actions_count: {result.get('detected_actions_count', 0)}", flush=True)
-        sys.stdout.flush()
+        # 调试：输出原始结果的关键字段
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "RAW ULTRA RESULT: error_code=%s, 总分=%s, ai_review存在=%s, highlight_tags数量=%d, "
+                "evidence_chain数量=%d, detected_actions_count=%s",
+                result.get('error_code'), result.get('总分', 0), bool(result.get('ai_review')),
+                len(result.get('highlight_tags', [])), len(result.get('evidence_chains', {})),
+                result.get('detected_actions_count', 0),
+            )
         
-        # 调试：检查是否有错误
+        # 检查是否有错误
         if result.get("error_code"):
-            print(f"[WARNING] Ultra引擎返回错误: {result.get('error_code')} - {result.get('error_message')}", flush=True)
-            sys.stdout.flush()
+            logger.warning("Ultra引擎返回错误: %s - %s", result.get('error_code'), result.get('error_message'))
         
-        # 调试：检查关键字段是否存在
+        # 检查关键字段是否存在
         if not result.get("ai_review") and not result.get("ai_evaluation"):
-            print(f"[WARNING] Ultra引擎未生成ai_review或ai_evaluation", flush=True)
-            sys.stdout.flush()
+            logger.warning("Ultra引擎未生成ai_review或ai_evaluation")
         if not result.get("highlight_tags"):
-            print(f"[WARNING] Ultra引擎未生成highlight_tags", flush=True)
-            sys.stdout.flush()
+            logger.warning("Ultra引擎未生成highlight_tags")
         if not result.get("ai_resume_summary") and not result.get("summary_short"):
-            print(f"[WARNING] Ultra引擎未生成ai_resume_summary或summary_short", flush=True)
-            sys.stdout.flush()
+            logger.warning("Ultra引擎未生成ai_resume_summary或summary_short")
         
         # 转换为兼容格式（确保字段映射正确）
         # 1. AI评价：优先使用 ai_review，其次 ai_evaluation
@@ -95,29 +118,23 @@ def ai_score_one_ultra(jd_text: str, resume_text: str, job_title: str = "") -> D
             result["resume_mini"] = result.get("summary_short", "") or result.get("ai_resume_summary", "")
         
         # 调试：输出关键字段状态
-        strengths_chain = result.get('strengths_reasoning_chain', {})
-        weaknesses_chain = result.get('weaknesses_reasoning_chain', {})
-        print(f"[DEBUG] Ultra字段状态: ai_review={bool(result.get('ai_review'))}, highlight_tags={len(result.get('highlight_tags', []))}, persona_tags={len(result.get('persona_tags', []))}", flush=True)
-        print(f"[DEBUG]   strengths_chain存在: {bool(strengths_chain)}, conclusion={strengths_chain.get('conclusion', 'N/A') if isinstance(strengths_chain, dict) else 'N/A'}, ai_reasoning长度={len(strengths_chain.get('ai_reasoning', '')) if isinstance(strengths_chain, dict) else 0}", flush=True)
-        print(f"[DEBUG]   weaknesses_chain存在: {bool(weaknesses_chain)}, conclusion={weaknesses_chain.get('conclusion', 'N/A') if isinstance(weaknesses_chain, dict) else 'N/A'}, ai_reasoning长度={len(weaknesses_chain.get('ai_reasoning', '')) if isinstance(weaknesses_chain, dict) else 0}", flush=True)
-        sys.stdout.flush()
-        
+        if logger.isEnabledFor(logging.DEBUG):
+            _log_chain_status(result)
+
         return result
     except Exception as e:
-        # 记录异常信息
-        import traceback
-        print(f"[ERROR] Ultra引擎异常: {str(e)}")
-        print(f"[ERROR] 异常堆栈: {traceback.format_exc()}")
+        # 记录异常信息（含堆栈）
+        logger.exception("Ultra引擎异常: %s", e)
         
         # 回退到旧版本
         from backend.services.ai_matcher import ai_score_one
         try:
             from backend.services.ai_client import get_client_and_cfg
             client, cfg = get_client_and_cfg()
-            print(f"[DEBUG] 回退到旧版本ai_matcher")
+            logger.debug("回退到旧版本ai_matcher")
             return ai_score_one(client, cfg, jd_text, resume_text, job_title)
         except Exception as e2:
-            print(f"[ERROR] 旧版本也失败: {str(e2)}")
+            logger.error("旧版本也失败: %s", e2)
             # 最终回退
             return {
                 "总分": 0,
@@ -129,6 +146,80 @@ def ai_score_one_ultra(jd_text: str, resume_text: str, job_title: str = "") -> D
             }
 
 
+def _ultra_row_fields(score_result: Dict[str, Any]) -> Dict[str, Any]:
+    """评分结果中需要合并到简历行的字段（批量模式下工作进程只回传这部分）"""
+    # 获取维度得分（用于兼容旧UI）
+    dim_scores = score_result.get("维度得分", {})
+    
+    # 获取Ultra格式的score_dims（用于雷达图）
+    score_dims = score_result.get("score_dims", {})
+    if not score_dims:
+        # 如果没有score_dims，从维度得分转换
+        score_dims = {
+            "skill_match": dim_scores.get("技能匹配度", 0),
+            "experience_match": dim_scores.get("经验相关性", 0),
+            "growth_potential": dim_scores.get("成长潜力", 0),
+            "stability": dim_scores.get("稳定性", 0),
+        }
+    
+    # 获取亮点标签（确保是列表格式）
+    highlight_tags = score_result.get("highlight_tags", [])
+    if not highlight_tags or not isinstance(highlight_tags, list):
+        # 如果highlight_tags不存在，尝试从highlights字符串解析
+        highlights_str = score_result.get("highlights", "")
+        if isinstance(highlights_str, str) and highlights_str:
+            highlight_tags = [tag.strip() for tag in highlights_str.split("|") if tag.strip()]
+        else:
+            highlight_tags = []
+    
+    # 获取短板简历（weak_points）
+    weak_points = score_result.get("weak_points", [])
+    if not isinstance(weak_points, list):
+        weak_points = [weak_points] if weak_points else []
+    
+    # 获取风险项（risks）
+    risks = score_result.get("risks", [])
+    if not isinstance(risks, list):
+        risks = [risks] if risks else []
+    
+    return {
+        # 基础评分字段
+        "总分": score_result.get("总分", 0),
+        "技能匹配度": dim_scores.get("技能匹配度", 0),
+        "经验相关性": dim_scores.get("经验相关性", 0),
+        "成长潜力": dim_scores.get("成长潜力", 0),
+        "稳定性": dim_scores.get("稳定性", 0),
+        
+        # 兼容字段（用于列表页显示）
+        "short_eval": score_result.get("short_eval", ""),
+        "highlights": score_result.get("highlights", ""),
+        "resume_mini": score_result.get("resume_mini", ""),
+        "证据": score_result.get("证据", ""),
+        
+        # Ultra原始字段（前端优先使用）
+        "ai_evaluation": score_result.get("ai_evaluation", ""),
+        "ai_review": score_result.get("ai_review", "") or score_result.get("ai_evaluation", ""),
+        "highlight_tags": highlight_tags,  # 列表格式
+        "persona_tags": score_result.get("persona_tags", highlight_tags),  # Ultra-Format标准字段
+        "summary_short": score_result.get("summary_short", ""),
+        "ai_resume_summary": score_result.get("ai_resume_summary", "") or score_result.get("summary_short", ""),
+        "resume_mini": score_result.get("resume_mini", "") or score_result.get("summary_short", "") or score_result.get("ai_resume_summary", ""),
+        "evidence_chains": score_result.get("evidence_chains", {}),
+        "evidence_text": score_result.get("evidence_text", ""),
+        "weak_points": weak_points,  # 列表格式
+        "score_dims": score_dims,  # 雷达图数据
+        "standard_model": score_result.get("standard_model", {}),  # 岗位标准能力模型（用于雷达图对比）
+        "risks": risks,  # 风险项列表
+        "match_level": score_result.get("match_level", "无法评估"),
+        "match_summary": score_result.get("match_summary", "") or score_result.get("match_level", "无法评估"),
+        # Ultra-Format推理链（必须字段）
+        "strengths_reasoning_chain": score_result.get("strengths_reasoning_chain", {}),
+        "weaknesses_reasoning_chain": score_result.get("weaknesses_reasoning_chain", {}),
+        # Ultra-Format score_detail
+        "score_detail": score_result.get("score_detail", {}),
+    }
+
+
 def ai_match_resumes_df_ultra(jd_text: str, resumes_df: pd.DataFrame, job_title: str = "") -> pd.DataFrame:
     """
     Ultra版批量匹配
@@ -140,149 +231,155 @@ def ai_match_resumes_df_ultra(jd_text: str, resumes_df: pd.DataFrame, job_title:
     
     scored_rows = []
     total_count = len(resumes_df)
-    import sys
-    print(f"[DEBUG] ========================================", flush=True)
-    print(f"[DEBUG] ai_match_resumes_df_ultra: 开始批量匹配，共{total_count}份简历", flush=True)
-    print(f"[DEBUG] ========================================", flush=True)
-    sys.stdout.flush()
+    logger.debug("ai_match_resumes_df_ultra: 开始批量匹配，共%d份简历", total_count)
+    
+    # 岗位级引擎：整批简历共享一次岗位标准能力模型（只依赖岗位+JD）
+    engine = UltraScoringEngine(job_title, jd_text)
     
     for idx, (_, row) in enumerate(resumes_df.iterrows(), 1):
         resume_text = str(row.get("resume_text", "") or row.get("text_raw", "") or "")
         
         if not resume_text.strip():
-            print(f"[DEBUG] 简历{idx}/{total_count}: 文本为空，跳过", flush=True)
-            sys.stdout.flush()
+            logger.debug("简历%s/%s: 文本为空，跳过", idx, total_count)
             continue
         
-        print(f"[DEBUG] --- 简历{idx}/{total_count}: 开始评分，文本长度={len(resume_text)} ---", flush=True)
-        sys.stdout.flush()
+        logger.debug("--- 简历%s/%s: 开始评分，文本长度=%d ---", idx, total_count, len(resume_text))
         # 使用Ultra引擎评分
-        score_result = ai_score_one_ultra(jd_text, resume_text, job_title)
-        print(f"[DEBUG] --- 简历{idx}/{total_count}: 评分完成 ---", flush=True)
-        print(f"[DEBUG]   ai_review={bool(score_result.get('ai_review'))}", flush=True)
-        print(f"[DEBUG]   strengths_reasoning_chain: conclusion={score_result.get('strengths_reasoning_chain', {}).get('conclusion')}, ai_reasoning长度={len(score_result.get('strengths_reasoning_chain', {}).get('ai_reasoning', ''))}", flush=True)
-        print(f"[DEBUG]   weaknesses_reasoning_chain: conclusion={score_result.get('weaknesses_reasoning_chain', {}).get('conclusion')}, ai_reasoning长度={len(score_result.get('weaknesses_reasoning_chain', {}).get('ai_reasoning', ''))}", flush=True)
-        print(f"[DEBUG]   highlight_tags={len(score_result.get('highlight_tags', []))}", flush=True)
-        print(f"[DEBUG]   evidence_chains={len(score_result.get('evidence_chains', {}))}", flush=True)
-        sys.stdout.flush()
+        score_result = ai_score_one_ultra(jd_text, resume_text, job_title, engine=engine)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "--- 简历%s/%s: 评分完成 --- highlight_tags=%d, evidence_chains=%d",
+                idx, total_count, len(score_result.get('highlight_tags', [])), len(score_result.get('evidence_chains', {})),
+            )
+            _log_chain_status(score_result)
         
         # 合并到原始行数据（包含Ultra字段）
         enriched = row.to_dict()
-        
-        # 获取维度得分（用于兼容旧UI）
-        dim_scores = score_result.get("维度得分", {})
-        
-        # 获取Ultra格式的score_dims（用于雷达图）
-        score_dims = score_result.get("score_dims", {})
-        if not score_dims:
-            # 如果没有score_dims，从维度得分转换
-            score_dims = {
-                "skill_match": dim_scores.get("技能匹配度", 0),
-                "experience_match": dim_scores.get("经验相关性", 0),
-                "growth_potential": dim_scores.get("成长潜力", 0),
-                "stability": dim_scores.get("稳定性", 0),
-            }
-        
-        # 获取亮点标签（确保是列表格式）
-        highlight_tags = score_result.get("highlight_tags", [])
-        if not highlight_tags or not isinstance(highlight_tags, list):
-            # 如果highlight_tags不存在，尝试从highlights字符串解析
-            highlights_str = score_result.get("highlights", "")
-            if isinstance(highlights_str, str) and highlights_str:
-                highlight_tags = [tag.strip() for tag in highlights_str.split("|") if tag.strip()]
-            else:
-                highlight_tags = []
-        
-        # 获取短板简历（weak_points）
-        weak_points = score_result.get("weak_points", [])
-        if not isinstance(weak_points, list):
-            weak_points = [weak_points] if weak_points else []
-        
-        # 获取风险项（risks）
-        risks = score_result.get("risks", [])
-        if not isinstance(risks, list):
-            risks = [risks] if risks else []
-        
-        enriched.update({
-            # 基础评分字段
-            "总分": score_result.get("总分", 0),
-            "技能匹配度": dim_scores.get("技能匹配度", 0),
-            "经验相关性": dim_scores.get("经验相关性", 0),
-            "成长潜力": dim_scores.get("成长潜力", 0),
-            "稳定性": dim_scores.get("稳定性", 0),
-            
-            # 兼容字段（用于列表页显示）
-            "short_eval": score_result.get("short_eval", ""),
-            "highlights": score_result.get("highlights", ""),
-            "resume_mini": score_result.get("resume_mini", ""),
-            "证据": score_result.get("证据", ""),
-            
-            # Ultra原始字段（前端优先使用）
-            "ai_evaluation": score_result.get("ai_evaluation", ""),
-            "ai_review": score_result.get("ai_review", "") or score_result.get("ai_evaluation", ""),
-            "highlight_tags": highlight_tags,  # 列表格式
-            "persona_tags": score_result.get("persona_tags", highlight_tags),  # Ultra-Format标准字段
-            "summary_short": score_result.get("summary_short", ""),
-            "ai_resume_summary": score_result.get("ai_resume_summary", "") or score_result.get("summary_short", ""),
-            "resume_mini": score_result.get("resume_mini", "") or score_result.get("summary_short", "") or score_result.get("ai_resume_summary", ""),
-            "evidence_chains": score_result.get("evidence_chains", {}),
-            "evidence_text": score_result.get("evidence_text", ""),
-            "weak_points": weak_points,  # 列表格式
-            "score_dims": score_dims,  # 雷达图数据
-            "standard_model": score_result.get("standard_model", {}),  # 岗位标准能力模型（用于雷达图对比）
-            "risks": risks,  # 风险项列表
-            "match_level": score_result.get("match_level", "无法评估"),
-            "match_summary": score_result.get("match_summary", "") or score_result.get("match_level", "无法评估"),
-            # Ultra-Format推理链（必须字段）
-            "strengths_reasoning_chain": score_result.get("strengths_reasoning_chain", {}),
-            "weaknesses_reasoning_chain": score_result.get("weaknesses_reasoning_chain", {}),
-            # Ultra-Format score_detail
-            "score_detail": score_result.get("score_detail", {}),
-        })
+        enriched.update(_ultra_row_fields(score_result))
         
         scored_rows.append(enriched)
     
     result = pd.DataFrame(scored_rows)
-    import sys
-    print(f"[DEBUG] ========================================", flush=True)
-    print(f"[DEBUG] ai_match_resumes_df_ultra: 批量匹配完成，共处理{len(scored_rows)}份简历", flush=True)
-    print(f"[DEBUG] ========================================", flush=True)
-    sys.stdout.flush()
+    logger.debug("ai_match_resumes_df_ultra: 批量匹配完成，共处理%d份简历", len(scored_rows))
     
     # 按总分排序
     if "总分" in result.columns:
         result = result.sort_values(by="总分", ascending=False).reset_index(drop=True)
     
     # 检查结果字段
-    if len(result) > 0:
-        sample_row = result.iloc[0]
-        print(f"[DEBUG] 结果样本检查:", flush=True)
-        print(f"  - ai_review: {bool(sample_row.get('ai_review'))}", flush=True)
-        print(f"  - highlight_tags: {len(sample_row.get('highlight_tags', []))}", flush=True)
-        print(f"  - evidence_chains: {len(sample_row.get('evidence_chains', {}))}", flush=True)
-        
-        # 检查推理链字段
-        strengths_chain = sample_row.get('strengths_reasoning_chain', {})
-        weaknesses_chain = sample_row.get('weaknesses_reasoning_chain', {})
-        print(f"  - strengths_reasoning_chain类型: {type(strengths_chain)}", flush=True)
-        if isinstance(strengths_chain, dict):
-            print(f"  - strengths_reasoning_chain.conclusion: {strengths_chain.get('conclusion', 'N/A')}", flush=True)
-            print(f"  - strengths_reasoning_chain.ai_reasoning长度: {len(strengths_chain.get('ai_reasoning', ''))}", flush=True)
-        elif isinstance(strengths_chain, str):
-            print(f"  - strengths_reasoning_chain是字符串，长度: {len(strengths_chain)}", flush=True)
-        else:
-            print(f"  - strengths_reasoning_chain值: {strengths_chain}", flush=True)
-        
-        print(f"  - weaknesses_reasoning_chain类型: {type(weaknesses_chain)}", flush=True)
-        if isinstance(weaknesses_chain, dict):
-            print(f"  - weaknesses_reasoning_chain.conclusion: {weaknesses_chain.get('conclusion', 'N/A')}", flush=True)
-            print(f"  - weaknesses_reasoning_chain.ai_reasoning长度: {len(weaknesses_chain.get('ai_reasoning', ''))}", flush=True)
-        elif isinstance(weaknesses_chain, str):
-            print(f"  - weaknesses_reasoning_chain是字符串，长度: {len(weaknesses_chain)}", flush=True)
-        else:
-            print(f"  - weaknesses_reasoning_chain值: {weaknesses_chain}", flush=True)
-        
-        sys.stdout.flush()
+    if len(result) > 0 and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("结果样本检查（总分最高的一份）:")
+        _log_chain_status(result.iloc[0].to_dict())
     
     return result
 
+
+# ---------------- 规则评分批量模式（进程池） ----------------
+# 未配置 API Key 时 Ultra 引擎全部走规则生成，是纯 CPU 计算：
+# 按分片分发到进程池，每个工作进程只初始化一次岗位级引擎，只回传需要合并到行上的字段。
+
+# 工作进程内缓存的岗位级引擎（进程池复用工作进程，后续分片直接命中）
+_WORKER_ENGINES: Dict[Tuple[str, str], UltraScoringEngine] = {}
+
+# 每个进程大约分到的分片数：分片越小负载越均衡，越大 IPC 次数越少
+_SHARDS_PER_WORKER = 4
+_MAX_SHARD_SIZE = 50
+
+
+def default_score_workers() -> int:
+    """规则评分进程数：环境变量 ULTRA_SCORE_WORKERS，默认 min(4, CPU 核数)"""
+    fallback = max(1, min(4, os.cpu_count() or 1))
+    try:
+        return max(1, int(os.getenv("ULTRA_SCORE_WORKERS") or fallback))
+    except ValueError:
+        return fallback
+
+
+def llm_configured() -> bool:
+    """是否配置了 LLM API Key（配置了则 Ultra 引擎会调用 LLM，不适合进程池批量模式）"""
+    return bool(AIConfig().api_key)
+
+
+def _worker_engine(job_title: str, jd_text: str) -> UltraScoringEngine:
+    key = (job_title, jd_text)
+    engine = _WORKER_ENGINES.get(key)
+    if engine is None:
+        engine = UltraScoringEngine(job_title, jd_text)
+        _WORKER_ENGINES.clear()
+        _WORKER_ENGINES[key] = engine
+    return engine
+
+
+def _score_shard(task: Tuple[str, str, List[str]]) -> List[Dict[str, Any]]:
+    """评分一个分片（在工作进程中运行）"""
+    jd_text, job_title, texts = task
+    engine = _worker_engine(job_title, jd_text)
+    return [_ultra_row_fields(ai_score_one_ultra(jd_text, text, job_title, engine=engine)) for text in texts]
+
+
+def _score_shard_failed(task: Tuple[str, str, List[str]], error: BaseException) -> List[Dict[str, Any]]:
+    logger.warning("Ultra规则评分分片失败（%d份简历）: %s", len(task[2]), error)
+    failed = {
+        "总分": 0,
+        "维度得分": {"技能匹配度": 0, "经验相关性": 0, "成长潜力": 0, "稳定性": 0},
+        "short_eval": f"评分失败：{str(error)}",
+    }
+    return [_ultra_row_fields(failed) for _ in task[2]]
+
+
+def ai_match_resumes_df_ultra_batch(
+    jd_text: str,
+    resumes_df: pd.DataFrame,
+    job_title: str = "",
+    max_workers: Optional[int] = None,
+    shard_size: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Ultra版批量匹配（规则评分，多进程）
+
+    输出与 ai_match_resumes_df_ultra 相同（跳过空简历、按总分降序）。
+    配置了 LLM API Key 时评分以网络调用为主，直接回退到 ai_match_resumes_df_ultra。
+    timeout 为单个分片的超时秒数，超时或失败的分片记 0 分。
+    """
+    if resumes_df is None or resumes_df.empty:
+        return pd.DataFrame()
+    if llm_configured():
+        return ai_match_resumes_df_ultra(jd_text, resumes_df, job_title)
+
+    rows = []
+    texts = []
+    for _, row in resumes_df.iterrows():
+        resume_text = str(row.get("resume_text", "") or row.get("text_raw", "") or "")
+        if resume_text.strip():
+            rows.append(row.to_dict())
+            texts.append(resume_text)
+    if not texts:
+        return pd.DataFrame()
+
+    start = time.time()
+    workers = max(1, min(max_workers or default_score_workers(), len(texts)))
+    if shard_size is None:
+        shard_size = min(_MAX_SHARD_SIZE, math.ceil(len(texts) / (workers * _SHARDS_PER_WORKER)))
+    shard_size = max(1, shard_size)
+    tasks = [(jd_text, job_title, texts[i:i + shard_size]) for i in range(0, len(texts), shard_size)]
+    if workers == 1:
+        # 单进程时不启动进程池，省掉进程创建与序列化开销
+        shards = []
+        for task in tasks:
+            try:
+                shards.append(_score_shard(task))
+            except Exception as e:
+                shards.append(_score_shard_failed(task, e))
+    else:
+        shards = run_bounded_processes(tasks, _score_shard, _score_shard_failed, max_workers=workers, timeout=timeout)
+
+    fields = [f for shard in shards for f in shard]
+    result = pd.DataFrame([{**row, **f} for row, f in zip(rows, fields)])
+    logger.info(
+        "Ultra规则评分完成：%d份简历 | %d个分片 | %d个进程 | 用时 %.2fs",
+        len(texts), len(tasks), workers, time.time() - start,
+    )
+    if "总分" in result.columns:
+        result = result.sort_values(by="总分", ascending=False).reset_index(drop=True)
+    return result
@@ -0,0 +1,182 @@
+"""
+有界并发批处理执行器
+把网络密集的逐条调用（如 ai_score_one）分发到线程池：
+- 并发数可配置（参数或环境变量 AI_BATCH_CONCURRENCY）
+- 输出顺序与输入一致
+- 单条失败/超时只回退该条，不阻塞整批
+
+CPU 密集的任务（如简历解析 / OCR）使用 run_bounded_processes 分发到进程池。
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Sequence
+
+DEFAULT_CONCURRENCY = 4
+
+
+def default_concurrency() -> int:
+    try:
+        return max(1, int(os.getenv("AI_BATCH_CONCURRENCY", DEFAULT_CONCURRENCY)))
+    except ValueError:
+        return DEFAULT_CONCURRENCY
+
+
+def default_row_timeout() -> Optional[float]:
+    raw = os.getenv("AI_BATCH_ROW_TIMEOUT", "")
+    try:
+        value = float(raw) if raw else 0.0
+    except ValueError:
+        value = 0.0
+    return value if value > 0 else None
+
+
+def run_bounded(
+    items: Sequence[Any],
+    worker: Callable[[Any], Any],
+    fallback: Callable[[Any, BaseException], Any],
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> List[Any]:
+    """
+    并发执行 worker(item)，按输入顺序返回结果。
+
+    worker 抛异常或单条运行超过 timeout 秒时，改用 fallback(item, error) 的结果。
+    超时的线程无法被强制终止，只是不再等待它；如果所有工作线程都被卡住，
+    剩余未开始的条目直接走 fallback。
+    """
+    n = len(items)
+    if n == 0:
+        return []
+    max_workers = max(1, min(max_workers or default_concurrency(), n))
+
+    results: List[Any] = [None] * n
+    started: dict = {}
+    started_lock = threading.Lock()
+
+    def _run(i: int) -> Any:
+        with started_lock:
+            started[i] = time.monotonic()
+        return worker(items[i])
+
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch")
+    try:
+        futures = {pool.submit(_run, i): i for i in range(n)}
+        pending = set(futures)
+        hung = 0
+        poll = min(timeout, 0.5) if timeout else None
+        while pending:
+            done, pending = wait(pending, timeout=poll, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    results[i] = fallback(items[i], e)
+            if not timeout or not pending:
+                continue
+            now = time.monotonic()
+            for future in list(pending):
+                i = futures[future]
+                with started_lock:
+                    began = started.get(i)
+                if began is None:
+                    if hung >= max_workers and future.cancel():
+                        pending.discard(future)
+                        results[i] = fallback(items[i], TimeoutError("所有工作线程均已超时"))
+                    continue
+                if now - began > timeout:
+                    pending.discard(future)
+                    hung += 1
+                    results[i] = fallback(items[i], TimeoutError(f"单条处理超过 {timeout:.0f} 秒"))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def _terminate_workers(pool: ProcessPoolExecutor) -> None:
+    """强制结束进程池中仍在运行的工作进程（用于回收超时任务）"""
+    terminate = getattr(pool, "terminate_workers", None)  # Python 3.14+
+    if callable(terminate):
+        terminate()
+        return
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        try:
+            process.terminate()
+        except Exception:
+            pass
+
+
+def run_bounded_processes(
+    items: Sequence[Any],
+    worker: Callable[[Any], Any],
+    fallback: Callable[[Any, BaseException], Any],
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> List[Any]:
+    """
+    在进程池中执行 worker(item)，按输入顺序返回结果。
+
+    worker 与 item 必须可被 pickle（worker 需为模块级函数）。
+    同一时间最多提交 max_workers 个任务，因此提交时刻即开始时刻，单条超时据此计算。
+    超时的任务回退到 fallback，并在整批结束后强制结束卡住的工作进程；
+    工作进程全部卡住或进程池崩溃时，剩余条目直接走 fallback。
+    """
+    n = len(items)
+    if n == 0:
+        return []
+    max_workers = max(1, min(max_workers or default_concurrency(), n))
+
+    results: List[Any] = [None] * n
+    pool = ProcessPoolExecutor(max_workers=max_workers)
+    running: dict = {}
+    healthy = max_workers
+    hung = False
+    broken: Optional[BaseException] = None
+    next_index = 0
+    try:
+        while next_index < n or running:
+            while broken is None and next_index < n and len(running) < healthy:
+                try:
+                    future = pool.submit(worker, items[next_index])
+                except BrokenProcessPool as e:
+                    broken = e
+                    break
+                running[future] = (next_index, time.monotonic())
+                next_index += 1
+            if not running:
+                # 进程池已崩溃或所有工作进程都卡在超时任务上
+                err = broken or TimeoutError("所有工作进程均已超时")
+                for i in range(next_index, n):
+                    results[i] = fallback(items[i], err)
+                break
+            poll = min(timeout, 0.5) if timeout else None
+            done, _ = wait(list(running), timeout=poll, return_when=FIRST_COMPLETED)
+            for future in done:
+                i, _began = running.pop(future)
+                try:
+                    results[i] = future.result()
+                except BrokenProcessPool as e:
+                    broken = e
+                    results[i] = fallback(items[i], e)
+                except Exception as e:
+                    results[i] = fallback(items[i], e)
+            if not timeout:
+                continue
+            now = time.monotonic()
+            for future, (i, began) in list(running.items()):
+                if now - began > timeout:
+                    running.pop(future)
+                    healthy -= 1
+                    hung = True
+                    results[i] = fallback(items[i], TimeoutError(f"单条处理超过 {timeout:.0f} 秒"))
+    finally:
+        if hung:
+            _terminate_workers(pool)
+        pool.shutdown(wait=not hung, cancel_futures=True)
+    return results
@@ -0,0 +1,53 @@
+"""
+级联评分（先便宜后昂贵）
+Stage 1：本地启发式 / ScoringGraph 对全部简历打分；
+Stage 2：只把 Top-K 与处于"不确定区间"的简历交给 LLM 精评，其余直接采用 Stage 1 结果。
+阈值配置在 model_config.json 的 "cascade" 段。
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Set
+
+DEFAULT_CFG_PATH = Path("backend/configs/model_config.json")
+
+DEFAULT_CASCADE_CONFIG: Dict[str, Any] = {
+    "enabled": False,
+    # heuristic：关键词启发式；graph：ScoringGraph 规则推理
+    "stage1": "heuristic",
+    # Stage 1 排名前 K 的简历一定进入 LLM 精评
+    "top_k": 20,
+    # Stage 1 总分落在该区间内的简历同样进入 LLM 精评
+    "uncertainty_band": [60.0, 75.0],
+}
+
+# score_stage 列取值
+STAGE_HEURISTIC = "stage1_heuristic"
+STAGE_GRAPH = "stage1_graph"
+STAGE_LLM = "stage2_llm"
+STAGE_LLM_FALLBACK = "stage2_fallback"
+
+
+def load_cascade_config(cfg_path: Path = DEFAULT_CFG_PATH) -> Dict[str, Any]:
+    """读取 model_config.json 中的 cascade 配置，缺省项用默认值补齐"""
+    merged = dict(DEFAULT_CASCADE_CONFIG)
+    try:
+        data = json.loads(Path(cfg_path).read_text(encoding="utf-8"))
+        merged.update(data.get("cascade") or {})
+    except Exception:
+        pass
+    return merged
+
+
+def select_for_llm(scores: Sequence[float], config: Dict[str, Any]) -> Set[int]:
+    """返回需要进入 Stage 2 的位置下标：Top-K ∪ 不确定区间"""
+    top_k = max(0, int(config.get("top_k", 0) or 0))
+    band = config.get("uncertainty_band") or []
+    low, high = (float(band[0]), float(band[1])) if len(band) == 2 else (1.0, 0.0)
+
+    ranked: List[int] = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)
+    selected = set(ranked[:top_k])
+    selected.update(i for i, score in enumerate(scores) if low <= score <= high)
+    return selected
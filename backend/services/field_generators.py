@@ -6,11 +6,13 @@ import re
 import json
 import textwrap
 import time
-import sys
 from typing import Dict, List, Any
 from backend.services.scoring_graph import ScoringResult, DetectedAction, EvidenceItem, RiskItem
-from backend.services.ability_pool import AbilityPool, ActionMapping
+from backend.services.ability_pool import ABILITY_POOL, ACTION_MAPPING
 from backend.services.ai_client import get_client_and_cfg, chat_completion
+from backend.utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 class FieldGenerators:
@@ -19,26 +21,28 @@ class FieldGenerators:
     def __init__(self, job_title: str, jd_text: str = ""):
         self.job_title = job_title
         self.jd_text = jd_text
-        self.ability_pool = AbilityPool()
-        self.action_mapping = ActionMapping()
+        self.ability_pool = ABILITY_POOL
+        self.action_mapping = ACTION_MAPPING
         self._llm_client = None
         self._llm_cfg = None
-    
+        # 创建客户端失败（如未配置凭据）后不再逐份简历重试
+        self._llm_failed = False
+
     def _get_llm_client(self):
         """获取LLM客户端（延迟初始化）"""
+        if self._llm_failed:
+            return None, None
         if self._llm_client is None:
             try:
                 self._llm_client, self._llm_cfg = get_client_and_cfg()
                 # 检查API Key是否配置
                 if not self._llm_cfg or not self._llm_cfg.api_key:
-                    print(f"[WARNING] LLM API Key未配置，将使用规则生成", flush=True)
-                    sys.stdout.flush()
+                    logger.warning("LLM API Key未配置，将使用规则生成")
                     return None, None
-                print(f"[DEBUG] LLM客户端初始化成功: provider={self._llm_cfg.provider}, model={self._llm_cfg.model}", flush=True)
-                sys.stdout.flush()
+                logger.debug("LLM客户端初始化成功: provider=%s, model=%s", self._llm_cfg.provider, self._llm_cfg.model)
             except Exception as e:
-                print(f"[WARNING] 无法获取LLM客户端: {str(e)}，将使用规则生成", flush=True)
-                sys.stdout.flush()
+                logger.warning("无法获取LLM客户端: %s，将使用规则生成", e)
+                self._llm_failed = True
                 return None, None
         return self._llm_client, self._llm_cfg
     
@@ -55,34 +59,29 @@ class FieldGenerators:
         优先使用LLM生成，失败时回退到规则生成
         """
         start_time = time.time()
-        print(f"[DEBUG] >>> 开始生成AI评价（LLM优先）", flush=True)
-        sys.stdout.flush()
+        logger.debug("开始生成AI评价（LLM优先）")
         
         # 尝试使用LLM生成
         try:
             client, cfg = self._get_llm_client()
             if client and cfg and cfg.api_key:
-                print(f"[DEBUG] >>> 使用LLM生成AI评价...", flush=True)
-                sys.stdout.flush()
+                logger.debug("使用LLM生成AI评价...")
                 llm_start = time.time()
                 result = self._generate_ai_review_with_llm(
                     client, cfg, scoring_result, detected_actions, evidence_chain, risks
                 )
                 llm_elapsed = time.time() - llm_start
                 total_elapsed = time.time() - start_time
-                print(f"[DEBUG] >>> LLM生成完成，耗时: {llm_elapsed:.2f}秒（总耗时: {total_elapsed:.2f}秒）", flush=True)
-                sys.stdout.flush()
+                logger.debug("LLM生成完成，耗时: %.2f秒（总耗时: %.2f秒）", llm_elapsed, total_elapsed)
                 return result
             else:
-                print(f"[WARNING] >>> LLM客户端或API Key不可用，回退到规则生成", flush=True)
-                sys.stdout.flush()
+                # 未配置 API Key 已在 _get_llm_client 中提示过一次，逐份简历只记调试日志
+                logger.debug("LLM客户端或API Key不可用，回退到规则生成")
         except Exception as e:
-            print(f"[WARNING] >>> LLM生成ai_review失败: {str(e)}，回退到规则生成", flush=True)
-            sys.stdout.flush()
+            logger.warning("LLM生成ai_review失败: %s，回退到规则生成", e)
         
         # 回退到规则生成
-        print(f"[DEBUG] >>> 使用规则生成AI评价...", flush=True)
-        sys.stdout.flush()
+        logger.debug("使用规则生成AI评价...")
         rule_start = time.time()
         
         # ① 证据段
@@ -99,8 +98,7 @@ class FieldGenerators:
         
         rule_elapsed = time.time() - rule_start
         total_elapsed = time.time() - start_time
-        print(f"[DEBUG] >>> 规则生成完成，耗时: {rule_elapsed:.2f}秒（总耗时: {total_elapsed:.2f}秒）", flush=True)
-        sys.stdout.flush()
+        logger.debug("规则生成完成，耗时: %.2f秒（总耗时: %.2f秒）", rule_elapsed, total_elapsed)
         
         return review.strip()
     
@@ -114,8 +112,7 @@ class FieldGenerators:
         risks: List[RiskItem]
     ) -> str:
         """使用LLM生成AI评价"""
-        print(f"[DEBUG] >>> 构建LLM提示词...", flush=True)
-        sys.stdout.flush()
+        logger.debug("构建LLM提示词...")
         
         # 构建证据摘要
         evidence_summary = []
@@ -186,8 +183,7 @@ class FieldGenerators:
         """)
         
         try:
-            print(f"[DEBUG] >>> 调用LLM API (model={cfg.model})...", flush=True)
-            sys.stdout.flush()
+            logger.debug("调用LLM API (model=%s)...", cfg.model)
             api_start = time.time()
             
             response = chat_completion(
@@ -203,26 +199,21 @@ class FieldGenerators:
             )
             
             api_elapsed = time.time() - api_start
-            print(f"[DEBUG] >>> LLM API调用完成，耗时: {api_elapsed:.2f}秒", flush=True)
-            sys.stdout.flush()
+            logger.debug("LLM API调用完成，耗时: %.2f秒", api_elapsed)
             
             content = response["choices"][0]["message"]["content"]
-            print(f"[DEBUG] >>> LLM返回内容长度: {len(content)}字符", flush=True)
-            sys.stdout.flush()
+            logger.debug("LLM返回内容长度: %d字符", len(content))
             
             # 验证输出格式
             if "【证据】" in content and "【推理】" in content and "【结论】" in content:
-                print(f"[DEBUG] >>> LLM输出格式验证通过", flush=True)
-                sys.stdout.flush()
+                logger.debug("LLM输出格式验证通过")
                 return content.strip()
             else:
                 # 如果格式不对，回退到规则生成
-                print(f"[WARNING] >>> LLM输出格式不正确，缺少必需段落", flush=True)
-                sys.stdout.flush()
+                logger.warning("LLM输出格式不正确，缺少必需段落")
                 raise ValueError("LLM输出格式不正确")
         except Exception as e:
-            print(f"[ERROR] >>> LLM调用异常: {str(e)}", flush=True)
-            sys.stdout.flush()
+            logger.error("LLM调用异常: %s", e)
             raise Exception(f"LLM调用失败: {str(e)}")
     
     def _build_evidence_section(
@@ -107,11 +107,8 @@ def call_ai(messages: List[Dict[str, str]], temperature: float = 0.7, max_tokens
         raise Exception("AI 调用失败：未配置 SILICONFLOW_API_KEY，请检查 .env 文件")
     
     try:
-        from openai import OpenAI
-        client = OpenAI(
-            api_key=api_key,
-            base_url=base_url
-        )
+        from backend.services.llm_pool import get_openai_client
+        client = get_openai_client(api_key, base_url)
         response = client.chat.completions.create(
             model=model,
             messages=filtered_messages,
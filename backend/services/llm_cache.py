@@ -0,0 +1,221 @@
+"""
+LLM 响应缓存（内容寻址）
+以 provider / model / 规范化 messages / temperature / max_tokens 的哈希为键，
+持久化到 SQLite，支持 TTL 过期、LRU 淘汰与容量上限。
+
+缓存模式（环境变量 LLM_CACHE_MODE）：
+- deterministic（默认）：只缓存 temperature == 0 的确定性调用
+- all：缓存所有调用（同一份简历 + JD 重跑时直接复用结果）
+- off：完全关闭
+单次调用可通过 chat_completion(..., cache=True/False) 强制开启或绕过。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_CACHE_PATH = Path("backend/storage/cache/llm_cache.db")
+
+CACHE_MODES = ("off", "deterministic", "all")
+
+
+def _normalize_content(content: Any) -> Any:
+    if isinstance(content, str):
+        return re.sub(r"[ \t]+", " ", content.replace("\r\n", "\n")).strip()
+    return content
+
+
+def normalize_messages(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """去掉不影响语义的空白差异，保证同一提示词得到同一个键"""
+    normalized = []
+    for m in messages or []:
+        item = {k: _normalize_content(v) for k, v in m.items()}
+        normalized.append(item)
+    return normalized
+
+
+def make_cache_key(
+    provider: Optional[str],
+    model: Optional[str],
+    messages: List[Dict[str, Any]],
+    temperature: Optional[float],
+    max_tokens: Optional[int],
+    extra: Optional[Dict[str, Any]] = None,
+) -> str:
+    payload = {
+        "provider": provider or "",
+        "model": model or "",
+        "messages": normalize_messages(messages),
+        "temperature": None if temperature is None else round(float(temperature), 4),
+        "max_tokens": max_tokens,
+        "extra": extra or {},
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def cache_mode() -> str:
+    mode = (os.getenv("LLM_CACHE_MODE") or "deterministic").strip().lower()
+    return mode if mode in CACHE_MODES else "deterministic"
+
+
+def should_cache(temperature: Optional[float], cache: Optional[bool] = None) -> bool:
+    """cache 显式传入时优先；否则按 LLM_CACHE_MODE 决定"""
+    if cache is not None:
+        return bool(cache)
+    mode = cache_mode()
+    if mode == "all":
+        return True
+    if mode == "deterministic":
+        return temperature is not None and float(temperature) == 0.0
+    return False
+
+
+class LLMResponseCache:
+    """基于 SQLite 的 LLM 响应缓存（线程安全）"""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_entries: int = 20000,
+        max_bytes: int = 200 * 1024 * 1024,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=10)
+            conn.executescript("""
+CREATE TABLE IF NOT EXISTS llm_cache (
+key TEXT PRIMARY KEY,
+provider TEXT,
+model TEXT,
+content TEXT,
+role TEXT,
+size INTEGER,
+created_at REAL,
+last_access REAL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access);
+""")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT content, role, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            content, role, created_at = row
+            if self.ttl_seconds and now - (created_at or 0) > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                conn.commit()
+                self.misses += 1
+                self.evictions += 1
+                return None
+            conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+        return {"choices": [{"message": {"content": content, "role": role or "assistant"}}]}
+
+    def put(self, key: str, response: Dict[str, Any], provider: str = "", model: str = "") -> None:
+        try:
+            message = response["choices"][0]["message"]
+        except (KeyError, IndexError, TypeError):
+            return
+        content = message.get("content")
+        if not content:
+            # 空响应不缓存，避免把失败结果固化下来
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, provider, model, content, role, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, provider or "", model or "", content, message.get("role") or "assistant",
+                 len(content.encode("utf-8")), now, now),
+            )
+            self.writes += 1
+            self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        if self.ttl_seconds:
+            cur = conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+            self.evictions += max(cur.rowcount, 0)
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # 按最近访问时间从旧到新淘汰，直到满足条目数与容量上限
+        rows = conn.execute("SELECT key, size FROM llm_cache ORDER BY last_access ASC").fetchall()
+        stale = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            stale.append((key,))
+            count -= 1
+            total -= size or 0
+        conn.executemany("DELETE FROM llm_cache WHERE key = ?", stale)
+        self.evictions += len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, total = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": count,
+            "bytes": total,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM llm_cache")
+            conn.commit()
+
+
+_default_cache: Optional[LLMResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """进程级共享缓存实例"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = LLMResponseCache()
+    return _default_cache
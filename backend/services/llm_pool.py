@@ -0,0 +1,163 @@
+"""
+LLM 客户端连接池
+进程内复用 OpenAI / Anthropic 客户端及其底层 httpx 连接池（keep-alive，安装 h2 时启用 HTTP/2），
+避免每次调用都重新建立 TLS 连接。
+
+环境变量：
+- LLM_HTTP_MAX_CONNECTIONS：每个连接池的最大连接数（默认 20）
+- LLM_HTTP_MAX_KEEPALIVE：保持的空闲连接数（默认 10）
+- LLM_HTTP_TIMEOUT：请求超时秒数（默认 120）
+- LLM_HTTP2：0 关闭 HTTP/2（默认在安装 h2 时开启）
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+_lock = threading.Lock()
+_sync_http: Dict[str, Any] = {}
+_sync_clients: Dict[Tuple[str, str, str], Any] = {}
+# 异步 httpx 客户端不能跨事件循环复用，按事件循环分别缓存
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str, str], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _http2_enabled() -> bool:
+    if os.getenv("LLM_HTTP2", "1").strip() in ("0", "false", "False"):
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _http_options() -> Dict[str, Any]:
+    return {
+        "limits": httpx.Limits(
+            max_connections=_env_int("LLM_HTTP_MAX_CONNECTIONS", 20),
+            max_keepalive_connections=_env_int("LLM_HTTP_MAX_KEEPALIVE", 10),
+            keepalive_expiry=30.0,
+        ),
+        "timeout": _env_float("LLM_HTTP_TIMEOUT", 120.0),
+        "http2": _http2_enabled(),
+    }
+
+
+def _sdk_http_client(sdk: str, is_async: bool):
+    if sdk == "anthropic":
+        import anthropic as module
+    else:
+        import openai as module
+    factory = getattr(module, "DefaultAsyncHttpxClient" if is_async else "DefaultHttpxClient", None)
+    if factory is None:
+        # 较旧的 SDK（requirements 允许 anthropic>=0.18）没有导出默认客户端类，直接用 httpx，并沿用 SDK 默认的跟随重定向
+        factory = httpx.AsyncClient if is_async else httpx.Client
+        return factory(follow_redirects=True, **_http_options())
+    return factory(**_http_options())
+
+
+def _shared_sync_http(sdk: str):
+    if sdk not in _sync_http:
+        _sync_http[sdk] = _sdk_http_client(sdk, is_async=False)
+    return _sync_http[sdk]
+
+
+def get_openai_client(api_key: Optional[str], base_url: Optional[str] = None):
+    """按 (api_key, base_url) 复用的同步 OpenAI 客户端"""
+    from openai import OpenAI
+
+    key = ("openai", api_key or "", base_url or "")
+    with _lock:
+        client = _sync_clients.get(key)
+        if client is None:
+            client = OpenAI(api_key=api_key, base_url=base_url, http_client=_shared_sync_http("openai"))
+            _sync_clients[key] = client
+    return client
+
+
+def get_anthropic_client(api_key: Optional[str], base_url: Optional[str] = None):
+    """按 api_key 复用的同步 Anthropic 客户端"""
+    from anthropic import Anthropic
+
+    key = ("anthropic", api_key or "", base_url or "")
+    with _lock:
+        client = _sync_clients.get(key)
+        if client is None:
+            kwargs = {"api_key": api_key, "http_client": _shared_sync_http("anthropic")}
+            if base_url:
+                kwargs["base_url"] = base_url
+            client = Anthropic(**kwargs)
+            _sync_clients[key] = client
+    return client
+
+
+def _async_client(sdk: str, api_key: Optional[str], base_url: Optional[str]):
+    loop = asyncio.get_running_loop()
+    key = (sdk, api_key or "", base_url or "")
+    with _lock:
+        per_loop = _async_clients.setdefault(loop, {})
+        client = per_loop.get(key)
+        if client is not None:
+            return client
+        http_key = (sdk, "__http__", "")
+        http_client = per_loop.get(http_key)
+        if http_client is None:
+            http_client = _sdk_http_client(sdk, is_async=True)
+            per_loop[http_key] = http_client
+        if sdk == "anthropic":
+            from anthropic import AsyncAnthropic
+
+            kwargs = {"api_key": api_key, "http_client": http_client}
+            if base_url:
+                kwargs["base_url"] = base_url
+            client = AsyncAnthropic(**kwargs)
+        else:
+            from openai import AsyncOpenAI
+
+            client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+        per_loop[key] = client
+    return client
+
+
+def get_async_openai_client(api_key: Optional[str], base_url: Optional[str] = None):
+    """当前事件循环内复用的 AsyncOpenAI 客户端（需在协程中调用）"""
+    return _async_client("openai", api_key, base_url)
+
+
+def get_async_anthropic_client(api_key: Optional[str], base_url: Optional[str] = None):
+    """当前事件循环内复用的 AsyncAnthropic 客户端（需在协程中调用）"""
+    return _async_client("anthropic", api_key, base_url)
+
+
+def close_all() -> None:
+    """关闭同步连接池（测试或进程退出时使用）"""
+    with _lock:
+        for http_client in _sync_http.values():
+            try:
+                http_client.close()
+            except Exception:
+                pass
+        _sync_http.clear()
+        _sync_clients.clear()
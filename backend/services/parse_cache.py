@@ -0,0 +1,180 @@
+"""
+简历解析缓存（内容寻址）
+以 文件字节 SHA-256 + 解析器版本 为键，持久化到 SQLite，
+保存提取的正文、联系方式、推断的姓名以及命中的提取方法（fitz / pdfplumber / ocr ...）。
+同一份 PDF 反复上传时直接复用结果，避免重复 OCR。
+
+环境变量：
+- RESUME_PARSE_CACHE：0 关闭缓存（默认开启）
+- RESUME_PARSE_CACHE_MAX_MB：缓存正文总大小上限（默认 500）
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_PATH = Path("backend/storage/cache/parse_cache.db")
+
+
+def parse_cache_key(data: bytes, parser_version: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"parser:{parser_version}\n".encode("utf-8"))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def parse_cache_enabled() -> bool:
+    return os.getenv("RESUME_PARSE_CACHE", "1").strip() not in ("0", "false", "False", "off")
+
+
+def _default_max_bytes() -> int:
+    try:
+        return int(float(os.getenv("RESUME_PARSE_CACHE_MAX_MB", "500")) * 1024 * 1024)
+    except ValueError:
+        return 500 * 1024 * 1024
+
+
+class ParseCache:
+    """基于 SQLite 的解析结果缓存（线程安全，按最近访问时间 LRU 淘汰）"""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        max_entries: int = 20000,
+        max_bytes: Optional[int] = None,
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes if max_bytes is not None else _default_max_bytes()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=10)
+            conn.executescript("""
+CREATE TABLE IF NOT EXISTS parse_cache (
+key TEXT PRIMARY KEY,
+file TEXT,
+text TEXT,
+email TEXT,
+phone TEXT,
+name TEXT,
+method TEXT,
+size INTEGER,
+created_at REAL,
+last_access REAL
+);
+CREATE INDEX IF NOT EXISTS idx_parse_cache_last_access ON parse_cache(last_access);
+""")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT file, text, email, phone, name, method FROM parse_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE parse_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+            self.hits += 1
+        file, text, email, phone, name, method = row
+        return {
+            "file": file or "",
+            "text": text or "",
+            "email": email or "",
+            "phone": phone or "",
+            "name": name or "",
+            "method": method or "",
+        }
+
+    def put(self, key: str, result: Dict[str, Any], file: str = "") -> None:
+        text = result.get("text") or ""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO parse_cache "
+                "(key, file, text, email, phone, name, method, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, file, text, result.get("email") or "", result.get("phone") or "",
+                 result.get("name") or "", result.get("method") or "",
+                 len(text.encode("utf-8")), now, now),
+            )
+            self.writes += 1
+            self._evict(conn)
+            conn.commit()
+
+    def set_name(self, key: str, name: str, file: str = "") -> None:
+        """姓名推断在解析之后单独进行，结果补写到已有条目上"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("UPDATE parse_cache SET name = ?, file = ? WHERE key = ?", (name or "", file, key))
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_cache").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT key, size FROM parse_cache ORDER BY last_access ASC").fetchall()
+        stale = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            stale.append((key,))
+            count -= 1
+            total -= size or 0
+        conn.executemany("DELETE FROM parse_cache WHERE key = ?", stale)
+        self.evictions += len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, total = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_cache"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": count,
+            "bytes": total,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM parse_cache")
+            conn.commit()
+
+
+_default_cache: Optional[ParseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> ParseCache:
+    """进程级共享缓存实例"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = ParseCache()
+    return _default_cache
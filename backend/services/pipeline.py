@@ -1,18 +1,27 @@
-import uuid, json, time
+import uuid, json
 import pandas as pd
 from pathlib import Path
-from backend.storage.db import get_db, init_db
+from backend.storage.db import get_db, init_db, now_timestamps
+from backend.storage.bulk import DEFAULT_CHUNK_SIZE, RESUME_INSERT_SQL, insert_resumes
 from backend.utils.audit import audit_log
 from backend.core.rules import load_job_rules, get_job_rule, default_rubric
 from backend.core.parser import parse_text_resume
-from backend.core.scoring import compute_scores
+from backend.core.dedup import DedupIndex, key_hash
+from backend.core.scoring import compute_scores_frame, rules_fingerprint, weights_fingerprint
 from backend.core.llm import generate_jd_with_ai
+from backend.services.resume_index import index_auto_update_enabled, refresh_resume_index, search_resumes
+
+SCORE_INSERT_SQL = (
+    "INSERT INTO score (id,resume_id,job,score_total,skill_fit,exp_relevance,stability,growth,evidence_json,confidence,created_at,created_ts,rules_hash,weights_hash,is_current) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)"
+)
 
 class RecruitPipeline:
     def __init__(self, db_path: str = "backend/storage/recruitflow.db", cfg_path: str = "backend/configs/model_config.json"):
         self.db_path = db_path
         self.cfg_path = Path(cfg_path)
         self.cfg = json.loads(self.cfg_path.read_text(encoding="utf-8"))
+        self.last_ingest = {"inserted": 0, "skipped_duplicates": 0}
         init_db()
 
     def generate_jd(self, job: str, must_have: str = "", nice_to_have: str = "", exclude_keywords: str = "", use_ai: bool = None):
@@ -82,48 +91,91 @@ class RecruitPipeline:
         rubric_with_questions = rubric.copy()
         if interview_questions:
             rubric_with_questions["interview_questions"] = interview_questions.get("questions", [])
-        cur.execute("INSERT INTO jd (id, job, jd_long, jd_short, rubric_json, created_at) VALUES (?, ?, ?, ?, ?, ?)",
-                    (str(uuid.uuid4()), job, jd_long, jd_short, json.dumps(rubric_with_questions, ensure_ascii=False), time.strftime("%Y-%m-%d %H:%M:%S")))
+        created_at, created_ts = now_timestamps()
+        cur.execute("INSERT INTO jd (id, job, jd_long, jd_short, rubric_json, created_at, created_ts) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (str(uuid.uuid4()), job, jd_long, jd_short, json.dumps(rubric_with_questions, ensure_ascii=False), created_at, created_ts))
         conn.commit(); conn.close(); audit_log("save_jd", {"job":job})
 
-    def ingest_resumes_df(self, df: pd.DataFrame):
+    def ingest_resumes_df(self, df: pd.DataFrame, chunk_size: int = DEFAULT_CHUNK_SIZE):
         expected = {"name","email","phone","edu","companies","years","skills","projects","text_raw"}
         for c in expected - set(df.columns):
             df[c] = ""
-        conn = get_db(); cur = conn.cursor()
-        insert_sql = (
-            "INSERT INTO resume (id,name,email,phone,edu,companies,years,skills,projects,text_raw,source,created_at) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
-        )
-        for _, row in df.iterrows():
-            cur.execute(
-                insert_sql,
-                (
-                    str(uuid.uuid4()),
-                    str(row["name"]),
-                    str(row["email"]),
-                    str(row["phone"]),
-                    str(row["edu"]),
-                    str(row["companies"]),
-                    float(row["years"] or 0),
-                    str(row["skills"]),
-                    str(row["projects"]),
-                    str(row["text_raw"]),
-                    "csv",
-                    time.strftime("%Y-%m-%d %H:%M:%S"),
-                ),
-            )
-        conn.commit(); conn.close(); audit_log("ingest_resumes_df", {"count": len(df)})
+        dedup = self._dedup_index()
+        conn = get_db()
+        count = insert_resumes(conn, df, source="csv", chunk_size=chunk_size, dedup=dedup)
+        conn.close()
+        self._record_ingest("ingest_resumes_df", count, dedup)
+        return count
+
+    def ingest_resumes_csv(self, path_or_buffer, chunksize: int = 20000) -> int:
+        """
+        分块读取简历 CSV 并批量写入：每块 executemany + 独立事务，内存占用与文件大小无关。
+        全部列按字符串读取，避免手机号等字段被解析成数字；返回导入行数。
+        """
+        dedup = self._dedup_index()
+        conn = get_db()
+        total = 0
+        try:
+            for chunk in pd.read_csv(path_or_buffer, chunksize=chunksize, dtype=str, keep_default_na=False):
+                total += insert_resumes(conn, chunk, source="csv", chunk_size=chunksize, dedup=dedup)
+        finally:
+            conn.close()
+        self._record_ingest("ingest_resumes_csv", total, dedup)
+        return total
+
+    def _dedup_index(self) -> DedupIndex:
+        return DedupIndex(self.cfg.get("dedup_keys"))
+
+    def _record_ingest(self, action: str, count: int, dedup: DedupIndex) -> None:
+        """记录本次导入结果；跳过的重复简历即节省的一次评分"""
+        self.last_ingest = {"inserted": count, "skipped_duplicates": dedup.skipped}
+        audit_log(action, {"count": count, "skipped_duplicates": dedup.skipped})
+        if count:
+            self._refresh_index()
+
+    def _refresh_index(self) -> None:
+        """新简历增量写入 BM25 索引；索引失败不影响导入"""
+        if not index_auto_update_enabled():
+            return
+        conn = get_db()
+        try:
+            refresh_resume_index(conn)
+        except Exception as e:
+            print(f"[WARNING] 简历索引更新失败: {str(e)}", flush=True)
+        finally:
+            conn.close()
+
+    def retrieve_resumes(self, jd_text: str, top_k: int = 200) -> pd.DataFrame:
+        """
+        BM25 召回：返回与 JD 最相关的 top_k 份简历（含 bm25_score 列，按得分降序），
+        作为 LLM 精评前的预筛。
+        """
+        conn = get_db()
+        try:
+            hits = search_resumes(conn, jd_text, top_k)
+            if not hits:
+                return pd.DataFrame()
+            ids = [rid for rid, _ in hits]
+            marks = ",".join("?" * len(ids))
+            df = pd.read_sql_query(f"SELECT * FROM resume WHERE id IN ({marks})", conn, params=ids)
+        finally:
+            conn.close()
+        df["bm25_score"] = df["id"].map(dict(hits))
+        return df.sort_values("bm25_score", ascending=False, kind="stable").reset_index(drop=True)
 
     def ingest_text_resume(self, txt: str):
         parsed = parse_text_resume(txt)
         conn = get_db(); cur = conn.cursor()
-        insert_sql = (
-            "INSERT INTO resume (id,name,email,phone,edu,companies,years,skills,projects,text_raw,source,created_at) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
-        )
+        dedup = self._dedup_index()
+        hashes = dedup.hashes(parsed)
+        dedup.load_existing(conn, [hashes])
+        if dedup.check_and_add(hashes):
+            conn.close()
+            self._record_ingest("ingest_text_resume", 0, dedup)
+            return 0
+        created_at, created_ts = now_timestamps()
         cur.execute(
-            insert_sql,
+            RESUME_INSERT_SQL,
             (
                 str(uuid.uuid4()),
                 parsed.get("name", ""),
@@ -136,12 +188,22 @@ class RecruitPipeline:
                 "",
                 txt,
                 "txt",
-                time.strftime("%Y-%m-%d %H:%M:%S"),
+                created_at,
+                created_ts,
+                key_hash("phone", parsed.get("phone", "")),
+                key_hash("email", parsed.get("email", "")),
             ),
         )
-        conn.commit(); conn.close(); audit_log("ingest_text_resume", {"len": len(txt)})
+        conn.commit(); conn.close()
+        self._record_ingest("ingest_text_resume", 1, dedup)
+        return 1
 
-    def score_all(self, job: str) -> pd.DataFrame:
+    def score_all(self, job: str, force: bool = False) -> pd.DataFrame:
+        """
+        增量评分：按 (resume_id, job, 规则集哈希, 权重哈希) 判断，只对还没有当前有效评分的简历打分。
+        旧评分标记为失效(is_current=0)而不是重复插入；返回该岗位合并后的当前排名。
+        force=True 时重新评分全部简历。
+        """
         cfg = self.cfg
         rules = load_job_rules()
         jr = get_job_rule(job, rules)
@@ -151,42 +213,74 @@ class RecruitPipeline:
         wl = cfg.get("company_bias_whitelist", [])
         evidence_max = cfg.get("evidence_max", 3)
         thr = cfg.get("confidence_threshold", 0.65)
+        rules_hash = rules_fingerprint(jr, wl, evidence_max)
+        weights_hash = weights_fingerprint(weights)
 
         conn = get_db()
-        df = pd.read_sql_query("SELECT * FROM resume", conn)
+        if force:
+            df = pd.read_sql_query("SELECT * FROM resume", conn)
+        else:
+            df = pd.read_sql_query(
+                "SELECT r.* FROM resume r LEFT JOIN score s "
+                "ON s.resume_id = r.id AND s.job = ? AND s.is_current = 1 AND s.rules_hash = ? AND s.weights_hash = ? "
+                "WHERE s.id IS NULL",
+                conn, params=(job, rules_hash, weights_hash),
+            )
         conn.close()
 #         if df.empty: raise ValueError("数据库暂无简历,请先导入")
 
-        rows=[]
-        for _, r in df.iterrows():
-            score_dict, evidence, conf = compute_scores(jr, r.to_dict(), weights, wl, evidence_max)
-            blocked = conf < thr
-            rows.append({**r.to_dict(), **score_dict, "evidence":" | ".join(evidence), "confidence": conf, "blocked_by_threshold": blocked})
-        out = pd.DataFrame(rows).sort_values(by=["blocked_by_threshold","score_total"], ascending=[True, False]).reset_index(drop=True)
+        if not df.empty:
+            # 整表向量化评分，结果与逐行 compute_scores 一致
+            scored = compute_scores_frame(jr, df, weights, wl, evidence_max)
+            scored["evidence"] = scored["evidence"].str.join(" | ")
+            new = pd.concat([df[["id"]], scored], axis=1)
 
-        insert_sql = (
-            "INSERT INTO score (id,resume_id,job,score_total,skill_fit,exp_relevance,stability,growth,evidence_json,confidence,created_at) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
-        )
-        conn = get_db(); cur = conn.cursor()
-        for _, row in out.iterrows():
-            cur.execute(
-                insert_sql,
+            created_at, created_ts = now_timestamps()
+            score_rows = [
                 (
-                    str(uuid.uuid4()),
-                    row["id"],
-                    job,
-                    float(row["score_total"]),
-                    float(row["skill_fit"]),
-                    float(row["exp_relevance"]),
-                    float(row["stability"]),
-                    float(row["growth"]),
-                    json.dumps({"evidence": row["evidence"]}, ensure_ascii=False),
-                    float(row["confidence"]),
-                    time.strftime("%Y-%m-%d %H:%M:%S"),
-                ),
-            )
-        conn.commit(); conn.close(); audit_log("score_all", {"job":job, "count": len(out)})
+                    str(uuid.uuid4()), rid, job, float(total), float(skill), float(exp), float(stab), float(grow),
+                    json.dumps({"evidence": ev}, ensure_ascii=False), float(conf), created_at, created_ts, rules_hash, weights_hash,
+                )
+                for rid, total, skill, exp, stab, grow, ev, conf in zip(
+                    new["id"], new["score_total"], new["skill_fit"], new["exp_relevance"],
+                    new["stability"], new["growth"], new["evidence"], new["confidence"],
+                )
+            ]
+            conn = get_db()
+            try:
+                # 旧评分失效与新评分写入放在同一事务：中途失败整体回滚，不会留下没有当前评分的简历
+                with conn:
+                    # 同一简历同一岗位只保留一条当前评分：本轮要评分的正是缺少“当前规则下有效评分”的简历，
+                    # 因此一条语句即可让它们的旧评分失效（force 时全部失效）
+                    if force:
+                        conn.execute("UPDATE score SET is_current = 0 WHERE job = ? AND is_current = 1", (job,))
+                    else:
+                        conn.execute(
+                            "UPDATE score SET is_current = 0 WHERE job = ? AND is_current = 1 "
+                            "AND (rules_hash IS NOT ? OR weights_hash IS NOT ?)",
+                            (job, rules_hash, weights_hash),
+                        )
+                    conn.executemany(SCORE_INSERT_SQL, score_rows)
+            finally:
+                conn.close()
+
+        out = self.current_scores(job, rules_hash, weights_hash)
+        out["blocked_by_threshold"] = out["confidence"] < thr
+        out = out.sort_values(by=["blocked_by_threshold","score_total"], ascending=[True, False]).reset_index(drop=True)
+        audit_log("score_all", {"job":job, "count": len(out), "scored": len(df)})
+        return out
+
+    def current_scores(self, job: str, rules_hash: str, weights_hash: str) -> pd.DataFrame:
+        """读取某岗位在当前规则集/权重下的有效评分，并与简历信息合并"""
+        conn = get_db()
+        out = pd.read_sql_query(
+            "SELECT r.*, s.score_total, s.skill_fit, s.exp_relevance, s.stability, s.growth, s.evidence_json, s.confidence "
+            "FROM score s JOIN resume r ON r.id = s.resume_id "
+            "WHERE s.job = ? AND s.is_current = 1 AND s.rules_hash = ? AND s.weights_hash = ?",
+            conn, params=(job, rules_hash, weights_hash),
+        )
+        conn.close()
+        out["evidence"] = [json.loads(v or "{}").get("evidence", "") for v in out.pop("evidence_json")]
         return out
 
     def dedup_and_rank(self, df: pd.DataFrame) -> pd.DataFrame:
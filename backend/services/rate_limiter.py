@@ -0,0 +1,67 @@
+"""
+按 provider 的 LLM 请求限流（令牌桶）
+环境变量：
+- LLM_RATE_LIMIT_RPM_<PROVIDER>：指定 provider 的每分钟请求数，如 LLM_RATE_LIMIT_RPM_SILICONFLOW=60
+- LLM_RATE_LIMIT_RPM：未单独配置时的默认值
+未配置或为 0 时不限流。
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+
+class RateLimiter:
+    """线程安全的令牌桶，允许最多 burst 个请求瞬时通过"""
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None):
+        self.rate_per_second = float(rate_per_minute) / 60.0
+        self.capacity = float(burst if burst is not None else max(1, int(rate_per_minute // 60) or 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """阻塞直到拿到一个令牌，返回等待的秒数"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+                delay = (1.0 - self._tokens) / self.rate_per_second
+            time.sleep(delay)
+            waited += delay
+
+
+_limiters: Dict[str, Optional[RateLimiter]] = {}
+_limiters_lock = threading.Lock()
+
+
+def _configured_rpm(provider: str) -> float:
+    raw = os.getenv(f"LLM_RATE_LIMIT_RPM_{provider.upper()}") or os.getenv("LLM_RATE_LIMIT_RPM") or "0"
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return 0.0
+
+
+def get_rate_limiter(provider: Optional[str]) -> Optional[RateLimiter]:
+    """获取 provider 对应的进程级限流器；未配置限流时返回 None"""
+    key = (provider or "default").lower()
+    with _limiters_lock:
+        if key not in _limiters:
+            rpm = _configured_rpm(key)
+            _limiters[key] = RateLimiter(rpm) if rpm > 0 else None
+        return _limiters[key]
+
+
+def acquire(provider: Optional[str]) -> float:
+    limiter = get_rate_limiter(provider)
+    return limiter.acquire() if limiter else 0.0
@@ -0,0 +1,409 @@
+"""
+简历 BM25 倒排索引（LLM 评分前的召回 / 预筛）
+- 分词：英文数字取 2 位以上的词，中文连续片段切成二元组（单字片段保留单字）
+- 存储：按词排序的 CSR 倒排表（NumPy 数组），新增简历先进入增量段，
+  增量 posting 超过阈值后与主段合并；search 同时查询两个段
+- 持久化：backend/storage/index/resume_bm25/ 下的基线快照（main.npz / docs.npz / vocab.json / meta.json）
+  加追加写的增量日志 delta.jsonl（新文档 id 与长度、新词、增量 posting）；
+  平时保存只追加一行，耗时与新增量成正比；增量段合并进主段后重写基线并清空日志。
+  按 resume 表 rowid 增量同步
+
+SciPy 不是项目依赖，CSR 结构直接用 NumPy 的 indptr / indices / data 三个数组表示。
+
+环境变量：
+- RESUME_INDEX_AUTO_UPDATE：0 关闭导入简历后自动更新索引（默认开启）
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import threading
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_INDEX_DIR = Path("backend/storage/index/resume_bm25")
+INDEX_FORMAT_VERSION = 2
+# 增量段 posting 数超过该值时合并进主段
+COMPACT_THRESHOLD = 200_000
+# 参与索引的 resume 列
+INDEXED_COLUMNS = ("skills", "projects", "companies", "edu", "text_raw")
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]{2,}|[\u4e00-\u9fa5]+")
+
+
+def index_auto_update_enabled() -> bool:
+    return os.getenv("RESUME_INDEX_AUTO_UPDATE", "1").strip() not in ("0", "false", "False", "off")
+
+
+def tokenize(text: str) -> List[str]:
+    """英文 / 数字词 + 中文二元组"""
+    tokens: List[str] = []
+    for tok in _TOKEN_PATTERN.findall((text or "").lower()):
+        if tok.isascii() or len(tok) == 1:
+            tokens.append(tok)
+        else:
+            tokens.extend(tok[i:i + 2] for i in range(len(tok) - 1))
+    return tokens
+
+
+class _Segment:
+    """按词编号排序的倒排段：indptr[t]:indptr[t+1] 为词 t 的 posting"""
+
+    __slots__ = ("indptr", "docs", "tfs")
+
+    def __init__(self, indptr: np.ndarray, docs: np.ndarray, tfs: np.ndarray):
+        self.indptr = indptr
+        self.docs = docs
+        self.tfs = tfs
+
+    @classmethod
+    def empty(cls) -> "_Segment":
+        return cls(np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32))
+
+    @classmethod
+    def build(cls, terms: np.ndarray, docs: np.ndarray, tfs: np.ndarray, n_terms: int) -> "_Segment":
+        order = np.argsort(terms, kind="stable")
+        indptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=n_terms), out=indptr[1:])
+        return cls(indptr, docs[order].astype(np.int32), tfs[order].astype(np.float32))
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def postings(self, term: int) -> Tuple[np.ndarray, np.ndarray]:
+        if term + 1 >= len(self.indptr):
+            return self.docs[:0], self.tfs[:0]
+        start, end = self.indptr[term], self.indptr[term + 1]
+        return self.docs[start:end], self.tfs[start:end]
+
+    def triples(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        terms = np.repeat(np.arange(len(self.indptr) - 1, dtype=np.int32), np.diff(self.indptr))
+        return terms, self.docs, self.tfs
+
+
+class BM25Index:
+    """可增量更新的 BM25 索引（线程安全）"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocab: Dict[str, int] = {}
+        # 按编号排列的词，保存时据此切出新词
+        self._terms: List[str] = []
+        self.doc_ids: List[str] = []
+        self.last_rowid = 0
+        self._doc_set: set = set()
+        self._doc_len: List[int] = []
+        self._main = _Segment.empty()
+        self._main_dirty = False
+        self._pending: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._pending_size = 0
+        self._pending_segment: Optional[_Segment] = None
+        self._norm: Optional[np.ndarray] = None
+        # 已落盘的状态：基线代号、文档数、词数、增量块数；save 只追加之后的部分
+        self._generation = ""
+        self._saved_docs = 0
+        self._saved_vocab = 0
+        self._saved_pending = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_set
+
+    # ---------- 写入 ----------
+
+    def add_documents(self, docs: Iterable[Tuple[str, str]]) -> int:
+        """追加 (resume_id, 文本)；已在索引中的 id 跳过，返回新增文档数"""
+        terms: List[int] = []
+        doc_idx: List[int] = []
+        tfs: List[int] = []
+        added = 0
+        with self._lock:
+            for doc_id, text in docs:
+                if doc_id in self._doc_set:
+                    continue
+                pos = len(self.doc_ids)
+                tokens = tokenize(text)
+                for tok, tf in Counter(tokens).items():
+                    term = self.vocab.get(tok)
+                    if term is None:
+                        term = self.vocab[tok] = len(self.vocab)
+                        self._terms.append(tok)
+                    terms.append(term)
+                    doc_idx.append(pos)
+                    tfs.append(tf)
+                self.doc_ids.append(doc_id)
+                self._doc_set.add(doc_id)
+                self._doc_len.append(len(tokens))
+                added += 1
+            if not added:
+                return 0
+            self._pending.append((
+                np.asarray(terms, dtype=np.int32),
+                np.asarray(doc_idx, dtype=np.int32),
+                np.asarray(tfs, dtype=np.float32),
+            ))
+            self._pending_size += len(terms)
+            self._pending_segment = None
+            self._norm = None
+            if self._pending_size >= COMPACT_THRESHOLD:
+                self.compact()
+        return added
+
+    def compact(self) -> None:
+        """把增量段合并进主段"""
+        with self._lock:
+            if not self._pending:
+                return
+            parts = [self._main.triples()] + self._pending
+            terms, docs, tfs = (np.concatenate(col) for col in zip(*parts))
+            self._main = _Segment.build(terms, docs, tfs, len(self.vocab))
+            self._main_dirty = True
+            self._pending = []
+            self._pending_size = 0
+            self._pending_segment = None
+
+    # ---------- 查询 ----------
+
+    def _segments(self) -> List[_Segment]:
+        if self._pending and self._pending_segment is None:
+            terms, docs, tfs = (np.concatenate(col) for col in zip(*self._pending))
+            self._pending_segment = _Segment.build(terms, docs, tfs, len(self.vocab))
+        return [self._main] + ([self._pending_segment] if self._pending else [])
+
+    def _length_norm(self) -> np.ndarray:
+        if self._norm is None:
+            doc_len = np.asarray(self._doc_len, dtype=np.float32)
+            avgdl = float(doc_len.mean()) if len(doc_len) else 1.0
+            self._norm = self.k1 * (1 - self.b + self.b * doc_len / max(avgdl, 1e-9))
+        return self._norm
+
+    def search(self, query: str, top_k: int = 50) -> List[Tuple[str, float]]:
+        """返回与查询文本 BM25 得分最高的 top_k 个 (resume_id, score)，得分为 0 的不返回"""
+        with self._lock:
+            n_docs = len(self.doc_ids)
+            terms = {self.vocab[t] for t in tokenize(query) if t in self.vocab}
+            if not n_docs or not terms or top_k <= 0:
+                return []
+            segments = self._segments()
+            norm = self._length_norm()
+            scores = np.zeros(n_docs, dtype=np.float32)
+            for term in terms:
+                postings = [seg.postings(term) for seg in segments]
+                df = sum(len(docs) for docs, _ in postings)
+                if not df:
+                    continue
+                idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+                for docs, tfs in postings:
+                    # 同一段内一个词对每篇文档只有一条 posting，可直接按下标累加
+                    scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm[docs])
+            hits = int(np.count_nonzero(scores))
+            k = min(top_k, hits)
+            if not k:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [(self.doc_ids[i], float(scores[i])) for i in top]
+
+    # ---------- 持久化 ----------
+
+    def save(self, directory: Path = DEFAULT_INDEX_DIR) -> None:
+        """
+        保存索引。主段合并过、本实例还没有基线（新建 / 重建的索引），或目录里的基线不是本实例写的
+        （没有基线、旧格式、被其他实例重写）时，重写基线快照并清空增量日志；
+        否则只向 delta.jsonl 追加上次保存之后的新文档、新词和增量 posting。
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            if self._main_dirty or not self._generation or _saved_generation(directory) != self._generation:
+                self._save_base(directory)
+                return
+            if len(self.doc_ids) == self._saved_docs:
+                return
+            chunks = self._pending[self._saved_pending:]
+            terms, docs, tfs = (np.concatenate(col) for col in zip(*chunks))
+            record = {
+                "generation": self._generation,
+                "doc_ids": self.doc_ids[self._saved_docs:],
+                "doc_len": self._doc_len[self._saved_docs:],
+                "terms": self._terms[self._saved_vocab:],
+                "posting_terms": terms.tolist(),
+                "posting_docs": docs.tolist(),
+                "posting_tfs": tfs.astype(np.int32).tolist(),
+                "last_rowid": self.last_rowid,
+            }
+            with open(directory / "delta.jsonl", "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._mark_saved(len(self._pending))
+
+    def _save_base(self, directory: Path) -> None:
+        """增量段先合并进主段，再整体写出基线；meta.json 最后写入，代号变化后旧日志作废"""
+        self.compact()
+        # 随机代号：整体重建的索引也不会与目录里残留的旧日志撞号
+        self._generation = uuid.uuid4().hex
+        _atomic_npz(directory / "main.npz", indptr=self._main.indptr, docs=self._main.docs, tfs=self._main.tfs)
+        _atomic_npz(
+            directory / "docs.npz",
+            doc_ids=np.asarray(self.doc_ids, dtype=str),
+            doc_len=np.asarray(self._doc_len, dtype=np.int32),
+        )
+        _atomic_text(directory / "vocab.json", json.dumps(self._terms, ensure_ascii=False))
+        _atomic_text(directory / "meta.json", json.dumps({
+            "version": INDEX_FORMAT_VERSION,
+            "generation": self._generation,
+            "k1": self.k1,
+            "b": self.b,
+            "docs": len(self.doc_ids),
+            "vocab": len(self._terms),
+            "last_rowid": self.last_rowid,
+        }))
+        _atomic_text(directory / "delta.jsonl", "")
+        self._main_dirty = False
+        self._mark_saved(0)
+
+    def _mark_saved(self, pending_chunks: int) -> None:
+        self._saved_docs = len(self.doc_ids)
+        self._saved_vocab = len(self._terms)
+        self._saved_pending = pending_chunks
+
+    @classmethod
+    def load(cls, directory: Path = DEFAULT_INDEX_DIR) -> "BM25Index":
+        """读取基线快照并回放增量日志；不存在或格式不符时返回空索引"""
+        directory = Path(directory)
+        meta_path = directory / "meta.json"
+        if not meta_path.exists():
+            return cls()
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if meta.get("version") != INDEX_FORMAT_VERSION:
+                return cls()
+            index = cls(k1=meta["k1"], b=meta["b"])
+            index._terms = json.loads((directory / "vocab.json").read_text(encoding="utf-8"))
+            with np.load(directory / "docs.npz") as data:
+                index.doc_ids = [str(v) for v in data["doc_ids"]]
+                index._doc_len = data["doc_len"].tolist()
+            with np.load(directory / "main.npz") as data:
+                index._main = _Segment(data["indptr"], data["docs"], data["tfs"])
+            if len(index.doc_ids) != meta.get("docs") or len(index._terms) != meta.get("vocab"):
+                raise ValueError("基线文件与元数据不一致")
+            index._generation = str(meta.get("generation", ""))
+            index.last_rowid = int(meta.get("last_rowid", 0))
+            index._replay_delta(directory / "delta.jsonl")
+            index.vocab = {term: i for i, term in enumerate(index._terms)}
+            index._doc_set = set(index.doc_ids)
+            index._mark_saved(len(index._pending))
+            return index
+        except Exception as e:
+            print(f"[WARNING] 简历索引读取失败，将重建: {str(e)}", flush=True)
+            return cls()
+
+    def _replay_delta(self, path: Path) -> None:
+        """按顺序回放增量日志；遇到写了一半的尾行即停止，下次保存时重写基线"""
+        if not path.exists():
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    self._main_dirty = True
+                    break
+                if record.get("generation") != self._generation:
+                    # 重写基线时中断留下的旧日志，内容已在基线里
+                    continue
+                self.doc_ids.extend(record["doc_ids"])
+                self._doc_len.extend(record["doc_len"])
+                self._terms.extend(record["terms"])
+                chunk = (
+                    np.asarray(record["posting_terms"], dtype=np.int32),
+                    np.asarray(record["posting_docs"], dtype=np.int32),
+                    np.asarray(record["posting_tfs"], dtype=np.float32),
+                )
+                self._pending.append(chunk)
+                self._pending_size += len(chunk[0])
+                self.last_rowid = int(record["last_rowid"])
+
+    # ---------- 与 resume 表同步 ----------
+
+    def sync_from_db(self, conn, batch_size: int = 5000) -> int:
+        """按 rowid 增量索引 resume 表中的新简历，返回新增文档数"""
+        cols = ", ".join(f"COALESCE({c}, '')" for c in INDEXED_COLUMNS)
+        added = 0
+        with self._lock:
+            while True:
+                rows = conn.execute(
+                    f"SELECT rowid, id, {cols} FROM resume WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (self.last_rowid, batch_size),
+                ).fetchall()
+                if not rows:
+                    break
+                added += self.add_documents((row[1], " ".join(row[2:])) for row in rows)
+                self.last_rowid = rows[-1][0]
+        return added
+
+
+def _saved_generation(directory: Path) -> Optional[str]:
+    """目录中基线快照的代号；没有基线或格式不符时返回 None"""
+    try:
+        meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != INDEX_FORMAT_VERSION:
+        return None
+    return str(meta.get("generation", ""))
+
+
+def _atomic_npz(path: Path, **arrays) -> None:
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
+
+
+def _atomic_text(path: Path, text: str) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+_indexes: Dict[str, BM25Index] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_resume_index(directory: Path = DEFAULT_INDEX_DIR) -> BM25Index:
+    """进程内共享的索引实例（按目录绝对路径区分）"""
+    key = str(Path(directory).resolve())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = BM25Index.load(directory)
+    return index
+
+
+def refresh_resume_index(conn, directory: Path = DEFAULT_INDEX_DIR) -> BM25Index:
+    """把 resume 表的新增简历同步进索引并保存；库被重建（rowid 回退）时整体重建"""
+    index = get_resume_index(directory)
+    max_rowid = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM resume").fetchone()[0]
+    if max_rowid < index.last_rowid:
+        index = BM25Index(k1=index.k1, b=index.b)
+        with _indexes_lock:
+            _indexes[str(Path(directory).resolve())] = index
+    if index.sync_from_db(conn):
+        index.save(directory)
+    return index
+
+
+def search_resumes(conn, query: str, top_k: int = 50, directory: Path = DEFAULT_INDEX_DIR) -> List[Tuple[str, float]]:
+    """先同步再检索：返回与 JD 最相关的 top_k 份简历 (resume_id, score)"""
+    return refresh_resume_index(conn, directory).search(query, top_k)
@@ -1,16 +1,20 @@
 # backend/services/resume_parser.py
+import hashlib
 import os
 import re
 import textwrap
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import chardet
 import fitz
 import pandas as pd
 import pytesseract
 from PIL import Image
-from pdf2image import convert_from_path
 
 # optional imports (best-effort)
 try:  # pragma: no cover
@@ -37,12 +41,25 @@ except Exception:  # pragma: no cover
 import zipfile
 from xml.etree import ElementTree
 
+from backend.core.near_dup import SIGNATURE_COLUMN, minhash_signature, near_dup_enabled
+from backend.services.batch_executor import run_bounded, run_bounded_processes
+from backend.services.parse_cache import get_parse_cache, parse_cache_enabled, parse_cache_key
+
 default_tesseract = Path(r"C:\Program Files\Tesseract-OCR\tesseract.exe")
 if default_tesseract.exists():
     pytesseract.pytesseract.tesseract_cmd = str(default_tesseract)
 
 SUPPORTED_EXT = {".pdf", ".docx", ".txt", ".jpg", ".jpeg", ".png"}
 
+# 解析逻辑变化时递增，旧的解析缓存随之失效
+PARSER_VERSION = "3"
+
+# 页面级 OCR：文字层少于该字符数的页面视为扫描页
+OCR_PAGE_MIN_CHARS = 20
+OCR_TARGET_LONG_EDGE_PX = 3500
+OCR_MIN_DPI = 150
+OCR_MAX_DPI = 300
+
 
 def _clean_text(text: str) -> str:
     text = text.replace("\x00", " ").replace("\r", "\n")
@@ -879,360 +896,231 @@ def infer_candidate_name(text: str, filename: str) -> str:
     return ""
 
 
-def extract_pdf_text(path: Path) -> str:
-    """提取PDF文本,使用多种方法确保成功"""
-    text = ""
-    
-    # 方法1: 使用 PyMuPDF (fitz) - 最常用且快速
-    try:
-        doc = fitz.open(str(path))
-        raw_parts = []
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            # 优先使用标准文本提取
-            page_text = page.get_text("text") or ""
-            # 如果标准方法失败,尝试使用blocks方法
-            if not page_text.strip():
-                blocks = page.get_text("blocks")
-                if blocks:
-                    block_texts = [
-                        str(block[4])
-                        for block in blocks
-                        if len(block) > 4 and isinstance(block[4], str)
-                    ]
-                    page_text = "\n".join(block_texts)
-            # 再尝试原始字典
-            if not page_text.strip():
-                raw_dict = page.get_text("rawdict")
-                if isinstance(raw_dict, dict):
-                    page_text = json.dumps(raw_dict, ensure_ascii=False)
-                elif raw_dict:
-                    page_text = str(raw_dict)
-            raw_parts.append(page_text)
-        doc.close()
-        text = _clean_text("\n".join(raw_parts))
-        if len(text.strip()) >= 50:
-            return text
-    except Exception:
-        pass
-    
-    # 方法2: 使用 pdfplumber (如果可用) - 对某些PDF格式更有效
-    if pdfplumber:
+@dataclass
+class PdfPageLayers:
+    """单页的各层文本：打开文档时一次性计算，供所有回退策略共享"""
+    text: str = ""
+    blocks_text: str = ""
+    raw_text: str = ""
+    has_images: bool = False
+
+    @property
+    def best_text(self) -> str:
+        # 与原先逐页回退顺序一致：text -> blocks -> rawdict
+        for candidate in (self.text, self.blocks_text, self.raw_text):
+            if candidate.strip():
+                return candidate
+        return ""
+
+
+def _rawdict_text(raw_dict) -> str:
+    """把 rawdict 的逐字符结构还原成文本（旧实现直接把整个字典转成字符串）"""
+    if not isinstance(raw_dict, dict):
+        return ""
+    lines = []
+    for block in raw_dict.get("blocks", []):
+        for line in block.get("lines", []) or []:
+            chars = [ch.get("c", "") for span in line.get("spans", []) for ch in span.get("chars", [])]
+            if chars:
+                lines.append("".join(chars))
+    return "\n".join(lines)
+
+
+def _load_page_layers(doc) -> List[PdfPageLayers]:
+    """单次遍历文档：每页只计算一次各层文本，blocks/rawdict 仅在标准文本为空时计算"""
+    layers = []
+    for page in doc:
+        layer = PdfPageLayers(text=page.get_text("text") or "")
+        if not layer.text.strip():
+            blocks = page.get_text("blocks") or []
+            layer.blocks_text = "\n".join(
+                str(block[4]) for block in blocks if len(block) > 4 and isinstance(block[4], str)
+            )
+            if not layer.blocks_text.strip():
+                layer.raw_text = _rawdict_text(page.get_text("rawdict"))
         try:
-            with pdfplumber.open(str(path)) as pdf:
-                pages = []
-                for page in pdf.pages:
-                    page_text = page.extract_text() or ""
-                    if not page_text.strip():
-                        tables = page.extract_tables()
-                        if tables:
-                            for table in tables:
-                                for row in table:
-                                    if row:
-                                        row_text = " ".join([str(cell) if cell else "" for cell in row])
-                                        page_text += row_text + "\n"
-                    pages.append(page_text)
-            new_text = _clean_text("\n".join(pages))
-            if len(new_text.strip()) >= len(text.strip()):
-                text = new_text
-            if len(text.strip()) >= 50:
-                return text
+            layer.has_images = bool(page.get_images(full=False))
         except Exception:
-            pass
-    
-    return text
+            layer.has_images = False
+        layers.append(layer)
+    return layers
 
 
-def ocr_pdf(path: Path) -> str:
-    """使用OCR提取PDF文本(用于扫描版PDF)"""
+def _pdfplumber_text(path: Path) -> str:
+    """pdfplumber 对某些PDF格式更有效（独立的解析库，需要单独打开文件）"""
+    if not pdfplumber:
+        return ""
     try:
-        poppler_path = os.getenv("POPPLER_PATH")
-        # 尝试转换PDF为图片
-        pages = convert_from_path(str(path), dpi=300, poppler_path=poppler_path)
-        text_chunks: List[str] = []
-        for page in pages:
-            try:
-                # 尝试中文OCR,如果失败则使用英文
-                page_text = pytesseract.image_to_string(page, lang="chi_sim+eng")
+        with pdfplumber.open(str(path)) as pdf:
+            pages = []
+            for page in pdf.pages:
+                page_text = page.extract_text() or ""
                 if not page_text.strip():
-                    page_text = pytesseract.image_to_string(page, lang="eng")
-                text_chunks.append(page_text)
-            except Exception:
-                # 如果OCR失败,尝试只使用英文
-                try:
-                    page_text = pytesseract.image_to_string(page, lang="eng")
-                    text_chunks.append(page_text)
-                except Exception:
-                    text_chunks.append("")
-        result = _clean_text("\n".join(text_chunks))
-        return result
-    except Exception as e:
-        # OCR失败,返回空字符串
+                    tables = page.extract_tables()
+                    if tables:
+                        for table in tables:
+                            for row in table:
+                                if row:
+                                    row_text = " ".join([str(cell) if cell else "" for cell in row])
+                                    page_text += row_text + "\n"
+                pages.append(page_text)
+        return _clean_text("\n".join(pages))
+    except Exception:
         return ""
 
 
-def parse_pdf(path: Path) -> Tuple[str, Dict[str, str]]:
-    """解析PDF文件,优先使用文本提取,失败时使用OCR"""
-    # 首先尝试直接提取文本
-    text = extract_pdf_text(path)
-    
-    # 如果提取的文本太少(可能是扫描版PDF),尝试OCR
-    if len(text.strip()) < 100:
-        ocr_text = ocr_pdf(path)
-        if ocr_text and len(ocr_text.strip()) > len(text.strip()):
-            text = ocr_text
-    
-    # 如果仍然没有文本,尝试使用PyMuPDF的其他方法
-    if not text.strip():
-        try:
-            doc = fitz.open(str(path))
-            raw_parts = []
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                # 尝试不同的文本提取方法
-                page_text = page.get_text("text") or ""
-                if not page_text.strip():
-                    # 尝试获取原始文本
-                    page_text = page.get_text("rawdict") or ""
-                    if isinstance(page_text, dict):
-                        page_text = str(page_text)
-                raw_parts.append(page_text)
-            doc.close()
-            text = "\n".join(raw_parts)
-            text = _clean_text(text)
-        except Exception:
-            pass
-    
-    # 提取联系信息
-    contacts = extract_contacts(text)
-    
-    return text, contacts
+def default_ocr_workers() -> int:
+    """页面级 OCR 并发线程数：环境变量 RESUME_OCR_WORKERS，默认 min(4, CPU 核数)"""
+    fallback = max(1, min(4, os.cpu_count() or 1))
+    try:
+        return max(1, int(os.getenv("RESUME_OCR_WORKERS") or fallback))
+    except ValueError:
+        return fallback
 
 
-def parse_docx(path: Path) -> Tuple[str, Dict[str, str]]:
-    text = ""
-    if docx2txt:
-        try:
-            text = docx2txt.process(str(path)) or ""
-        except Exception:
-            text = ""
-    if (not text or len(text.strip()) < 20) and Document:
-        try:
-            doc = Document(str(path))
-            parts = []
-            for para in doc.paragraphs:
-                if para.text:
-                    parts.append(para.text)
-            for table in getattr(doc, "tables", []):
-                for row in table.rows:
-                    cells = [cell.text.strip() for cell in row.cells if cell.text]
-                    if cells:
-                        parts.append(" ".join(cells))
-            text = "\n".join(parts)
-        except Exception:
-            pass
-    if not text or len(text.strip()) < 20:
-        text = _extract_docx_via_xml(path)
-    cleaned = _clean_text(text)
-    return cleaned, extract_contacts(cleaned)
+def ocr_workers_per_process(parse_workers: int) -> int:
+    """
+    进程池中每个解析进程的 OCR 线程数：CPU 核数按解析进程数平分，且不超过 RESUME_OCR_WORKERS，
+    避免 N 个解析进程各开 M 个 tesseract 线程超额占用 CPU
+    """
+    share = (os.cpu_count() or 1) // max(1, parse_workers)
+    return max(1, min(default_ocr_workers(), share))
 
 
-def _extract_docx_via_xml(path: Path) -> str:
-    try:
-        with zipfile.ZipFile(path) as zf:
-            xml_bytes = zf.read("word/document.xml")
-        root = ElementTree.fromstring(xml_bytes)
-        ns = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
-        paragraphs = []
-        for para in root.findall(".//w:p", ns):
-            texts = [node.text for node in para.findall(".//w:t", ns) if node.text]
-            if texts:
-                paragraphs.append("".join(texts))
-        return "\n".join(paragraphs)
-    except Exception:
-        return ""
+def _ocr_dpi(page) -> int:
+    """按页面尺寸自适应 DPI：长边约 OCR_TARGET_LONG_EDGE_PX 像素（A4 约 300 DPI，大幅面页面相应降低）"""
+    long_edge_inch = max(page.rect.width, page.rect.height) / 72.0
+    if long_edge_inch <= 0:
+        return OCR_MAX_DPI
+    return int(max(OCR_MIN_DPI, min(OCR_MAX_DPI, OCR_TARGET_LONG_EDGE_PX / long_edge_inch)))
 
 
-def parse_txt(path: Path) -> Tuple[str, Dict[str, str]]:
-    raw = path.read_bytes()
-    text = _detect_encoding_and_read(raw)
-    return _clean_text(text), extract_contacts(text)
+def _render_page_for_ocr(page) -> Image.Image:
+    """直接用 PyMuPDF 渲染灰度位图，无需 poppler 转换"""
+    pix = page.get_pixmap(dpi=_ocr_dpi(page), colorspace=fitz.csGRAY, alpha=False)
+    return Image.frombytes("L", (pix.width, pix.height), pix.samples)
 
 
-def parse_image(path: Path) -> Tuple[str, Dict[str, str]]:
-    text = ""
+def _ocr_image(image: Image.Image) -> str:
     try:
-        with Image.open(str(path)) as img:
-            text = pytesseract.image_to_string(img, lang="chi_sim+eng")
+        # 尝试中文OCR,如果失败则使用英文
+        page_text = pytesseract.image_to_string(image, lang="chi_sim+eng")
+        if not page_text.strip():
+            page_text = pytesseract.image_to_string(image, lang="eng")
+        return page_text
     except Exception:
-        text = ""
-    return _clean_text(text), extract_contacts(text)
-
+        # 如果OCR失败,尝试只使用英文
+        try:
+            return pytesseract.image_to_string(image, lang="eng")
+        except Exception:
+            return ""
 
-def parse_one_to_text(path: Path) -> Tuple[str, Dict[str, str]]:
-    suffix = path.suffix.lower()
-    if suffix == ".pdf":
-        return parse_pdf(path)
-    if suffix == ".docx":
-        return parse_docx(path)
-    if suffix == ".txt":
-        return parse_txt(path)
-    if suffix in {".jpg", ".jpeg", ".png"}:
-        return parse_image(path)
-    return "", {"email": "", "phone": ""}
 
+def ocr_pdf_pages(doc, page_numbers: List[int], max_workers: Optional[int] = None) -> Dict[int, str]:
+    """
+    只对指定页做 OCR，返回 {页码: 文本}。
+    PyMuPDF 不支持多线程，渲染在当前线程按批进行；tesseract 识别在线程池中并行。
+    """
+    workers = max_workers or default_ocr_workers()
+    results: Dict[int, str] = {}
+    # 按批渲染，避免一次性把所有页面位图留在内存里
+    for start in range(0, len(page_numbers), workers):
+        batch = page_numbers[start:start + workers]
+        images = []
+        for page_num in batch:
+            try:
+                images.append(_render_page_for_ocr(doc[page_num]))
+            except Exception:
+                images.append(None)
+        texts = run_bounded(
+            images,
+            lambda image: _ocr_image(image) if image is not None else "",
+            lambda image, error: "",
+            max_workers=workers,
+        )
+        results.update(zip(batch, texts))
+    return results
 
-def save_uploaded_to_tmp(uploaded_file, out_dir: Path) -> Path:
-    out_dir.mkdir(parents=True, exist_ok=True)
-    filename = Path(uploaded_file.name).name
-    tmp_path = out_dir / filename
-    tmp_path.write_bytes(uploaded_file.getbuffer())
-    return tmp_path
 
+def _select_ocr_pages(layers: List[PdfPageLayers], force: bool) -> List[int]:
+    """文字层为空或极少的页面才需要 OCR；整份文档文字过少时不要求页面含图片"""
+    return [
+        i for i, layer in enumerate(layers)
+        if len(layer.text.strip()) < OCR_PAGE_MIN_CHARS and (force or layer.has_images)
+    ]
 
-def parse_uploaded_files_to_df(files: List, max_chars: int = 20000) -> pd.DataFrame:
-    rows = []
-    out_dir = Path("data/uploads")
-    out_dir.mkdir(parents=True, exist_ok=True)
 
-    cid = 1
-    for uploaded in files:
-        suffix = Path(uploaded.name).suffix.lower()
-        if suffix not in SUPPORTED_EXT:
-            continue
-        tmp_path = save_uploaded_to_tmp(uploaded, out_dir)
-        
-        # 解析文件
-        text, contacts = parse_one_to_text(tmp_path)
-        
-        # 如果解析失败(文本为空或太短),尝试其他方法
-        if not text.strip() or len(text.strip()) < 50:
-            # 对于PDF文件,尝试更激进的解析方法
-            if suffix == ".pdf":
-                try:
-                    # 再次尝试使用PyMuPDF,使用不同的参数
-                    doc = fitz.open(str(tmp_path))
-                    raw_parts = []
-                    for page_num in range(len(doc)):
-                        page = doc[page_num]
-                        # 尝试多种文本提取方法
-                        page_text = page.get_text("text") or ""
-                        if not page_text.strip():
-                            # 尝试使用blocks方法
-                            blocks = page.get_text("blocks")
-                            if blocks:
-                                page_text = "\n".join([block[4] for block in blocks if len(block) > 4])
-                        raw_parts.append(page_text)
-                    doc.close()
-                    text = "\n".join(raw_parts)
-                    text = _clean_text(text)
-                except Exception:
-                    pass
-        
-        # 限制文本长度
-        text = text[:max_chars] if text else ""
-        candidate_name = infer_candidate_name(text, tmp_path.name)
-        
-        rows.append(
-            {
-                "candidate_id": cid,
-                "file": tmp_path.name,
-                "name": candidate_name,
-                "resume_text": text,
-                "text_len": len(text),
-                "email": contacts.get("email", ""),
-                "phone": contacts.get("phone", ""),
-            }
-        )
-        cid += 1
+def _extract_pdf(path: Path, allow_ocr: bool = True, ocr_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    单次打开文档的PDF提取流程，返回 text / method / pages / ocr_pages。
+    策略依次为：PyMuPDF 文字层 -> pdfplumber -> 低文字页 OCR，全部复用同一份逐页文字层。
+    ocr_workers 为页面级 OCR 线程数，默认见 default_ocr_workers。
+    """
+    try:
+        doc = fitz.open(str(path))
+    except Exception:
+        text = _pdfplumber_text(path)
+        return {"text": text, "method": "pdfplumber" if text else "none", "pages": 0, "ocr_pages": 0}
 
-    df = pd.DataFrame(rows)
-    if df.empty:
-        return pd.DataFrame(columns=["candidate_id", "file", "name", "resume_text", "text_len", "email", "phone"])
+    try:
+        layers = _load_page_layers(doc)
+        text = _clean_text("\n".join(layer.best_text for layer in layers))
+        method = "fitz"
+
+        if len(text.strip()) < 50:
+            plumber_text = _pdfplumber_text(path)
+            if plumber_text and len(plumber_text.strip()) >= len(text.strip()):
+                text, method = plumber_text, "pdfplumber"
+
+        # 只对文字层为空/极少的页面做 OCR：整份文本太少(可能是扫描版PDF)时检查所有低文字页，
+        # 否则只处理含图片的低文字页（图文混排简历中的扫描页）
+        selected = _select_ocr_pages(layers, force=len(text.strip()) < 100) if allow_ocr else []
+        if selected:
+            ocr_texts = ocr_pdf_pages(doc, selected, max_workers=ocr_workers)
+            merged = []
+            for i, layer in enumerate(layers):
+                ocr_text = ocr_texts.get(i, "")
+                merged.append(ocr_text if len(ocr_text.strip()) > len(layer.best_text.strip()) else layer.best_text)
+            ocr_text = _clean_text("\n".join(merged))
+            if len(ocr_text.strip()) > len(text.strip()):
+                text = ocr_text
+                method = "ocr" if len(selected) == len(layers) else "fitz+ocr"
+    except Exception:
+        text, method, layers, selected = "", "none", [], []
+    finally:
+        doc.close()
 
-    source_columns = ["resume_text", "text", "full_text", "content", "parsed_text"]
+    return {
+        "text": text,
+        "method": method if text.strip() else "none",
+        "pages": len(layers),
+        "ocr_pages": len(selected),
+    }
 
-    def _coalesce_resume_text(row):
-        for col in source_columns:
-            if col in row and isinstance(row[col], str) and row[col].strip():
-                return row[col].strip()
-        for col in source_columns:
-            if col in row and row[col]:
-                return str(row[col]).strip()
-        return ""
 
-    df["resume_text"] = df.apply(_coalesce_resume_text, axis=1)
-    df["resume_text"] = df["resume_text"].fillna("").astype(str)
-    df["text_len"] = df["resume_text"].str.len()
+def extract_pdf_text(path: Path) -> str:
+    """提取PDF文本(不含OCR),使用多种方法确保成功"""
+    return _extract_pdf(path, allow_ocr=False)["text"]
 
-    drop_columns = [c for c in ["text", "full_text", "content", "parsed_text"] if c in df.columns]
-    if drop_columns:
-        df = df.drop(columns=drop_columns)
 
 def ocr_pdf(path: Path) -> str:
-    """使用OCR提取PDF文本(用于扫描版PDF)"""
+    """使用OCR提取PDF文本(用于扫描版PDF)，逐页渲染并并行识别"""
     try:
-        poppler_path = os.getenv("POPPLER_PATH")
-        # 尝试转换PDF为图片
-        pages = convert_from_path(str(path), dpi=300, poppler_path=poppler_path)
-        text_chunks: List[str] = []
-        for page in pages:
-            try:
-                # 尝试中文OCR,如果失败则使用英文
-                page_text = pytesseract.image_to_string(page, lang="chi_sim+eng")
-                if not page_text.strip():
-                    page_text = pytesseract.image_to_string(page, lang="eng")
-                text_chunks.append(page_text)
-            except Exception:
-                # 如果OCR失败,尝试只使用英文
-                try:
-                    page_text = pytesseract.image_to_string(page, lang="eng")
-                    text_chunks.append(page_text)
-                except Exception:
-                    text_chunks.append("")
-        result = _clean_text("\n".join(text_chunks))
-        return result
-    except Exception as e:
+        doc = fitz.open(str(path))
+        try:
+            ocr_texts = ocr_pdf_pages(doc, list(range(len(doc))))
+        finally:
+            doc.close()
+        return _clean_text("\n".join(ocr_texts[i] for i in sorted(ocr_texts)))
+    except Exception:
         # OCR失败,返回空字符串
         return ""
 
 
 def parse_pdf(path: Path) -> Tuple[str, Dict[str, str]]:
-    """解析PDF文件,优先使用文本提取,失败时使用OCR"""
-    # 首先尝试直接提取文本
-    text = extract_pdf_text(path)
-    
-    # 如果提取的文本太少(可能是扫描版PDF),尝试OCR
-    if len(text.strip()) < 100:
-        ocr_text = ocr_pdf(path)
-        if ocr_text and len(ocr_text.strip()) > len(text.strip()):
-            text = ocr_text
-    
-    # 如果仍然没有文本,尝试使用PyMuPDF的其他方法
-    if not text.strip():
-        try:
-            doc = fitz.open(str(path))
-            raw_parts = []
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                # 尝试不同的文本提取方法
-                page_text = page.get_text("text") or ""
-                if not page_text.strip():
-                    # 尝试获取原始文本
-                    page_text = page.get_text("rawdict") or ""
-                    if isinstance(page_text, dict):
-                        page_text = str(page_text)
-                raw_parts.append(page_text)
-            doc.close()
-            text = "\n".join(raw_parts)
-            text = _clean_text(text)
-        except Exception:
-            pass
-    
-    # 提取联系信息
-    contacts = extract_contacts(text)
-    
-    return text, contacts
+    """解析PDF文件,优先使用文本提取,失败时只对低文字页使用OCR"""
+    text = _extract_pdf(path)["text"]
+    return text, extract_contacts(text)
 
 
 def parse_docx(path: Path) -> Tuple[str, Dict[str, str]]:
@@ -1295,70 +1183,292 @@ def parse_image(path: Path) -> Tuple[str, Dict[str, str]]:
     return _clean_text(text), extract_contacts(text)
 
 
-def parse_one_to_text(path: Path) -> Tuple[str, Dict[str, str]]:
+_PARSE_METRICS: Counter = Counter()
+_PARSE_METRICS_LOCK = threading.Lock()
+
+
+def _record_parse_metrics(result: Optional[Dict[str, Any]], cached: bool = False) -> None:
+    """统计每种提取策略胜出的次数（在主进程中汇总，工作进程的结果随返回值带回）"""
+    result = result or {}
+    with _PARSE_METRICS_LOCK:
+        _PARSE_METRICS["files"] += 1
+        if cached:
+            _PARSE_METRICS["cache"] += 1
+            return
+        _PARSE_METRICS[f"method:{result.get('method') or 'failed'}"] += 1
+        _PARSE_METRICS["pdf_pages"] += int(result.get("pages") or 0)
+        _PARSE_METRICS["ocr_pages"] += int(result.get("ocr_pages") or 0)
+
+
+def get_parse_metrics() -> Dict[str, int]:
+    """返回解析统计：files / cache / method:<策略> / pdf_pages / ocr_pages / duplicate_files"""
+    with _PARSE_METRICS_LOCK:
+        return dict(_PARSE_METRICS)
+
+
+def reset_parse_metrics() -> None:
+    with _PARSE_METRICS_LOCK:
+        _PARSE_METRICS.clear()
+
+
+def _parse_cache_lookup(path: Path) -> Tuple[Optional[str], Optional[Dict[str, str]]]:
+    """返回 (cache_key, 命中的解析结果)；缓存不可用时 cache_key 为 None"""
+    try:
+        key = parse_cache_key(Path(path).read_bytes(), PARSER_VERSION)
+        return key, get_parse_cache().get(key)
+    except Exception as e:
+        print(f"[WARNING] 解析缓存读取失败: {str(e)}", flush=True)
+        return None, None
+
+
+def _parse_cache_store(key: Optional[str], result: Dict[str, str], file: str) -> None:
+    # 失败或空结果不缓存，避免把一次超时固化下来
+    if not key or not result.get("text"):
+        return
+    try:
+        get_parse_cache().put(key, result, file=file)
+    except Exception as e:
+        print(f"[WARNING] 解析缓存写入失败: {str(e)}", flush=True)
+
+
+def parse_one_to_text(path: Path, use_cache: bool = True) -> Tuple[str, Dict[str, str]]:
+    """解析单个简历文件；相同内容的文件命中解析缓存时直接返回"""
+    key, result = _parse_cache_lookup(path) if use_cache and parse_cache_enabled() else (None, None)
+    if result is None:
+        result = _parse_file_with_method(path)
+        _record_parse_metrics(result)
+        _parse_cache_store(key, result, path.name)
+    else:
+        _record_parse_metrics(result, cached=True)
+    return result["text"], {"email": result["email"], "phone": result["phone"]}
+
+
+def _parse_file_with_method(path: Path, ocr_workers: Optional[int] = None) -> Dict[str, Any]:
+    """不经缓存的实际解析，返回正文、联系方式与命中的提取方法（PDF 另含页数与 OCR 页数）"""
     suffix = path.suffix.lower()
+    extra: Dict[str, Any] = {}
     if suffix == ".pdf":
-        return parse_pdf(path)
-    if suffix == ".docx":
-        return parse_docx(path)
-    if suffix == ".txt":
-        return parse_txt(path)
-    if suffix in {".jpg", ".jpeg", ".png"}:
-        return parse_image(path)
-    return "", {"email": "", "phone": ""}
+        extracted = _extract_pdf(path, ocr_workers=ocr_workers)
+        text, method = extracted["text"], extracted["method"]
+        contacts = extract_contacts(text)
+        extra = {"pages": extracted["pages"], "ocr_pages": extracted["ocr_pages"]}
+    elif suffix == ".docx":
+        text, contacts = parse_docx(path)
+        method = "docx"
+    elif suffix == ".txt":
+        text, contacts = parse_txt(path)
+        method = "txt"
+    elif suffix in {".jpg", ".jpeg", ".png"}:
+        text, contacts = parse_image(path)
+        method = "ocr"
+    else:
+        text, contacts, method = "", {"email": "", "phone": ""}, ""
+    return {
+        "text": text,
+        "email": contacts.get("email", ""),
+        "phone": contacts.get("phone", ""),
+        "method": method,
+        **extra,
+    }
 
 
 def save_uploaded_to_tmp(uploaded_file, out_dir: Path) -> Path:
-    out_dir.mkdir(parents=True, exist_ok=True)
+    """
+    按内容哈希分子目录保存上传文件：out_dir/<哈希前 16 位>/<原文件名>。
+    同一批次（或并发的其他会话）里同名不同内容的文件不会互相覆盖，文件名本身保持不变。
+    """
     filename = Path(uploaded_file.name).name
-    tmp_path = out_dir / filename
-    tmp_path.write_bytes(uploaded_file.getbuffer())
+    data = bytes(uploaded_file.getbuffer())
+    target_dir = out_dir / hashlib.sha1(data).hexdigest()[:16]
+    target_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = target_dir / filename
+    # 先写临时文件再替换，并发写入同一路径时读到的总是完整内容
+    partial = target_dir / f".{filename}.{os.getpid()}.{threading.get_ident()}.part"
+    partial.write_bytes(data)
+    os.replace(partial, tmp_path)
     return tmp_path
 
 
-def parse_uploaded_files_to_df(files: List, max_chars: int = 20000) -> pd.DataFrame:
-    rows = []
+def default_parse_workers() -> int:
+    """解析进程数：环境变量 RESUME_PARSE_WORKERS，默认 min(4, CPU 核数)"""
+    fallback = max(1, min(4, os.cpu_count() or 1))
+    try:
+        return max(1, int(os.getenv("RESUME_PARSE_WORKERS") or fallback))
+    except ValueError:
+        return fallback
+
+
+def default_parse_timeout() -> Optional[float]:
+    """单个文件的解析超时秒数：环境变量 RESUME_PARSE_TIMEOUT，默认 120，0 表示不限制"""
+    try:
+        value = float(os.getenv("RESUME_PARSE_TIMEOUT", "120"))
+    except ValueError:
+        value = 120.0
+    return value if value > 0 else None
+
+
+def _parse_saved_file(path_str: str, signatures: bool = False, ocr_workers: Optional[int] = None) -> Dict[str, str]:
+    """
+    解析阶段（在工作进程中运行）：只做文本与联系方式提取，不做姓名推断；signatures 为真时顺带计算近似去重签名。
+    ocr_workers 限制本进程内的 OCR 线程数（见 ocr_workers_per_process）。
+    """
+    result = _parse_file_with_method(Path(path_str), ocr_workers=ocr_workers)
+    if signatures:
+        result[SIGNATURE_COLUMN] = minhash_signature(result.get("text") or "")
+    return result
+
+
+def _parse_failed(path_str: str, error: BaseException) -> Dict[str, str]:
+    print(f"[WARN] 简历解析失败，已跳过正文: {Path(path_str).name} -> {error}")
+    return {"text": "", "email": "", "phone": "", "method": ""}
+
+
+def parse_files_parallel(
+    paths: List[Path],
+    max_chars: int = 20000,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    use_cache: bool = True,
+    signatures: bool = False,
+) -> List[Dict[str, str]]:
+    """
+    并行解析已保存的简历文件，结果顺序与 paths 一致。
+    命中解析缓存的文件不再进入进程池；新解析的结果由当前进程统一写回缓存。
+    单进程且不限时时直接在当前进程串行解析，避免启动进程池的开销。
+    每条结果含 text / email / phone / method，命中缓存时另有 name / file，cache_key 供姓名回写；
+    signatures 为真时另含 minhash（近似去重签名，不写入缓存）。
+    """
+    use_cache = use_cache and parse_cache_enabled()
+    results: List[Optional[Dict[str, str]]] = [None] * len(paths)
+    keys: List[Optional[str]] = [None] * len(paths)
+    misses: List[int] = []
+    for i, path in enumerate(paths):
+        if use_cache:
+            keys[i], results[i] = _parse_cache_lookup(path)
+        if results[i] is None:
+            misses.append(i)
+        else:
+            _record_parse_metrics(results[i], cached=True)
+
+    # 同一批次里字节完全相同的文件只解析一次，其余直接复用结果
+    first_by_key: Dict[str, int] = {}
+    copies: List[Tuple[int, int]] = []
+    unique: List[int] = []
+    for i in misses:
+        if keys[i] and keys[i] in first_by_key:
+            copies.append((i, first_by_key[keys[i]]))
+            continue
+        if keys[i]:
+            first_by_key[keys[i]] = i
+        unique.append(i)
+    misses = unique
+
+    tasks = [str(paths[i]) for i in misses]
+    workers = max_workers or default_parse_workers()
+    if timeout is None:
+        timeout = default_parse_timeout()
+    if workers <= 1 and not timeout:
+        parse_task = partial(_parse_saved_file, signatures=signatures)
+        parsed = []
+        for task in tasks:
+            try:
+                parsed.append(parse_task(task))
+            except Exception as e:
+                parsed.append(_parse_failed(task, e))
+    else:
+        # 进程池里每个进程只分到一部分核，OCR 线程数随之收紧（进程数不超过待解析文件数）
+        ocr_workers = ocr_workers_per_process(min(workers, max(1, len(tasks))))
+        parse_task = partial(_parse_saved_file, signatures=signatures, ocr_workers=ocr_workers)
+        parsed = run_bounded_processes(tasks, parse_task, _parse_failed, max_workers=workers, timeout=timeout)
+
+    for i, result in zip(misses, parsed):
+        results[i] = result
+        _record_parse_metrics(result)
+        _parse_cache_store(keys[i], result, Path(paths[i]).name)
+    for i, source in copies:
+        results[i] = results[source]
+    if copies:
+        with _PARSE_METRICS_LOCK:
+            _PARSE_METRICS["duplicate_files"] += len(copies)
+
+    out = []
+    for key, result in zip(keys, results):
+        item = dict(result or {})
+        text = item.get("text") or ""
+        if signatures and SIGNATURE_COLUMN not in item:
+            # 命中缓存的结果没有经过工作进程，在这里补算签名
+            item[SIGNATURE_COLUMN] = minhash_signature(text)
+        # 限制文本长度
+        item["text"] = text[:max_chars] if text else ""
+        item["cache_key"] = key or ""
+        out.append(item)
+    return out
+
+
+def parse_uploaded_files_to_df(
+    files: List,
+    max_chars: int = 20000,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    解析上传的简历文件：
+    1. 保存上传文件（当前进程，按内容分目录保存，同名文件互不覆盖；按上传顺序分配 candidate_id）
+    2. 进程池并行解析文本与联系方式（单文件超时不拖住整批）
+    3. 当前进程推断姓名（可能调用 LLM，不放进工作进程）
+    """
+    df, _ = _parse_uploaded_files(files, max_chars, max_workers, timeout, signatures=False)
+    return df
+
+
+def parse_uploaded_files_with_signatures(
+    files: List,
+    max_chars: int = 20000,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> Tuple[pd.DataFrame, Dict[int, Any]]:
+    """
+    同 parse_uploaded_files_to_df，另返回 {candidate_id: MinHash 签名}，供 mark_near_duplicates 使用。
+    签名在解析工作进程里随文本一起计算，不放进 DataFrame；近似去重关闭时不计算，返回空字典。
+    """
+    return _parse_uploaded_files(files, max_chars, max_workers, timeout, signatures=near_dup_enabled())
+
+
+def _parse_uploaded_files(
+    files: List,
+    max_chars: int,
+    max_workers: Optional[int],
+    timeout: Optional[float],
+    signatures: bool,
+) -> Tuple[pd.DataFrame, Dict[int, Any]]:
     out_dir = Path("data/uploads")
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    cid = 1
+    saved_paths: List[Path] = []
     for uploaded in files:
         suffix = Path(uploaded.name).suffix.lower()
         if suffix not in SUPPORTED_EXT:
             continue
-        tmp_path = save_uploaded_to_tmp(uploaded, out_dir)
-        
-        # 解析文件
-        text, contacts = parse_one_to_text(tmp_path)
-        
-        # 如果解析失败(文本为空或太短),尝试其他方法
-        if not text.strip() or len(text.strip()) < 50:
-            # 对于PDF文件,尝试更激进的解析方法
-            if suffix == ".pdf":
+        saved_paths.append(save_uploaded_to_tmp(uploaded, out_dir))
+
+    parsed = parse_files_parallel(
+        saved_paths, max_chars=max_chars, max_workers=max_workers, timeout=timeout, signatures=signatures
+    )
+
+    rows = []
+    signature_by_id: Dict[int, Any] = {}
+    for cid, (tmp_path, result) in enumerate(zip(saved_paths, parsed), start=1):
+        text = result.get("text", "")
+        # 姓名可能来自文件名兜底，只有文件名一致时才复用缓存里的姓名
+        if result.get("name") and result.get("file") == tmp_path.name:
+            candidate_name = result["name"]
+        else:
+            candidate_name = infer_candidate_name(text, tmp_path.name)
+            if result.get("cache_key") and text:
                 try:
-                    # 再次尝试使用PyMuPDF,使用不同的参数
-                    doc = fitz.open(str(tmp_path))
-                    raw_parts = []
-                    for page_num in range(len(doc)):
-                        page = doc[page_num]
-                        # 尝试多种文本提取方法
-                        page_text = page.get_text("text") or ""
-                        if not page_text.strip():
-                            # 尝试使用blocks方法
-                            blocks = page.get_text("blocks")
-                            if blocks:
-                                page_text = "\n".join([block[4] for block in blocks if len(block) > 4])
-                        raw_parts.append(page_text)
-                    doc.close()
-                    text = "\n".join(raw_parts)
-                    text = _clean_text(text)
-                except Exception:
-                    pass
-        
-        # 限制文本长度
-        text = text[:max_chars] if text else ""
-        candidate_name = infer_candidate_name(text, tmp_path.name)
-        
+                    get_parse_cache().set_name(result["cache_key"], candidate_name, file=tmp_path.name)
+                except Exception as e:
+                    print(f"[WARNING] 解析缓存写入失败: {str(e)}", flush=True)
         rows.append(
             {
                 "candidate_id": cid,
@@ -1366,15 +1476,16 @@ def parse_uploaded_files_to_df(files: List, max_chars: int = 20000) -> pd.DataFr
                 "name": candidate_name,
                 "resume_text": text,
                 "text_len": len(text),
-                "email": contacts.get("email", ""),
-                "phone": contacts.get("phone", ""),
+                "email": result.get("email", ""),
+                "phone": result.get("phone", ""),
             }
         )
-        cid += 1
+        if result.get(SIGNATURE_COLUMN) is not None:
+            signature_by_id[cid] = result[SIGNATURE_COLUMN]
 
     df = pd.DataFrame(rows)
     if df.empty:
-        return pd.DataFrame(columns=["candidate_id", "file", "name", "resume_text", "text_len", "email", "phone"])
+        return pd.DataFrame(columns=["candidate_id", "file", "name", "resume_text", "text_len", "email", "phone"]), {}
 
     source_columns = ["resume_text", "text", "full_text", "content", "parsed_text"]
 
@@ -1395,5 +1506,5 @@ def parse_uploaded_files_to_df(files: List, max_chars: int = 20000) -> pd.DataFr
     if drop_columns:
         df = df.drop(columns=drop_columns)
 
-    return df
+    return df, signature_by_id
 
@@ -6,11 +6,16 @@ AI 评分引擎 - 标准化推理框架
 from __future__ import annotations
 
 import re
-from typing import Dict, List, Tuple, Any, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Tuple, Any, Optional
 from dataclasses import dataclass, field
 
 from backend.services.robust_parser import RobustParser, ParsingResult
-from backend.services.ability_pool import AbilityPool, ActionMapping
+from backend.services.ability_pool import ABILITY_POOL, ACTION_MAPPING, AbilityPool
+from backend.utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 @dataclass
@@ -70,6 +75,141 @@ class ScoringResult:
     error_message: Optional[str] = None
 
 
+# 标准动词词典（有先后顺序：一句中出现多个动词时，取排在前面且短语有效的那个）
+VERB_DICT = ["管理", "分析", "优化", "提高", "制定", "协调", "带领", "复盘", 
+             "执行", "培训", "沟通", "计划", "跟进", "推动", "组织", "负责",
+             "完成", "开展", "实施", "维护", "服务", "回访", "督导", "辅导",
+             "指导", "策划", "设计", "开发", "总结", "改进", "提升", "达成",
+             "实现", "解决", "处理", "建立", "编写", "制作", "参与", "协助",
+             "支持", "配合", "提升", "改善", "优化", "完善", "加强", "深化"]
+
+# 动作短语必须包含的动作性词汇
+ACTION_INDICATORS = ["管理", "分析", "优化", "提高", "制定", "协调", "带领", "复盘",
+                     "执行", "培训", "沟通", "计划", "跟进", "推动", "组织", "负责"]
+
+_SENTENCE_SPLIT = re.compile(r'[。！？；\n]')
+_PHRASE_LEADING_PUNCT = re.compile(r'^[，。！？；：、\s]+')
+_PHRASE_TRAILING_PUNCT = re.compile(r'[，。！？；：、\s]+$')
+
+_VERB_ORDER = list(dict.fromkeys(VERB_DICT))
+_VERB_RANK = {verb: i for i, verb in enumerate(_VERB_ORDER)}
+# 同一位置优先匹配较长的动词，较短的前缀动词另行补记
+_VERB_PATTERN = re.compile("|".join(re.escape(v) for v in sorted(_VERB_ORDER, key=len, reverse=True)))
+_VERB_PREFIXES = {v: [u for u in _VERB_ORDER if u != v and v.startswith(u)] for v in _VERB_ORDER}
+_ACTION_INDICATOR_PATTERN = re.compile("|".join(re.escape(v) for v in ACTION_INDICATORS))
+
+
+def find_verbs(sentence: str) -> List[Tuple[str, int]]:
+    """
+    单次扫描找出句中出现的词典动词及其首次出现位置，按词典顺序返回。
+    等价于依次对 VERB_DICT 做 `verb in sentence` + `sentence.find(verb)`。
+    """
+    first: Dict[str, int] = {}
+    search = _VERB_PATTERN.search
+    m = search(sentence)
+    while m:
+        pos = m.start()
+        verb = m.group()
+        for v in (verb, *_VERB_PREFIXES[verb]):
+            if v not in first:
+                first[v] = pos
+        # 从下一个字符继续，重叠出现的动词也不会漏掉
+        m = search(sentence, pos + 1)
+    if len(first) < 2:
+        return list(first.items())
+    return sorted(first.items(), key=lambda item: _VERB_RANK[item[0]])
+
+
+def job_weight_matrix(job_title: str) -> Dict[str, float]:
+    """S4 权重模型：按岗位类型切换四个维度的权重"""
+    job_lower = job_title.lower()
+
+    if any(kw in job_lower for kw in ["班主任", "学管", "教务", "教育"]):
+        # 教育类岗位：更重视沟通和服务
+        return {
+            "skill_match": 0.30,
+            "experience_match": 0.30,
+            "stability": 0.25,
+            "growth_potential": 0.15,
+        }
+    elif any(kw in job_lower for kw in ["销售", "顾问", "bd"]):
+        # 销售类岗位：更重视经验和稳定性
+        return {
+            "skill_match": 0.25,
+            "experience_match": 0.35,
+            "stability": 0.25,
+            "growth_potential": 0.15,
+        }
+    else:
+        # 默认权重（均衡）
+        return {
+            "skill_match": 0.25,
+            "experience_match": 0.25,
+            "stability": 0.25,
+            "growth_potential": 0.25,
+        }
+
+
+def _dedup_lower(keywords: List[str]) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(kw.lower() for kw in keywords))
+
+
+@dataclass(frozen=True)
+class JDProfile:
+    """
+    只依赖 (岗位, JD) 的分析结果，批量评分时整批共享：
+    技能 / 场景 / 职责关键词（已按原有截断规则取前 N 个并去重）、权重矩阵、岗位核心能力
+    经 get_jd_profile 缓存后被多个引擎共用，字段全部不可变（权重矩阵为只读映射）
+    """
+    job_title: str
+    jd_text: str
+    skill_keywords: Tuple[str, ...]
+    scenario_keywords: Tuple[str, ...]
+    duty_keywords: Tuple[str, ...]
+    weight_matrix: Mapping[str, float]
+    core_abilities: FrozenSet[str]
+    # JD 中出现的“N年/岁”，用于稳定性估算（JD 中没有时再看简历句子）
+    jd_years: Optional[float] = None
+
+    @classmethod
+    def build(cls, job_title: str, jd_text: str = "", ability_pool: Optional[AbilityPool] = None) -> "JDProfile":
+        skill_keywords: List[str] = []
+        scenario_keywords: List[str] = []
+        duty_keywords: List[str] = []
+        if jd_text:
+            jd_sentences = re.split(r'[。！？；\n]', jd_text)
+            # 技能相关句子，提取2-4字的关键词
+            skill_sentences = [s for s in jd_sentences if any(kw in s for kw in ["技能", "能力", "掌握", "熟悉", "精通", "要求", "具备", "擅长"])]
+            for sent in skill_sentences[:15]:
+                skill_keywords.extend(re.findall(r'[\u4e00-\u9fa5]{2,4}', sent))
+            # 职责相关句子，提取2-5字的关键词
+            duty_sentences = [s for s in jd_sentences if any(kw in s for kw in ["负责", "工作", "职责", "任务", "内容", "场景", "业务"])]
+            for sent in duty_sentences[:20]:
+                duty_keywords.extend(re.findall(r'[\u4e00-\u9fa5]{2,5}', sent))
+            # 所有句子中的场景关键词
+            for sent in jd_sentences[:15]:
+                scenario_keywords.extend(re.findall(r'[\u4e00-\u9fa5]{2,4}', sent))
+        years_match = re.search(r'(\d+)[年岁]', jd_text)
+        pool = ability_pool or ABILITY_POOL
+        return cls(
+            job_title=job_title,
+            jd_text=jd_text,
+            # 评分时只检查前 30 / 40 / 30 个关键词且命中一个即停，先截断再去重结果不变
+            skill_keywords=_dedup_lower(skill_keywords[:30]),
+            scenario_keywords=_dedup_lower(scenario_keywords[:40]),
+            duty_keywords=_dedup_lower(duty_keywords[:30]),
+            weight_matrix=MappingProxyType(job_weight_matrix(job_title)),
+            core_abilities=frozenset(pool.get_core_abilities(job_title)),
+            jd_years=float(years_match.group(1)) if years_match else None,
+        )
+
+
+@lru_cache(maxsize=64)
+def get_jd_profile(job_title: str, jd_text: str = "") -> JDProfile:
+    """同一 (岗位, JD) 只分析一次"""
+    return JDProfile.build(job_title, jd_text)
+
+
 class ScoringGraph:
     """标准化评分推理框架"""
     
@@ -77,13 +217,22 @@ class ScoringGraph:
         self.job_title = job_title
         self.jd_text = jd_text
         self.parser = RobustParser()
-        self.ability_pool = AbilityPool()
-        self.action_mapping = ActionMapping()
+        self.ability_pool = ABILITY_POOL
+        self.action_mapping = ACTION_MAPPING
+        self._profile: Optional[JDProfile] = None
+
+    @property
+    def profile(self) -> JDProfile:
+        if self._profile is None:
+            self._profile = get_jd_profile(self.job_title, self.jd_text)
+        return self._profile
         
-    def execute(self, resume_text: str) -> ScoringResult:
+    def execute(self, resume_text: str, profile: Optional[JDProfile] = None) -> ScoringResult:
         """
         执行完整的评分推理流程（S1-S9）
+        profile: 预先构建的 JD 分析结果；不传时使用本实例岗位/JD 对应的共享 profile
         """
+        profile = profile or self.profile
         result = ScoringResult()
         
         try:
@@ -102,13 +251,10 @@ class ScoringGraph:
                 # 不返回，继续执行后续步骤
             
             # S2: 动作识别
-            import sys
-            print(f"[DEBUG] S2: 开始动作识别，cleaned_text长度={len(cleaned_text)}", flush=True)
-            sys.stdout.flush()
+            logger.debug("S2: 开始动作识别，cleaned_text长度=%d", len(cleaned_text))
             detected_actions = self._step2_detect_actions(cleaned_text)
             result.detected_actions = detected_actions
-            print(f"[DEBUG] S2: 动作识别完成，detected_actions数量={len(detected_actions)}", flush=True)
-            sys.stdout.flush()
+            logger.debug("S2: 动作识别完成，detected_actions数量=%d", len(detected_actions))
             
             # 如果动作过少，仍然继续处理，但标记为警告
             if len(detected_actions) < 2:
@@ -119,28 +265,21 @@ class ScoringGraph:
                 # 不再提前返回，让后续步骤生成默认的evidence_chain等字段
             
             # S3: 能力维度归类
-            import sys
-            print(f"[DEBUG] S3: 开始能力维度归类，detected_actions数量={len(detected_actions)}", flush=True)
-            sys.stdout.flush()
+            logger.debug("S3: 开始能力维度归类，detected_actions数量=%d", len(detected_actions))
             ability_mapping = self._step3_map_abilities(detected_actions)
-            print(f"[DEBUG] S3: 能力维度归类完成，ability_mapping数量={len(ability_mapping)}", flush=True)
-            sys.stdout.flush()
+            logger.debug("S3: 能力维度归类完成，ability_mapping数量=%d", len(ability_mapping))
             
             # S4: 权重模型（岗位可切换）
-            print(f"[DEBUG] S4: 开始权重模型计算", flush=True)
-            sys.stdout.flush()
-            weight_matrix = self._step4_weight_matrix()
-            print(f"[DEBUG] S4: 权重模型计算完成", flush=True)
-            sys.stdout.flush()
+            logger.debug("S4: 开始权重模型计算")
+            weight_matrix = profile.weight_matrix
+            logger.debug("S4: 权重模型计算完成")
             
             # S5: 分数计算
-            print(f"[DEBUG] S5: 开始分数计算", flush=True)
-            sys.stdout.flush()
+            logger.debug("S5: 开始分数计算")
             dimension_scores = self._step5_calculate_scores(
-                detected_actions, ability_mapping, weight_matrix
+                detected_actions, ability_mapping, weight_matrix, profile
             )
-            print(f"[DEBUG] S5: 分数计算完成: {dimension_scores}", flush=True)
-            sys.stdout.flush()
+            logger.debug("S5: 分数计算完成: %s", dimension_scores)
             result.skill_match_score = dimension_scores["skill_match"]
             result.experience_match_score = dimension_scores["experience_match"]
             result.stability_score = dimension_scores["stability"]
@@ -157,51 +296,40 @@ class ScoringGraph:
             result.final_score = round(total_score, 1)
             
             # S6: 风险识别
-            import sys
-            print(f"[DEBUG] S6: 开始风险识别", flush=True)
-            sys.stdout.flush()
+            logger.debug("S6: 开始风险识别")
             risks = self._step6_identify_risks(cleaned_text, detected_actions, dimension_scores)
             result.risks = risks
-            print(f"[DEBUG] S6: 风险识别完成，risks数量={len(risks)}", flush=True)
-            sys.stdout.flush()
+            logger.debug("S6: 风险识别完成，risks数量=%d", len(risks))
             
             # S7: 职业契合度判断
-            print(f"[DEBUG] S7: 开始职业契合度判断", flush=True)
-            sys.stdout.flush()
+            logger.debug("S7: 开始职业契合度判断")
             match_level = self._step7_match_level(result.final_score, risks)
             result.match_level = match_level
-            print(f"[DEBUG] S7: 职业契合度判断完成: {match_level}", flush=True)
-            sys.stdout.flush()
+            logger.debug("S7: 职业契合度判断完成: %s", match_level)
             
             # S8: 生成解释
-            print(f"[DEBUG] S8: 开始生成解释", flush=True)
-            sys.stdout.flush()
+            logger.debug("S8: 开始生成解释")
             explanations = self._step8_generate_explanations(
-                dimension_scores, detected_actions, ability_mapping, risks
+                dimension_scores, detected_actions, ability_mapping, risks, profile
             )
             result.score_explanation = explanations
-            print(f"[DEBUG] S8: 生成解释完成", flush=True)
-            sys.stdout.flush()
+            logger.debug("S8: 生成解释完成")
             
             # S9: 构建证据链
-            print(f"[DEBUG] S9: 开始构建证据链", flush=True)
-            sys.stdout.flush()
+            logger.debug("S9: 开始构建证据链")
             evidence_chain = self._step9_build_evidence_chain(
-                detected_actions, ability_mapping, dimension_scores
+                detected_actions, ability_mapping, dimension_scores, profile
             )
             result.evidence_chain = evidence_chain
-            print(f"[DEBUG] S9: 构建证据链完成，evidence_chain数量={len(evidence_chain)}", flush=True)
-            sys.stdout.flush()
+            logger.debug("S9: 构建证据链完成，evidence_chain数量=%d", len(evidence_chain))
             
         except Exception as e:
-            import traceback
-            print(f"[ERROR] ScoringGraph.execute() 发生异常: {str(e)}")
-            print(f"[ERROR] 异常堆栈: {traceback.format_exc()}")
+            logger.exception("ScoringGraph.execute() 发生异常: %s", e)
             result.error_code = "SCORING_ERROR"
             result.error_message = f"评分过程发生错误: {str(e)}"
             # 即使有异常，也尝试生成基本的evidence_chain
             if len(result.evidence_chain) == 0:
-                print(f"[DEBUG] 异常后生成默认evidence_chain")
+                logger.debug("异常后生成默认evidence_chain")
                 result.evidence_chain = [
                     EvidenceItem(
                         dimension="技能匹配度",
@@ -212,9 +340,7 @@ class ScoringGraph:
                     )
                 ]
         
-        import sys
-        print(f"[DEBUG] ScoringGraph.execute() 最终返回: evidence_chain数量={len(result.evidence_chain)}, final_score={result.final_score}", flush=True)
-        sys.stdout.flush()
+        logger.debug("ScoringGraph.execute() 最终返回: evidence_chain数量=%d, final_score=%s", len(result.evidence_chain), result.final_score)
         return result
     
     def _step1_clean_text(self, resume_text: str) -> Tuple[str, ParsingResult]:
@@ -238,16 +364,9 @@ class ScoringGraph:
         - 不得使用纯名词
         - 需匹配动词词典
         """
-        # 标准动词词典
-        VERB_DICT = ["管理", "分析", "优化", "提高", "制定", "协调", "带领", "复盘", 
-                     "执行", "培训", "沟通", "计划", "跟进", "推动", "组织", "负责",
-                     "完成", "开展", "实施", "维护", "服务", "回访", "督导", "辅导",
-                     "指导", "策划", "设计", "开发", "总结", "改进", "提升", "达成",
-                     "实现", "解决", "处理", "建立", "编写", "制作", "参与", "协助",
-                     "支持", "配合", "提升", "改善", "优化", "完善", "加强", "深化"]
-        
         actions = []
-        sentences = re.split(r'[。！？；\n]', text)
+        seen_actions = set()
+        sentences = _SENTENCE_SPLIT.split(text)
         
         for sentence in sentences:
             sentence = sentence.strip()
@@ -255,50 +374,44 @@ class ScoringGraph:
             if len(sentence) < 8:
                 continue
             
-            # 查找包含动词的完整短语（最少6字）
-            for verb in VERB_DICT:
-                if verb in sentence:
-                    # 提取动词及其后的内容，形成完整短语
-                    verb_pos = sentence.find(verb)
-                    if verb_pos >= 0:
-                        # 提取动词短语：动词 + 后续内容（至少到逗号、句号或6字）
-                        phrase_start = max(0, verb_pos - 2)  # 可能包含"负责"等前置词
-                        phrase_end = min(len(sentence), verb_pos + len(verb) + 20)  # 动词后20字
-                        phrase = sentence[phrase_start:phrase_end]
-                        
-                        # 清理短语：去除前后标点和空格
-                        phrase = re.sub(r'^[，。！？；：、\s]+', '', phrase)
-                        phrase = re.sub(r'[，。！？；：、\s]+$', '', phrase)
+            # 查找包含动词的完整短语（最少6字）：按词典优先级尝试句中出现过的动词
+            for verb, verb_pos in find_verbs(sentence):
+                # 提取动词短语：动词 + 后续内容（至少到逗号、句号或6字）
+                phrase_start = max(0, verb_pos - 2)  # 可能包含"负责"等前置词
+                phrase_end = min(len(sentence), verb_pos + len(verb) + 20)  # 动词后20字
+                phrase = sentence[phrase_start:phrase_end]
+                
+                # 清理短语：去除前后标点和空格
+                phrase = _PHRASE_LEADING_PUNCT.sub('', phrase)
+                phrase = _PHRASE_TRAILING_PUNCT.sub('', phrase)
+                
+                # 强规则过滤
+                if self._is_valid_action_phrase(phrase, verb):
+                    # 去重：同一动作只保留1条（使用动作和句子前50字作为key），重复的不再映射能力
+                    action_key = (phrase[:50], sentence[:50])
+                    if action_key not in seen_actions:
+                        seen_actions.add(action_key)
+                        # 映射能力标签
+                        ability_tags = self.action_mapping.map_action_to_abilities(verb, sentence)
+                        # 确保2-3个能力标签
+                        if len(ability_tags) < 2:
+                            # 补充能力标签
+                            ability_tags.extend(self.ability_pool.match_abilities(sentence)[:3-len(ability_tags)])
+                        ability_tags = ability_tags[:3]  # 最多3个
                         
-                        # 强规则过滤
-                        if self._is_valid_action_phrase(phrase, verb):
-                            # 映射能力标签
-                            ability_tags = self.action_mapping.map_action_to_abilities(verb, sentence)
-                            # 确保2-3个能力标签
-                            if len(ability_tags) < 2:
-                                # 补充能力标签
-                                ability_tags.extend(self.ability_pool.match_abilities(sentence)[:3-len(ability_tags)])
-                            ability_tags = ability_tags[:3]  # 最多3个
-                            
-                            actions.append(DetectedAction(
-                                action=phrase[:50],  # 限制长度
-                                sentence=sentence,
-                                resume_quote=sentence[:100],
-                                ability_tags=ability_tags,
-                                confidence=1.0
-                            ))
-                            break  # 每个句子只提取一个主要动作
-        
-        # 去重：同一动作只保留1条
-        unique_actions = []
-        seen_actions = set()
-        for action in actions:
-            action_key = (action.action, action.sentence[:50])  # 使用动作和句子前50字作为key
-            if action_key not in seen_actions:
-                unique_actions.append(action)
-                seen_actions.add(action_key)
+                        actions.append(DetectedAction(
+                            action=phrase[:50],  # 限制长度
+                            sentence=sentence,
+                            resume_quote=sentence[:100],
+                            ability_tags=ability_tags,
+                            confidence=1.0
+                        ))
+                    break  # 每个句子只提取一个主要动作
+            
+            if len(actions) >= 20:  # 最多20个动作，后面的句子不再扫描
+                break
         
-        return unique_actions[:20]  # 最多20个动作
+        return actions
     
     def _is_valid_action_phrase(self, phrase: str, verb: str) -> bool:
         """
@@ -322,10 +435,7 @@ class ScoringGraph:
         
         # 过滤纯名词（不包含动词的短语）
         # 检查是否包含动作性词汇
-        action_indicators = ["管理", "分析", "优化", "提高", "制定", "协调", "带领", "复盘",
-                           "执行", "培训", "沟通", "计划", "跟进", "推动", "组织", "负责"]
-        has_action = any(indicator in phrase for indicator in action_indicators)
-        if not has_action:
+        if not _ACTION_INDICATOR_PATTERN.search(phrase):
             return False
         
         # 过滤噪声：不得是纯标点或数字
@@ -351,39 +461,14 @@ class ScoringGraph:
     
     def _step4_weight_matrix(self) -> Dict[str, float]:
         """S4: 权重模型（岗位可切换）"""
-        # 根据岗位类型调整权重
-        job_lower = self.job_title.lower()
-        
-        if any(kw in job_lower for kw in ["班主任", "学管", "教务", "教育"]):
-            # 教育类岗位：更重视沟通和服务
-            return {
-                "skill_match": 0.30,
-                "experience_match": 0.30,
-                "stability": 0.25,
-                "growth_potential": 0.15,
-            }
-        elif any(kw in job_lower for kw in ["销售", "顾问", "bd"]):
-            # 销售类岗位：更重视经验和稳定性
-            return {
-                "skill_match": 0.25,
-                "experience_match": 0.35,
-                "stability": 0.25,
-                "growth_potential": 0.15,
-            }
-        else:
-            # 默认权重（均衡）
-            return {
-                "skill_match": 0.25,
-                "experience_match": 0.25,
-                "stability": 0.25,
-                "growth_potential": 0.25,
-            }
+        return job_weight_matrix(self.job_title)
     
     def _step5_calculate_scores(
         self,
         actions: List[DetectedAction],
         ability_mapping: Dict[str, List[DetectedAction]],
-        weight_matrix: Dict[str, float]
+        weight_matrix: Mapping[str, float],
+        profile: Optional[JDProfile] = None,
     ) -> Dict[str, float]:
         """
         Ultra S4: 打分规则升级
@@ -393,19 +478,12 @@ class ScoringGraph:
         - 稳定性 = 岗位跨度 + 在职时长 + 跳槽频率
         """
         scores = {}
-        core_abilities = self.ability_pool.get_core_abilities(self.job_title)
+        profile = profile or self.profile
+        core_abilities = profile.core_abilities
         
         # 技能匹配度（0-100，百分制）：基于JD要求的技能与简历动作的匹配度
-        # 首先从JD中提取关键技能要求
-        jd_skill_keywords = []
-        if self.jd_text:
-            # 提取JD中的技能相关句子
-            jd_sentences = re.split(r'[。！？；\n]', self.jd_text)
-            skill_sentences = [s for s in jd_sentences if any(kw in s for kw in ["技能", "能力", "掌握", "熟悉", "精通", "要求", "具备", "擅长"])]
-            for sent in skill_sentences[:15]:  # 技能相关句子
-                # 提取2-4字的关键词
-                keywords = re.findall(r'[\u4e00-\u9fa5]{2,4}', sent)
-                jd_skill_keywords.extend(keywords)
+        # JD 技能关键词在 JDProfile 中预先提取
+        jd_skill_keywords = profile.skill_keywords
         
         # 计算简历动作与JD技能要求的匹配度
         skill_match_count = 0
@@ -414,8 +492,8 @@ class ScoringGraph:
         for action in actions:
             action_text = action.sentence.lower()
             # 检查动作是否匹配JD技能要求
-            for jd_skill in jd_skill_keywords[:30]:  # 前30个JD技能关键词
-                if jd_skill.lower() in action_text:
+            for jd_skill in jd_skill_keywords:  # 前30个JD技能关键词
+                if jd_skill in action_text:
                     skill_match_count += 1
                     skill_match_score_detail += 1.0
                     break
@@ -438,21 +516,9 @@ class ScoringGraph:
         scores["skill_match"] = round(skill_score, 1)
         
         # 经验相关性（0-100，百分制）：与岗位JD关键场景和工作内容匹配程度
-        # 从JD中提取关键工作场景和职责描述
-        jd_scenario_keywords = []
-        jd_duty_keywords = []
-        if self.jd_text:
-            jd_sentences = re.split(r'[。！？；\n]', self.jd_text)
-            # 提取职责相关句子
-            duty_sentences = [s for s in jd_sentences if any(kw in s for kw in ["负责", "工作", "职责", "任务", "内容", "场景", "业务"])]
-            for sent in duty_sentences[:20]:  # 职责相关句子
-                # 提取2-5字的关键词
-                keywords = re.findall(r'[\u4e00-\u9fa5]{2,5}', sent)
-                jd_duty_keywords.extend(keywords)
-            # 提取所有句子中的关键词
-            for sent in jd_sentences[:15]:
-                keywords = re.findall(r'[\u4e00-\u9fa5]{2,4}', sent)
-                jd_scenario_keywords.extend(keywords)
+        # JD 关键工作场景和职责关键词在 JDProfile 中预先提取
+        jd_scenario_keywords = profile.scenario_keywords
+        jd_duty_keywords = profile.duty_keywords
         
         # 计算简历动作与JD场景/职责的匹配度
         scenario_match_count = 0
@@ -461,13 +527,13 @@ class ScoringGraph:
         for action in actions:
             action_text = action.sentence.lower()
             # 检查是否匹配JD场景关键词
-            for keyword in jd_scenario_keywords[:40]:
-                if keyword.lower() in action_text:
+            for keyword in jd_scenario_keywords:
+                if keyword in action_text:
                     scenario_match_count += 1
                     break
             # 检查是否匹配JD职责关键词
-            for keyword in jd_duty_keywords[:30]:
-                if keyword.lower() in action_text:
+            for keyword in jd_duty_keywords:
+                if keyword in action_text:
                     duty_match_count += 1
                     break
         
@@ -484,8 +550,11 @@ class ScoringGraph:
         
         # 稳定性（0-100，百分制）：岗位跨度 + 在职时长 + 跳槽频率
         # 从简历文本中提取工作年限
-        years_match = re.search(r'(\d+)[年岁]', self.jd_text + " " + str(actions[0].sentence if actions else ""))
-        years = float(years_match.group(1)) if years_match else 3.0
+        if profile.jd_years is not None:
+            years = profile.jd_years
+        else:
+            years_match = re.search(r'(\d+)[年岁]', str(actions[0].sentence if actions else ""))
+            years = float(years_match.group(1)) if years_match else 3.0
         
         # 计算跳槽频率（简单估算：工作年限/公司数量）
         company_count = len(re.findall(r'(公司|企业|机构|单位)', str(actions[0].sentence if actions else "")))
@@ -585,14 +654,16 @@ class ScoringGraph:
         scores: Dict[str, float],
         actions: List[DetectedAction],
         ability_mapping: Dict[str, List[DetectedAction]],
-        risks: List[RiskItem]
+        risks: List[RiskItem],
+        profile: Optional[JDProfile] = None,
     ) -> Dict[str, str]:
         """S8: 生成解释"""
         explanations = {}
+        core_abilities = (profile or self.profile).core_abilities
         
         # 技能匹配度解释
         skill_actions_count = sum(len(actions) for ability, actions in ability_mapping.items() 
-                                 if ability in self.ability_pool.get_core_abilities(self.job_title))
+                                 if ability in core_abilities)
         explanations["skill_match"] = (
             f"检测到{skill_actions_count}个与岗位核心技能相关的动作，"
             f"覆盖{len(ability_mapping)}个能力维度，技能匹配度{scores['skill_match']}分"
@@ -622,10 +693,12 @@ class ScoringGraph:
         self,
         actions: List[DetectedAction],
         ability_mapping: Dict[str, List[DetectedAction]],
-        scores: Dict[str, float]
+        scores: Dict[str, float],
+        profile: Optional[JDProfile] = None,
     ) -> List[EvidenceItem]:
         """S9: 构建证据链"""
         evidence_chain = []
+        core_abilities = (profile or self.profile).core_abilities
         
         # 按维度构建证据
         dimensions = {
@@ -640,7 +713,7 @@ class ScoringGraph:
             if dim_key == "skill_match":
                 relevant_actions = []
                 for ability, mapped_actions in ability_mapping.items():
-                    if ability in self.ability_pool.get_core_abilities(self.job_title):
+                    if ability in core_abilities:
                         relevant_actions.extend(mapped_actions)
             elif dim_key == "experience_match":
                 relevant_actions = actions[:5]  # 前5个动作
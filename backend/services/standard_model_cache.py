@@ -0,0 +1,124 @@
+"""
+岗位标准能力模型缓存
+标准能力模型只依赖 (job_title, JD)，同一批次/同一岗位的多份简历共享一次计算结果。
+内存 LRU + 磁盘 JSON 两级缓存，均按条目数淘汰最旧记录。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_CACHE_PATH = Path("backend/storage/cache/standard_model.json")
+
+
+def jd_cache_key(job_title: str, jd_text: str) -> str:
+    """岗位 + JD 的内容哈希（忽略首尾空白）"""
+    raw = f"{(job_title or '').strip()}\n{(jd_text or '').strip()}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class StandardModelCache:
+    """标准能力模型两级缓存（线程安全）"""
+
+    def __init__(
+        self,
+        path: Optional[Path] = DEFAULT_CACHE_PATH,
+        max_memory_entries: int = 128,
+        max_disk_entries: int = 1000,
+    ):
+        self.path = Path(path) if path else None
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+        self._disk: Optional[Dict[str, Dict]] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, job_title: str, jd_text: str) -> Optional[Dict[str, float]]:
+        key = jd_cache_key(job_title, jd_text)
+        with self._lock:
+            model = self._memory.get(key)
+            if model is None:
+                entry = self._load_disk().get(key)
+                if entry:
+                    model = entry.get("model")
+                    if model:
+                        self._remember(key, model)
+            else:
+                self._memory.move_to_end(key)
+            if model is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(model)
+
+    def put(self, job_title: str, jd_text: str, model: Dict[str, float]) -> None:
+        key = jd_cache_key(job_title, jd_text)
+        with self._lock:
+            self._remember(key, dict(model))
+            if self.path is None:
+                return
+            disk = self._load_disk()
+            disk[key] = {"job_title": job_title, "ts": time.time(), "model": dict(model)}
+            if len(disk) > self.max_disk_entries:
+                oldest = sorted(disk.items(), key=lambda kv: kv[1].get("ts", 0))
+                for stale_key, _ in oldest[: len(disk) - self.max_disk_entries]:
+                    disk.pop(stale_key, None)
+            self._save_disk(disk)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._disk = {}
+            if self.path is not None and self.path.exists():
+                self.path.unlink()
+
+    def _remember(self, key: str, model: Dict[str, float]) -> None:
+        self._memory[key] = model
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _load_disk(self) -> Dict[str, Dict]:
+        if self._disk is None:
+            self._disk = {}
+            if self.path is not None and self.path.exists():
+                try:
+                    data = json.loads(self.path.read_text(encoding="utf-8"))
+                    if isinstance(data, dict):
+                        self._disk = data
+                except Exception:
+                    # 缓存文件损坏时直接丢弃，下次写入会重建
+                    self._disk = {}
+        return self._disk
+
+    def _save_disk(self, disk: Dict[str, Dict]) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(disk, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print(f"[WARNING] 写入标准能力模型缓存失败: {str(e)}", flush=True)
+
+
+_default_cache: Optional[StandardModelCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_standard_model_cache() -> StandardModelCache:
+    """进程级共享缓存实例"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = StandardModelCache()
+    return _default_cache
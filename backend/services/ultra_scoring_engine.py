@@ -2,11 +2,15 @@
 Ultra 版评分引擎 - 整合所有模块
 """
 
-from typing import Dict, Any, List
-from backend.services.scoring_graph import ScoringGraph, ScoringResult
+from typing import Dict, Any, List, Optional
+from backend.services.scoring_graph import ScoringGraph, ScoringResult, get_jd_profile
 from backend.services.field_generators import FieldGenerators
 from backend.services.robust_parser import RobustParser
 from backend.services.ultra_format_validator import UltraFormatValidator
+from backend.services.standard_model_cache import get_standard_model_cache
+from backend.utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 class UltraScoringEngine:
@@ -16,15 +20,26 @@ class UltraScoringEngine:
         self.job_title = job_title
         self.jd_text = jd_text
         self.scoring_graph = ScoringGraph(job_title, jd_text)
+        # JD 分析（关键词、权重矩阵、核心能力）整批简历只做一次
+        self.jd_profile = get_jd_profile(job_title, jd_text)
         self.field_generators = FieldGenerators(job_title, jd_text)
         self.parser = RobustParser()
+        self._standard_model: Optional[Dict[str, float]] = None
+    
+    def get_standard_model(self) -> Dict[str, float]:
+        """
+        获取岗位标准能力模型
+        同一引擎实例只计算一次；批量评分时复用同一个引擎即可避免每份简历重复调用LLM
+        """
+        if self._standard_model is None:
+            self._standard_model = self._generate_standard_model()
+        return dict(self._standard_model)
     
     def _generate_standard_model(self) -> Dict[str, float]:
         """
         使用AI从岗位JD智能生成标准能力模型（百分制）
         返回4个维度的标准分，用于雷达图对比
         """
-        import sys
         import json
         import textwrap
         import re
@@ -56,12 +71,17 @@ class UltraScoringEngine:
                     "growth_potential": 75.0,
                 }
         
+        # 同一岗位+JD 已生成过的AI标准模型直接复用
+        cached_model = get_standard_model_cache().get(self.job_title, self.jd_text)
+        if cached_model:
+            logger.debug("命中岗位标准能力模型缓存: %s", cached_model)
+            return cached_model
+        
         # 使用AI智能生成标准模型
         try:
             client, cfg = self.field_generators._get_llm_client()
             if client and cfg and cfg.api_key:
-                print(f"[DEBUG] 使用AI生成岗位标准能力模型...", flush=True)
-                sys.stdout.flush()
+                logger.debug("使用AI生成岗位标准能力模型...")
                 
                 prompt = textwrap.dedent(f"""
                 你是一名专业的招聘能力模型专家。请基于以下岗位JD，智能分析并生成该岗位的标准能力模型评分（百分制）。
@@ -154,16 +174,15 @@ class UltraScoringEngine:
                     for key in result:
                         result[key] = max(0.0, min(100.0, result[key]))
                     
-                    print(f"[DEBUG] AI生成的标准模型: {result}", flush=True)
-                    sys.stdout.flush()
+                    logger.debug("AI生成的标准模型: %s", result)
+                    # 只缓存AI结果；规则回退结果不落盘，下次仍会尝试AI生成
+                    get_standard_model_cache().put(self.job_title, self.jd_text, result)
                     return result
                     
                 except Exception as e:
-                    print(f"[WARNING] AI生成标准模型失败: {str(e)}，回退到规则生成", flush=True)
-                    sys.stdout.flush()
+                    logger.warning("AI生成标准模型失败: %s，回退到规则生成", e)
         except Exception as e:
-            print(f"[WARNING] 无法使用AI生成标准模型: {str(e)}，回退到规则生成", flush=True)
-            sys.stdout.flush()
+            logger.warning("无法使用AI生成标准模型: %s，回退到规则生成", e)
         
         # 回退到规则生成（改进版）
         jd_lower = self.jd_text.lower()
@@ -203,19 +222,16 @@ class UltraScoringEngine:
         
         返回完整的评分结果字典
         """
-        import sys
-        print(f"[DEBUG] Ultra引擎.score() 开始: resume_length={len(resume_text)}", flush=True)
-        sys.stdout.flush()
+        logger.debug("Ultra引擎.score() 开始: resume_length=%d", len(resume_text))
         
         # 执行评分推理（S1-S9）
-        scoring_result = self.scoring_graph.execute(resume_text)
+        scoring_result = self.scoring_graph.execute(resume_text, self.jd_profile)
         
-        print(f"[DEBUG] ScoringGraph.execute() 完成:", flush=True)
-        print(f"  - error_code: {scoring_result.error_code}", flush=True)
-        print(f"  - detected_actions数量: {len(scoring_result.detected_actions)}", flush=True)
-        print(f"  - evidence_chain数量: {len(scoring_result.evidence_chain)}", flush=True)
-        print(f"  - final_score: {scoring_result.final_score}", flush=True)
-        sys.stdout.flush()
+        logger.debug(
+            "ScoringGraph.execute() 完成: error_code=%s, detected_actions数量=%d, evidence_chain数量=%d, final_score=%s",
+            scoring_result.error_code, len(scoring_result.detected_actions),
+            len(scoring_result.evidence_chain), scoring_result.final_score,
+        )
         
         # 即使有错误，也尝试生成基本字段（避免回退到旧版本）
         has_error = bool(scoring_result.error_code)
@@ -229,7 +245,7 @@ class UltraScoringEngine:
                 scoring_result.risks
             )
         except Exception as e:
-            print(f"[WARNING] 生成ai_review失败: {str(e)}")
+            logger.warning("生成ai_review失败: %s", e)
             ai_review = "【证据】\n简历信息不足，无法进行详细评估。\n\n【推理】\n建议进一步了解候选人的具体工作内容和成果。\n\n【结论】\n信息不足，建议进一步了解候选人情况。"
         
         try:
@@ -246,7 +262,7 @@ class UltraScoringEngine:
                         if len(highlight_tags) >= 5:
                             break
         except Exception as e:
-            print(f"[WARNING] 生成highlight_tags失败: {str(e)}")
+            logger.warning("生成highlight_tags失败: %s", e)
             highlight_tags = ["执行力", "服务意识", "沟通表达", "学习指导", "组织协调"]
         
         try:
@@ -257,7 +273,7 @@ class UltraScoringEngine:
                 scoring_result.evidence_chain
             )
         except Exception as e:
-            print(f"[WARNING] 生成weak_points失败: {str(e)}")
+            logger.warning("生成weak_points失败: %s", e)
             weak_points = ["简历信息不足，建议进一步了解候选人情况"]
         
         try:
@@ -268,7 +284,7 @@ class UltraScoringEngine:
                 scoring_result.evidence_chain
             )
         except Exception as e:
-            print(f"[WARNING] 生成ai_resume_summary失败: {str(e)}")
+            logger.warning("生成ai_resume_summary失败: %s", e)
             ai_resume_summary = "简历信息不足，无法生成详细摘要"
         
         try:
@@ -280,7 +296,7 @@ class UltraScoringEngine:
                 scoring_result.evidence_chain
             )
         except Exception as e:
-            print(f"[WARNING] 生成summary_short失败: {str(e)}")
+            logger.warning("生成summary_short失败: %s", e)
             summary_short = ai_resume_summary
         
         try:
@@ -289,15 +305,13 @@ class UltraScoringEngine:
                 scoring_result.evidence_chain
             )
         except Exception as e:
-            print(f"[WARNING] 生成evidence_text失败: {str(e)}")
+            logger.warning("生成evidence_text失败: %s", e)
             evidence_text = "暂无有效证据"
         
         # 构建证据链字典（Ultra-Format）
-        import sys
         evidence_chains = {}
         dimension_order = ["技能匹配度", "经验相关性", "成长潜力", "稳定性"]
-        print(f"[DEBUG] 构建evidence_chains: evidence_chain长度={len(scoring_result.evidence_chain)}", flush=True)
-        sys.stdout.flush()
+        logger.debug("构建evidence_chains: evidence_chain长度=%d", len(scoring_result.evidence_chain))
         for dim in dimension_order:
             dim_evidences = [
                 {
@@ -310,34 +324,27 @@ class UltraScoringEngine:
             ][:3]  # 每个维度最多3条
             if dim_evidences:
                 evidence_chains[dim] = dim_evidences
-                print(f"[DEBUG]   - {dim}: {len(dim_evidences)}条证据", flush=True)
-                sys.stdout.flush()
+                logger.debug("- %s: %d条证据", dim, len(dim_evidences))
         
-        print(f"[DEBUG] evidence_chains最终结果: {len(evidence_chains)}个维度有数据", flush=True)
-        sys.stdout.flush()
+        logger.debug("evidence_chains最终结果: %d个维度有数据", len(evidence_chains))
         
         # 生成优势推理链（Ultra-Format）
-        print(f"[DEBUG] 开始生成优势推理链...", flush=True)
-        sys.stdout.flush()
+        logger.debug("开始生成优势推理链...")
         strengths_reasoning_chain = self._generate_strengths_reasoning_chain(
             scoring_result, evidence_chains
         )
-        print(f"[DEBUG] 优势推理链生成完成: conclusion={strengths_reasoning_chain.get('conclusion')}, ai_reasoning长度={len(strengths_reasoning_chain.get('ai_reasoning', ''))}", flush=True)
-        sys.stdout.flush()
+        logger.debug("优势推理链生成完成: conclusion=%s, ai_reasoning长度=%d", strengths_reasoning_chain.get('conclusion'), len(strengths_reasoning_chain.get('ai_reasoning', '')))
         
         # 生成劣势推理链（Ultra-Format）
-        print(f"[DEBUG] 开始生成劣势推理链...", flush=True)
-        sys.stdout.flush()
+        logger.debug("开始生成劣势推理链...")
         weaknesses_reasoning_chain = self._generate_weaknesses_reasoning_chain(
             scoring_result, evidence_chains
         )
-        print(f"[DEBUG] 劣势推理链生成完成: conclusion={weaknesses_reasoning_chain.get('conclusion')}, ai_reasoning长度={len(weaknesses_reasoning_chain.get('ai_reasoning', ''))}", flush=True)
-        sys.stdout.flush()
+        logger.debug("劣势推理链生成完成: conclusion=%s, ai_reasoning长度=%d", weaknesses_reasoning_chain.get('conclusion'), len(weaknesses_reasoning_chain.get('ai_reasoning', '')))
         
         # 生成岗位标准能力模型（用于雷达图对比）
-        standard_model = self._generate_standard_model()
-        print(f"[DEBUG] 岗位标准能力模型: {standard_model}", flush=True)
-        sys.stdout.flush()
+        standard_model = self.get_standard_model()
+        logger.debug("岗位标准能力模型: %s", standard_model)
         
         # 构建最终输出（Ultra-Format规范，符合要求的JSON结构）
         result = {
@@ -516,13 +523,11 @@ class UltraScoringEngine:
         strengths_conclusion_before = strengths_before.get('conclusion', '') if isinstance(strengths_before, dict) else ''
         weaknesses_conclusion_before = weaknesses_before.get('conclusion', '') if isinstance(weaknesses_before, dict) else ''
         
-        print(f"[DEBUG] 验证前推理链状态: strengths_conclusion={strengths_conclusion_before[:30] if strengths_conclusion_before else 'None'}, weaknesses_conclusion={weaknesses_conclusion_before[:30] if weaknesses_conclusion_before else 'None'}", flush=True)
-        sys.stdout.flush()
+        logger.debug("验证前推理链状态: strengths_conclusion=%s, weaknesses_conclusion=%s", strengths_conclusion_before[:30] if strengths_conclusion_before else 'None', weaknesses_conclusion_before[:30] if weaknesses_conclusion_before else 'None')
         
         is_valid, errors = UltraFormatValidator.validate(result)
         if not is_valid:
-            print(f"[WARNING] Ultra-Format 验证失败: {errors}", flush=True)
-            sys.stdout.flush()
+            logger.warning("Ultra-Format 验证失败: %s", errors)
             # 保存已有的推理链内容（深拷贝）
             import copy
             saved_strengths = copy.deepcopy(result.get("strengths_reasoning_chain", {}))
@@ -530,9 +535,9 @@ class UltraScoringEngine:
             
             # 记录保存的内容
             if saved_strengths and isinstance(saved_strengths, dict):
-                print(f"[DEBUG] 保存优势推理链: conclusion={saved_strengths.get('conclusion', '')[:30]}, ai_reasoning长度={len(saved_strengths.get('ai_reasoning', ''))}", flush=True)
+                logger.debug("保存优势推理链: conclusion=%s, ai_reasoning长度=%d", saved_strengths.get('conclusion', '')[:30], len(saved_strengths.get('ai_reasoning', '')))
             if saved_weaknesses and isinstance(saved_weaknesses, dict):
-                print(f"[DEBUG] 保存劣势推理链: conclusion={saved_weaknesses.get('conclusion', '')[:30]}, ai_reasoning长度={len(saved_weaknesses.get('ai_reasoning', ''))}", flush=True)
+                logger.debug("保存劣势推理链: conclusion=%s, ai_reasoning长度=%d", saved_weaknesses.get('conclusion', '')[:30], len(saved_weaknesses.get('ai_reasoning', '')))
             
             result = UltraFormatValidator.fix(result)
             
@@ -548,8 +553,7 @@ class UltraScoringEngine:
                 # 如果保存的内容有有效内容，强制恢复
                 if saved_conclusion or (saved_reasoning and len(saved_reasoning) > 10):
                     result["strengths_reasoning_chain"] = saved_strengths
-                    print(f"[DEBUG] 强制恢复优势推理链: conclusion={saved_conclusion[:30] if saved_conclusion else 'None'}, ai_reasoning长度={len(saved_reasoning)}", flush=True)
-                    sys.stdout.flush()
+                    logger.debug("强制恢复优势推理链: conclusion=%s, ai_reasoning长度=%d", saved_conclusion[:30] if saved_conclusion else 'None', len(saved_reasoning))
             
             if saved_weaknesses and isinstance(saved_weaknesses, dict):
                 saved_conclusion = saved_weaknesses.get("conclusion", "")
@@ -558,25 +562,21 @@ class UltraScoringEngine:
                 # 如果保存的内容有有效内容，强制恢复
                 if saved_conclusion or (saved_reasoning and len(saved_reasoning) > 10):
                     result["weaknesses_reasoning_chain"] = saved_weaknesses
-                    print(f"[DEBUG] 强制恢复劣势推理链: conclusion={saved_conclusion[:30] if saved_conclusion else 'None'}, ai_reasoning长度={len(saved_reasoning)}", flush=True)
-                    sys.stdout.flush()
+                    logger.debug("强制恢复劣势推理链: conclusion=%s, ai_reasoning长度=%d", saved_conclusion[:30] if saved_conclusion else 'None', len(saved_reasoning))
             
             # 重新验证
             is_valid, errors = UltraFormatValidator.validate(result)
             if not is_valid:
-                print(f"[ERROR] Ultra-Format 修复后仍失败: {errors}", flush=True)
-                sys.stdout.flush()
+                logger.error("Ultra-Format 修复后仍失败: %s", errors)
             else:
-                print(f"[INFO] Ultra-Format 已自动修复", flush=True)
-                sys.stdout.flush()
+                logger.info("Ultra-Format 已自动修复")
         
         strengths_after = result.get('strengths_reasoning_chain', {})
         weaknesses_after = result.get('weaknesses_reasoning_chain', {})
         strengths_conclusion_after = strengths_after.get('conclusion', '') if isinstance(strengths_after, dict) else ''
         weaknesses_conclusion_after = weaknesses_after.get('conclusion', '') if isinstance(weaknesses_after, dict) else ''
         
-        print(f"[DEBUG] 最终推理链状态: strengths_conclusion={strengths_conclusion_after[:30] if strengths_conclusion_after else 'None'}, weaknesses_conclusion={weaknesses_conclusion_after[:30] if weaknesses_conclusion_after else 'None'}", flush=True)
-        sys.stdout.flush()
+        logger.debug("最终推理链状态: strengths_conclusion=%s, weaknesses_conclusion=%s", strengths_conclusion_after[:30] if strengths_conclusion_after else 'None', weaknesses_conclusion_after[:30] if weaknesses_conclusion_after else 'None')
         
         return result
     
@@ -622,8 +622,7 @@ class UltraScoringEngine:
                     conclusion = "具备一定的工作能力"
                     ai_reasoning = f"技能匹配度得分{scoring_result.skill_match_score}分，经验相关性得分{scoring_result.experience_match_score}分，建议进一步了解候选人的具体工作内容和成果。"
                 
-                print(f"[DEBUG] 优势推理链：从得分生成，conclusion={conclusion}", flush=True)
-                sys.stdout.flush()
+                logger.debug("优势推理链：从得分生成，conclusion=%s", conclusion)
                 return {
                     "conclusion": conclusion,
                     "detected_actions": [],
@@ -633,8 +632,7 @@ class UltraScoringEngine:
             
             conclusion = "具备岗位所需的核心能力"
             ai_reasoning = f"从简历中识别出{len(detected_actions)}个关键动作，体现了与岗位要求相关的工作能力。技能匹配度得分{scoring_result.skill_match_score}分，经验相关性得分{scoring_result.experience_match_score}分。"
-            print(f"[DEBUG] 优势推理链：从动作生成，detected_actions数量={len(detected_actions)}", flush=True)
-            sys.stdout.flush()
+            logger.debug("优势推理链：从动作生成，detected_actions数量=%d", len(detected_actions))
             return {
                 "conclusion": conclusion,
                 "detected_actions": detected_actions,
@@ -0,0 +1,99 @@
+"""
+批量写入层
+- 行数据预先整理成元组，使用 executemany 复用同一条预编译语句
+- 按块提交事务，大文件导入时内存与单个事务大小都有上限
+- 可选按 dedup_keys 去重：每块先批量查 phone_hash / email_hash 索引，再用内存集合拦截块内重复
+"""
+
+import uuid
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from backend.core.dedup import DedupIndex, contact_text, key_hash
+from backend.storage.db import now_timestamps
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# resume_rows 元组中两个去重哈希的位置
+PHONE_HASH_POS = 13
+EMAIL_HASH_POS = 14
+
+RESUME_FIELDS = ("name", "email", "phone", "edu", "companies", "years", "skills", "projects", "text_raw")
+
+RESUME_INSERT_SQL = (
+    "INSERT INTO resume (id,name,email,phone,edu,companies,years,skills,projects,text_raw,source,created_at,created_ts,phone_hash,email_hash) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _chunks(rows: Iterable[Tuple], size: int) -> Iterator[List[Tuple]]:
+    chunk: List[Tuple] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def executemany_chunked(conn, sql: str, rows: Iterable[Tuple], chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """每 chunk_size 行一个事务执行 executemany，返回写入行数"""
+    total = 0
+    for chunk in _chunks(rows, max(1, chunk_size)):
+        with conn:  # 成功提交，异常回滚
+            conn.executemany(sql, chunk)
+        total += len(chunk)
+    return total
+
+
+def resume_rows(df: pd.DataFrame, source: str = "csv") -> List[Tuple]:
+    """把简历 DataFrame 整理成 resume 表的插入元组（取值规则与逐行插入一致）"""
+    created_at, created_ts = now_timestamps()
+    n = len(df)
+    text_cols: Sequence[List[str]] = [
+        [str(v) for v in df[c]] if c in df.columns else [""] * n
+        for c in RESUME_FIELDS if c != "years"
+    ]
+    years = [float(v or 0) for v in df["years"]] if "years" in df.columns else [0.0] * n
+    name, email, phone, edu, companies, skills, projects, text_raw = text_cols
+    # 联系方式列含缺失值时是 float：不写入 "nan"，手机号不带 ".0"
+    if "email" in df.columns:
+        email = [contact_text(v) for v in df["email"]]
+    if "phone" in df.columns:
+        phone = [contact_text(v) for v in df["phone"]]
+    return [
+        (str(uuid.uuid4()), name[i], email[i], phone[i], edu[i], companies[i], years[i],
+         skills[i], projects[i], text_raw[i], source, created_at, created_ts,
+         key_hash("phone", phone[i]), key_hash("email", email[i]))
+        for i in range(n)
+    ]
+
+
+def _row_hashes(row: Tuple, keys: Sequence[str]) -> Dict[str, str]:
+    hashes = {"phone": row[PHONE_HASH_POS], "email": row[EMAIL_HASH_POS]}
+    return {k: hashes[k] for k in keys if hashes.get(k)}
+
+
+def dedup_rows(conn, rows: List[Tuple], dedup: DedupIndex) -> List[Tuple]:
+    """去掉与库中已有简历或本批次前面行重复的行（先批量查索引，再查内存集合）"""
+    hashes = [_row_hashes(row, dedup.keys) for row in rows]
+    dedup.load_existing(conn, hashes)
+    return [row for row, h in zip(rows, hashes) if not dedup.check_and_add(h)]
+
+
+def insert_resumes(
+    conn,
+    df: pd.DataFrame,
+    source: str = "csv",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dedup: Optional[DedupIndex] = None,
+) -> int:
+    """批量写入简历，返回写入行数；传入 dedup 时跳过重复候选人（跳过数累计在 dedup.skipped）"""
+    if dedup is None:
+        return executemany_chunked(conn, RESUME_INSERT_SQL, resume_rows(df, source), chunk_size)
+    total = 0
+    for chunk in _chunks(resume_rows(df, source), max(1, chunk_size)):
+        total += executemany_chunked(conn, RESUME_INSERT_SQL, dedup_rows(conn, chunk, dedup), chunk_size)
+    return total
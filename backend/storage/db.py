@@ -1,10 +1,130 @@
+"""
+SQLite 存储层
+连接管理：每个线程按数据库路径复用一条连接（WAL 日志模式 + 调优过的 PRAGMA + busy timeout），
+Streamlit 多会话与批处理 worker 可以在评分写入期间并发读取。
+
+调用方仍按 get_db() ... conn.close() 的写法使用：池化连接的 close() 只回滚未提交的事务，
+不会真正关闭连接；真正关闭由 close_all() / 线程结束 / 进程退出负责。
+
+环境变量：
+- DB_BUSY_TIMEOUT_MS：写锁等待毫秒数（默认 5000）
+- DB_CACHE_SIZE_KB：每条连接的页缓存大小（默认 20480，即 20MB）
+- DB_MMAP_SIZE_MB：内存映射读取大小（默认 256，0 关闭）
+"""
+
+import atexit
+import os
 import sqlite3
+import threading
+import time
+import weakref
 from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from backend.storage.migrations import apply_migrations
 
 DB_PATH = Path("backend/storage/recruitflow.db")
 
-def get_db():
-    return sqlite3.connect(DB_PATH)
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class PooledConnection(sqlite3.Connection):
+    """线程内复用的连接：close() 只回滚未提交的事务，保持与一次性连接相同的语义"""
+
+    closed = False
+
+    def close(self):
+        if not self.closed and self.in_transaction:
+            self.rollback()
+
+    def close_for_real(self):
+        self.closed = True
+        super().close()
+
+
+_local = threading.local()
+_registry_lock = threading.Lock()
+_all_connections: "weakref.WeakSet[PooledConnection]" = weakref.WeakSet()
+
+
+def _apply_pragmas(conn: sqlite3.Connection) -> None:
+    # WAL 写入持久化在库文件上；读者不阻塞写者，写者也不阻塞读者
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL 下 NORMAL 仍保证崩溃一致性，只是掉电时可能丢失最后几个事务
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={_env_int('DB_BUSY_TIMEOUT_MS', 5000)}")
+    conn.execute(f"PRAGMA cache_size={-_env_int('DB_CACHE_SIZE_KB', 20480)}")
+    conn.execute(f"PRAGMA mmap_size={_env_int('DB_MMAP_SIZE_MB', 256) * 1024 * 1024}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+
+
+def _connect(path: Path) -> PooledConnection:
+    timeout = _env_int("DB_BUSY_TIMEOUT_MS", 5000) / 1000.0
+    # 连接只在所属线程内使用；关闭 check_same_thread 是为了让 close_all() 能跨线程回收
+    conn = sqlite3.connect(str(path), timeout=timeout, check_same_thread=False, factory=PooledConnection)
+    _apply_pragmas(conn)
+    with _registry_lock:
+        _all_connections.add(conn)
+    return conn
+
+
+def resolve_db_path() -> str:
+    """DB_PATH 按当前工作目录解析后的绝对路径"""
+    return str(Path(DB_PATH).resolve())
+
+
+def get_db(path: Optional[str] = None) -> PooledConnection:
+    """当前线程对应 DB_PATH（或指定路径）的共享连接（按绝对路径区分，工作目录切换后自动换库）"""
+    key = path or resolve_db_path()
+    pool: Dict[str, PooledConnection] = getattr(_local, "connections", None)
+    if pool is None:
+        pool = _local.connections = {}
+    conn = pool.get(key)
+    if conn is None or conn.closed:
+        conn = pool[key] = _connect(Path(key))
+    return conn
+
+
+def close_thread_connections() -> None:
+    """关闭当前线程持有的连接（长驻 worker 线程退出前调用）"""
+    pool = getattr(_local, "connections", None) or {}
+    for conn in pool.values():
+        _close_quietly(conn)
+    pool.clear()
+
+
+def close_all() -> None:
+    """关闭所有线程的连接（测试或进程退出时使用）"""
+    with _registry_lock:
+        conns = list(_all_connections)
+        _all_connections.clear()
+    for conn in conns:
+        _close_quietly(conn)
+    pool = getattr(_local, "connections", None)
+    if pool is not None:
+        pool.clear()
+
+
+def _close_quietly(conn: PooledConnection) -> None:
+    try:
+        conn.close_for_real()
+    except Exception:
+        pass
+
+
+atexit.register(close_all)
+
+
+def now_timestamps() -> Tuple[str, int]:
+    """写入时间：(created_at 本地时间文本, created_ts UTC 秒级时间戳)"""
+    now = time.time()
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)), int(now)
+
 
 def init_db():
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -54,6 +174,7 @@ action TEXT,
 payload TEXT
 );
 """ )
+    # 增量字段、索引等 schema 变更统一走版本化迁移
+    apply_migrations(conn)
     conn.commit()
     conn.close()
-
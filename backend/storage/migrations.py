@@ -0,0 +1,118 @@
+"""
+数据库 schema 迁移
+schema_version 表记录已执行的版本号；MIGRATIONS 按版本顺序排列，
+init_db 启动时只执行尚未应用的迁移，每个迁移在独立事务中完成并登记版本。
+
+新增迁移：在 MIGRATIONS 末尾追加 (版本号, 说明, 函数)，不要修改已发布的迁移。
+"""
+
+import sqlite3
+import time
+from typing import Callable, Dict, List, Tuple
+
+from backend.core.dedup import key_hash
+
+SCHEMA_VERSION_DDL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+version INTEGER PRIMARY KEY,
+description TEXT,
+applied_at TEXT
+)
+"""
+
+# created_at 为本地时间文本，created_ts 为对应的 UTC 秒级时间戳（可排序、可比较）
+TIMESTAMPED_TABLES = ("jd", "resume", "score")
+
+
+def _ensure_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str]) -> None:
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for name, decl in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
+
+def _m001_incremental_score(conn: sqlite3.Connection) -> None:
+    # 增量评分所需字段；早期版本由 init_db 直接 ALTER TABLE 补齐，这里按列判断保持幂等
+    _ensure_columns(conn, "score", {
+        "rules_hash": "TEXT",
+        "weights_hash": "TEXT",
+        "is_current": "INTEGER DEFAULT 1",
+    })
+
+
+def _m002_indexes(conn: sqlite3.Connection) -> None:
+    for ddl in (
+        "CREATE INDEX IF NOT EXISTS idx_score_job_total ON score(job, score_total DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_score_resume_job ON score(resume_id, job)",
+        "CREATE INDEX IF NOT EXISTS idx_resume_phone ON resume(phone)",
+        "CREATE INDEX IF NOT EXISTS idx_resume_email ON resume(email)",
+        "CREATE INDEX IF NOT EXISTS idx_audit_action_ts ON audit(action, ts)",
+    ):
+        conn.execute(ddl)
+
+
+def _m003_sortable_created_at(conn: sqlite3.Connection) -> None:
+    for table in TIMESTAMPED_TABLES:
+        _ensure_columns(conn, table, {"created_ts": "INTEGER"})
+        # 无法解析的旧文本保持 NULL，不影响其余行
+        conn.execute(
+            f"UPDATE {table} SET created_ts = CAST(strftime('%s', created_at, 'utc') AS INTEGER) "
+            f"WHERE created_ts IS NULL AND created_at IS NOT NULL AND created_at != ''"
+        )
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_created_ts ON {table}(created_ts)")
+
+
+def _m004_dedup_hashes(conn: sqlite3.Connection) -> None:
+    # 归一化手机号 / 邮箱的哈希，入库去重走索引查询
+    _ensure_columns(conn, "resume", {"phone_hash": "TEXT", "email_hash": "TEXT"})
+    rows = conn.execute("SELECT id, phone, email FROM resume").fetchall()
+    conn.executemany(
+        "UPDATE resume SET phone_hash = ?, email_hash = ? WHERE id = ?",
+        [(key_hash("phone", phone), key_hash("email", email), rid) for rid, phone, email in rows],
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_resume_phone_hash ON resume(phone_hash)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_resume_email_hash ON resume(email_hash)")
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "score 增量评分字段", _m001_incremental_score),
+    (2, "score/resume/audit 查询索引", _m002_indexes),
+    (3, "created_at 转为可排序的 created_ts", _m003_sortable_created_at),
+    (4, "resume 去重哈希列及索引", _m004_dedup_hashes),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    conn.execute(SCHEMA_VERSION_DDL)
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def apply_migrations(conn: sqlite3.Connection) -> List[int]:
+    """执行所有未应用的迁移，返回本次执行的版本号"""
+    if conn.in_transaction:
+        conn.commit()
+    done = current_version(conn)
+    applied = []
+    for version, description, migrate in MIGRATIONS:
+        if version <= done:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 拿到写锁后再确认一次，避免多个进程同时启动时重复执行
+            if conn.execute("SELECT 1 FROM schema_version WHERE version = ?", (version,)).fetchone():
+                conn.rollback()
+                continue
+            migrate(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (version, description, time.strftime("%Y-%m-%d %H:%M:%S")),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+    return applied
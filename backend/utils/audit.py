@@ -1,11 +1,153 @@
-import json, uuid, datetime as dt
-from backend.storage.db import get_db
+"""
+审计日志
+默认异步写入：audit_log 只把事件放进队列，后台线程每 AUDIT_FLUSH_MS 毫秒或攒够 AUDIT_BATCH_SIZE 条
+在一个事务内批量写入，审计不再占用主流程的提交/fsync。进程退出时自动 flush。
+
+事件的 id / ts 在调用时生成，写入的库路径也在调用时确定，语义与同步写入一致。
+
+环境变量：
+- AUDIT_SYNC：1 改为同步写入（测试 / 调试）
+- AUDIT_FLUSH_MS：批量写入间隔毫秒（默认 200）
+- AUDIT_BATCH_SIZE：单批最大条数（默认 200）
+"""
+
+import atexit
+import datetime as dt
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from backend.storage.db import get_db, resolve_db_path
+
+AUDIT_INSERT_SQL = "INSERT INTO audit (id, ts, actor, action, payload) VALUES (?, ?, ?, ?, ?)"
+
+_sync_mode = os.getenv("AUDIT_SYNC", "0").strip() in ("1", "true", "True", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class _Marker:
+    """flush / stop 请求：后台线程写完之前的事件后置位"""
+
+    def __init__(self, stop: bool = False):
+        self.stop = stop
+        self.done = threading.Event()
+
+
+class AuditWriter:
+    """队列 + 后台刷新线程，按 (间隔, 条数) 两个阈值批量写入"""
+
+    def __init__(self, flush_interval_ms: Optional[int] = None, batch_size: Optional[int] = None):
+        interval = flush_interval_ms if flush_interval_ms is not None else _env_int("AUDIT_FLUSH_MS", 200)
+        self.flush_interval = max(0, interval) / 1000.0
+        self.batch_size = max(1, batch_size if batch_size is not None else _env_int("AUDIT_BATCH_SIZE", 200))
+        self.written = 0
+        self.batches = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = os.getpid()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # fork 出的子进程不继承线程，也不应写父进程队列里的事件
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, path: str, row: Tuple) -> None:
+        self._ensure_started()
+        self._queue.put((path, row))
+
+    def flush(self, timeout: Optional[float] = 10.0, stop: bool = False) -> bool:
+        """等待此前提交的事件全部落库；stop=True 时随后结束后台线程"""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        marker = _Marker(stop=stop)
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch: List[Tuple[str, Tuple]] = []
+            marker: Optional[_Marker] = None
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, _Marker):
+                    marker = item
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            if marker is not None:
+                marker.done.set()
+                if marker.stop:
+                    return
+
+    def _write(self, batch: List[Tuple[str, Tuple]]) -> None:
+        by_path: Dict[str, List[Tuple]] = {}
+        for path, row in batch:
+            by_path.setdefault(path, []).append(row)
+        for path, rows in by_path.items():
+            try:
+                conn = get_db(path)
+                with conn:
+                    conn.executemany(AUDIT_INSERT_SQL, rows)
+                self.written += len(rows)
+                self.batches += 1
+            except Exception as e:
+                print(f"[WARNING] 审计日志写入失败（{len(rows)} 条）: {str(e)}", flush=True)
+
+
+_writer = AuditWriter()
+
 
 def audit_log(action: str, payload: dict, actor: str = "system") -> None:
-    conn = get_db(); cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO audit (id, ts, actor, action, payload) VALUES (?, ?, ?, ?, ?)",
-        (str(uuid.uuid4()), dt.datetime.utcnow().isoformat(), actor, action, json.dumps(payload, ensure_ascii=False))
-    )
-    conn.commit(); conn.close()
+    row = (str(uuid.uuid4()), dt.datetime.utcnow().isoformat(), actor, action, json.dumps(payload, ensure_ascii=False))
+    if _sync_mode:
+        conn = get_db()
+        conn.execute(AUDIT_INSERT_SQL, row)
+        conn.commit(); conn.close()
+        return
+    _writer.submit(resolve_db_path(), row)
+
+
+def set_audit_sync(enabled: bool) -> None:
+    """切换同步 / 异步模式；切到同步前先把队列中的事件写完"""
+    global _sync_mode
+    if enabled:
+        flush_audit()
+    _sync_mode = enabled
+
+
+def flush_audit(timeout: Optional[float] = 10.0) -> bool:
+    """等待已提交的审计事件落库（读取审计表之前调用）"""
+    return _writer.flush(timeout)
+
+
+def _shutdown() -> None:
+    _writer.flush(timeout=5.0, stop=True)
+
 
+atexit.register(_shutdown)
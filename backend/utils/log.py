@@ -0,0 +1,127 @@
+"""
+结构化日志
+评分热路径（Ultra 引擎、ScoringGraph、字段生成）使用 get_logger(__name__) 取代 print：
+- 级别过滤：默认 INFO，DEBUG 日志在生产环境下只剩一次级别判断
+- 惰性格式化：消息使用 % 占位符，未输出的日志不会拼接字符串；
+  需要额外计算的调试信息先用 logger.isEnabledFor(logging.DEBUG) 判断
+- JSON 输出：每行一条 JSON（ts / level / logger / msg 及 extra 字段），便于采集
+
+环境变量：
+- LOG_LEVEL：全局级别（DEBUG / INFO / WARNING / ERROR），默认 INFO
+- LOG_LEVELS：按模块覆盖级别，如 "backend.services.scoring_graph=DEBUG,backend.services.field_generators=WARNING"
+- LOG_JSON：1 时以 JSON 行输出
+- LOG_FILE：日志写入该文件（追加），默认输出到 stderr
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+from typing import Dict, Optional
+
+ROOT_LOGGER = "backend"
+DEFAULT_LEVEL = "INFO"
+TEXT_FORMAT = "[%(levelname)s] %(name)s: %(message)s"
+
+# LogRecord 自带的属性；其余属性视为 extra 传入的结构化字段
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_configured = False
+_lock = threading.Lock()
+# 上次按模块设置过级别的日志器，重新配置时先恢复为继承
+_module_overrides: set = set()
+
+
+class JsonFormatter(logging.Formatter):
+    """每条日志输出为一行 JSON，extra 字段原样并入"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SafeStreamHandler(logging.StreamHandler):
+    """终端编码不是 UTF-8（如 Windows GBK 控制台）时替换无法编码的字符，只在真正输出时处理"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        msg = super().format(record)
+        encoding = getattr(self.stream, "encoding", None) or "utf-8"
+        if encoding.lower().replace("-", "") != "utf8":
+            msg = msg.encode(encoding, errors="replace").decode(encoding, errors="replace")
+        return msg
+
+
+def _parse_level(value: Optional[str], default: int = logging.INFO) -> int:
+    level = logging.getLevelName((value or "").strip().upper())
+    return level if isinstance(level, int) else default
+
+
+def parse_module_levels(spec: Optional[str]) -> Dict[str, int]:
+    """解析 "模块=级别,模块=级别"，忽略格式不对的条目"""
+    levels: Dict[str, int] = {}
+    for item in (spec or "").split(","):
+        name, sep, value = item.partition("=")
+        if sep and name.strip():
+            level = _parse_level(value, default=-1)
+            if level >= 0:
+                levels[name.strip()] = level
+    return levels
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    module_levels: Optional[str] = None,
+    json_format: Optional[bool] = None,
+    log_file: Optional[str] = None,
+    stream=None,
+) -> logging.Logger:
+    """
+    配置 backend 日志（参数未给出时读取环境变量），重复调用会替换之前的配置。
+    只配置 backend 这一支，不改动 root logger，不影响 Streamlit 等第三方日志。
+    """
+    global _configured
+    with _lock:
+        root = logging.getLogger(ROOT_LOGGER)
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+            handler.close()
+
+        log_file = log_file if log_file is not None else os.getenv("LOG_FILE", "")
+        if log_file:
+            handler: logging.Handler = logging.FileHandler(log_file, encoding="utf-8")
+        else:
+            handler = SafeStreamHandler(stream or sys.stderr)
+        if json_format is None:
+            json_format = os.getenv("LOG_JSON", "").strip() in ("1", "true", "True", "on")
+        handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT))
+
+        root.addHandler(handler)
+        root.setLevel(_parse_level(level if level is not None else os.getenv("LOG_LEVEL", DEFAULT_LEVEL)))
+        root.propagate = False
+        for name in _module_overrides:
+            logging.getLogger(name).setLevel(logging.NOTSET)
+        _module_overrides.clear()
+        spec = module_levels if module_levels is not None else os.getenv("LOG_LEVELS", "")
+        for name, module_level in parse_module_levels(spec).items():
+            logging.getLogger(name).setLevel(module_level)
+            _module_overrides.add(name)
+        _configured = True
+        return root
+
+
+def get_logger(name: str) -> logging.Logger:
+    """模块日志器（传 __name__）；首次调用时按环境变量完成配置"""
+    if not _configured:
+        configure_logging()
+    return logging.getLogger(name)
@@ -1,5 +1,7 @@
 import re
-from typing import List
+from collections import deque
+from functools import lru_cache
+from typing import Iterable, List, Set, Tuple
 
 def normalize(s: str) -> str:
     s = (s or "").lower().strip()
@@ -13,3 +15,77 @@ def contains_any(text: str, keywords: List[str]) -> List[str]:
             hits.append(kw)
     return hits
 
+def keyword_pattern(kw: str) -> str:
+    """关键词的匹配形式，与 contains_any 保持一致"""
+    return kw.lower().strip()
+
+class KeywordMatcher:
+    """
+    Aho-Corasick 多模式匹配器：关键词集合只构建一次自动机，
+    对预先 normalize 过的文本单次扫描即可得到全部命中，结果与 contains_any 一致。
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = [k for k in keywords if k]
+        patterns = {keyword_pattern(k) for k in self.keywords}
+        # 空模式（如纯空白关键词）在 contains_any 中恒为命中
+        self._always = {p for p in patterns if not p}
+        self._goto = [{}]
+        self._fail = [0]
+        self._out: List[Set[str]] = [set()]
+        for p in patterns:
+            if p:
+                self._add(p)
+        self._build_fail_links()
+
+    def _add(self, pattern: str) -> None:
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+                self._goto[node][ch] = nxt
+            node = nxt
+        self._out[node].add(pattern)
+
+    def _build_fail_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] |= self._out[self._fail[child]]
+
+    def find(self, normalized_text: str) -> Set[str]:
+        """返回在文本中出现过的匹配模式（keyword_pattern 形式）"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(self._always)
+        node = 0
+        for ch in normalized_text or "":
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found |= out[node]
+        return found
+
+    def hits(self, text: str, normalized: bool = False) -> List[str]:
+        """按关键词原顺序返回命中的关键词，等价于 contains_any(text, keywords)"""
+        found = self.find(text if normalized else normalize(text))
+        return [k for k in self.keywords if keyword_pattern(k) in found]
+
+@lru_cache(maxsize=256)
+def _compile(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+def compile_keywords(keywords: Iterable[str]) -> KeywordMatcher:
+    """同一组关键词复用同一个自动机"""
+    return _compile(tuple(keywords))
@@ -0,0 +1,66 @@
+import argparse, random, re, time
+from backend.services.scoring_graph import ACTION_INDICATORS, VERB_DICT, DetectedAction, ScoringGraph
+
+FRAGMENTS = [
+    "负责家长电话邀约和试听课转化，月均签单30单", "带领5人团队完成季度业绩目标", "熟悉CRM系统并优化跟进流程",
+    "主导续费项目，续费率提升15%", "参与跨部门项目，推动社群运营", "在某教育公司工作3年",
+    "通过培训学习提升沟通能力", "组织学员活动并复盘总结", "2019年毕业于某师范大学", "爱好阅读与跑步",
+    "协助主管处理客户投诉与回访", "编写课程销售话术手册", "维护老学员关系并促成转介绍",
+]
+
+def legacy_detect_actions(graph, text):
+    """改造前的实现：每句逐个尝试 VERB_DICT 中的动词，短语校验再扫描一遍动作词表"""
+    actions = []
+    for sentence in re.split(r'[。！？；\n]', text):
+        sentence = sentence.strip()
+        if len(sentence) < 8:
+            continue
+        for verb in VERB_DICT:
+            if verb in sentence:
+                verb_pos = sentence.find(verb)
+                phrase = sentence[max(0, verb_pos - 2):min(len(sentence), verb_pos + len(verb) + 20)]
+                phrase = re.sub(r'^[，。！？；：、\s]+', '', phrase)
+                phrase = re.sub(r'[，。！？；：、\s]+$', '', phrase)
+                if (len(phrase) >= 6 and verb in phrase and any(i in phrase for i in ACTION_INDICATORS)
+                        and not re.match(r'^[，。！？；：、\s\d]+$', phrase)):
+                    tags = graph.action_mapping.map_action_to_abilities(verb, sentence)
+                    if len(tags) < 2:
+                        tags.extend(graph.ability_pool.match_abilities(sentence)[:3 - len(tags)])
+                    actions.append(DetectedAction(action=phrase[:50], sentence=sentence, resume_quote=sentence[:100],
+                                                  ability_tags=tags[:3], confidence=1.0))
+                    break
+    unique, seen = [], set()
+    for a in actions:
+        key = (a.action, a.sentence[:50])
+        if key not in seen:
+            unique.append(a); seen.add(key)
+    return unique[:20]
+
+def main():
+    parser = argparse.ArgumentParser(description="对比逐动词扫描与单次正则扫描的动作识别耗时")
+    parser.add_argument("--n", type=int, default=300, help="简历数量")
+    parser.add_argument("--sentences", type=int, default=400, help="每份简历的句子数")
+    args = parser.parse_args()
+
+    rnd = random.Random(11)
+    # 句尾追加期次编号，长简历里大部分句子互不相同
+    resumes = ["。".join(f"{rnd.choice(FRAGMENTS)}（第{rnd.randint(1, 99)}期）" for _ in range(args.sentences))
+               for _ in range(args.n)]
+    graph = ScoringGraph("课程顾问")
+
+    start = time.perf_counter()
+    legacy = [legacy_detect_actions(graph, r) for r in resumes]
+    t_legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    current = [graph._step2_detect_actions(r) for r in resumes]
+    t_current = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(legacy, current) if a != b)
+    print(f"简历数 {args.n} | 每份 {args.sentences} 句（约 {len(resumes[0])} 字）")
+    print(f"逐动词扫描 : {t_legacy:.3f}s ({t_legacy / args.n * 1e3:.2f} ms/份)")
+    print(f"单次正则   : {t_current:.3f}s ({t_current / args.n * 1e3:.2f} ms/份)")
+    print(f"加速比 {t_legacy / max(t_current, 1e-9):.2f}x | 结果不一致 {mismatches} 份")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse, random, time
+from backend.core import scoring
+from backend.utils.text_utils import contains_any
+
+JOB_RULE = {
+    "must_have": "沟通;转化;CRM;跟进;试听;在线教育",
+    "nice_to_have": "数据分析;续费;班主任;团队管理;K12",
+    "exclude_keywords": "频繁跳槽;短期实习",
+    "min_years": "1",
+}
+WEIGHTS = {"skill_fit": 0.45, "exp_relevance": 0.25, "stability": 0.15, "growth": 0.15}
+WHITELIST = ["在线教育", "K12", "职业教育", "成人教育", "培训机构"]
+WORDS = ("我 负责 课程 顾问 工作 三年 在线 教育 经验 沟通 能力 强 熟悉 CRM 系统 完成 转化 目标 带领 团队 "
+         "提升 续费 率 数据 分析 复盘 试听 跟进 家长 学员 K12 ROI 主导 从0到1 增长 证书 培训 学习").split()
+
+def legacy_compute_scores(job_rule, row, weights, whitelist, evidence_max=3):
+    """改造前的实现：每个关键词集合各调用一次 contains_any（每次都重新 normalize 全文）"""
+    must = [x.strip() for x in (job_rule.get('must_have') or '').split(';') if x.strip()]
+    nice = [x.strip() for x in (job_rule.get('nice_to_have') or '').split(';') if x.strip()]
+    exclude = [x.strip() for x in (job_rule.get('exclude_keywords') or '').split(';') if x.strip()]
+    min_years = float(job_rule.get('min_years') or 0)
+    text_all = ' '.join([str(row.get('skills','')), str(row.get('projects','')), str(row.get('text_raw','')), str(row.get('companies',''))])
+    ratio = lambda kws: (len(contains_any(text_all, kws)) / max(len([k for k in kws if k]), 1)) if kws else 0.0
+    must_ratio, nice_ratio = ratio(must), ratio(nice)
+    skill_fit = 0.75*must_ratio + 0.25*nice_ratio
+    excluded_hits = contains_any(text_all, exclude)
+    if excluded_hits: skill_fit *= 0.5
+    years = float(row.get('years') or 0)
+    exp_rel = 0.7*min(max((years - min_years + 1)/5.0, 0), 1) + 0.3*ratio(whitelist)
+    stability = scoring._stability(years, row.get('companies',''))
+    growth = min(1.0, len(contains_any(text_all, scoring.GROWTH_KEYWORDS))/5.0)
+    confidence = min(1.0, 0.5 + 0.4*must_ratio - 0.3*len(excluded_hits))
+    total = round(weights['skill_fit']*skill_fit + weights['exp_relevance']*exp_rel + weights['stability']*stability + weights['growth']*growth, 4)
+    return {'score_total': total,'skill_fit': round(skill_fit,4),'exp_relevance': round(exp_rel,4),'stability': round(stability,4),'growth': round(growth,4)}, round(confidence,4)
+
+def make_rows(n, words_per_resume, seed=7):
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        text = " ".join(rnd.choice(WORDS) for _ in range(words_per_resume))
+        if i % 10 == 0:
+            text += " 频繁跳槽"
+        rows.append({"skills": "沟通 CRM", "projects": "转化提升项目", "text_raw": text,
+                     "companies": rnd.choice(["在线教育/培训", "K12", "互联网/电商/在线教育"]), "years": rnd.randint(0, 8)})
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="对比 contains_any 与 Aho-Corasick 关键词匹配的评分耗时")
+    parser.add_argument("--n", type=int, default=10000, help="简历数量")
+    parser.add_argument("--words", type=int, default=600, help="每份简历的词数")
+    args = parser.parse_args()
+
+    rows = make_rows(args.n, args.words)
+    start = time.perf_counter()
+    legacy = [legacy_compute_scores(JOB_RULE, r, WEIGHTS, WHITELIST) for r in rows]
+    t_legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    current = [scoring.compute_scores(JOB_RULE, r, WEIGHTS, WHITELIST) for r in rows]
+    t_current = time.perf_counter() - start
+
+    mismatches = sum(1 for (s1, c1), (s2, _e, c2) in zip(legacy, current) if s1 != s2 or c1 != c2)
+    print(f"简历数 {args.n} | 每份约 {args.words} 词")
+    print(f"contains_any   : {t_legacy:.3f}s ({t_legacy / args.n * 1e6:.0f} µs/份)")
+    print(f"Aho-Corasick   : {t_current:.3f}s ({t_current / args.n * 1e6:.0f} µs/份)")
+    print(f"加速比 {t_legacy / max(t_current, 1e-9):.2f}x | 结果不一致 {mismatches} 份")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse, os, random, tempfile, time
+from contextlib import redirect_stderr, redirect_stdout
+
+from backend.services.ai_matcher_ultra import ai_score_one_ultra
+from backend.services.ultra_scoring_engine import UltraScoringEngine
+from backend.utils.log import configure_logging
+
+FRAGMENTS = [
+    "负责家长电话邀约和试听课转化，月均签单30单", "带领5人团队完成季度业绩目标", "熟悉CRM系统并优化跟进流程",
+    "主导续费项目，续费率提升15%", "参与跨部门项目，推动社群运营", "在某教育公司工作3年",
+    "通过培训学习提升沟通能力", "组织学员活动并复盘总结", "2019年毕业于某师范大学", "爱好阅读与跑步",
+    "协助主管处理客户投诉与回访", "编写课程销售话术手册", "维护老学员关系并促成转介绍",
+]
+JD = "岗位职责：负责家长电话邀约与试听课转化，负责学员跟进。任职要求：3年以上教育行业销售经验，熟悉CRM系统，擅长沟通。"
+
+def main():
+    parser = argparse.ArgumentParser(description="Ultra 规则评分的逐份耗时（含日志开销），stdout / stderr 写到临时文件")
+    parser.add_argument("--n", type=int, default=300, help="简历数量")
+    parser.add_argument("--sentences", type=int, default=30, help="每份简历的句子数")
+    args = parser.parse_args()
+
+    # 只测规则评分：清空 API Key，避免调用 LLM
+    os.environ["SILICONFLOW_API_KEY"] = ""
+    os.environ["OPENAI_API_KEY"] = ""
+
+    rnd = random.Random(5)
+    texts = ["。".join(rnd.choice(FRAGMENTS) for _ in range(args.sentences)) for _ in range(args.n)]
+    engine = UltraScoringEngine("课程顾问", JD)
+
+    # 输出写到真实文件（带 flush 的写入），比 /dev/null 更接近终端 / 管道
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as sink, redirect_stdout(sink), redirect_stderr(sink):
+        configure_logging(stream=sink)  # 级别 / 格式仍读取 LOG_LEVEL、LOG_LEVELS、LOG_JSON
+        ai_score_one_ultra(JD, texts[0], "课程顾问", engine=engine)  # 预热
+        start = time.perf_counter()
+        for text in texts:
+            ai_score_one_ultra(JD, text, "课程顾问", engine=engine)
+        elapsed = time.perf_counter() - start
+        sink.flush()
+        size = sink.tell()
+    print(
+        f"简历数 {args.n} | LOG_LEVEL={os.getenv('LOG_LEVEL', '(默认)')} | {elapsed / args.n * 1000:.2f} ms/份 | "
+        f"日志 {size / args.n:.0f} 字节/份"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import argparse, random, tempfile, time
+from pathlib import Path
+
+from backend.services.resume_index import BM25Index
+
+WORDS = ("负责 课程 顾问 工作 在线教育 经验 沟通 能力 熟悉 CRM 系统 完成 转化 目标 带领 团队 提升 续费率 数据分析 "
+         "复盘 试听 跟进 家长 学员 K12 ROI 主导 增长 证书 培训 Java Python 后端 开发 微服务 运营 社群 私域 招生 "
+         "销售 签单 电话 邀约 班主任 教务 排课 财务 审计 设计 视频 剪辑 直播 带货 产品 需求 原型 测试").split()
+JD = "招聘在线教育课程顾问：负责家长电话邀约与试听课转化，熟悉CRM系统，有K12续费率提升与数据分析复盘经验优先"
+
+def main():
+    parser = argparse.ArgumentParser(description="BM25 简历索引的建索引与 Top-K 检索耗时")
+    parser.add_argument("--n", type=int, default=100000, help="简历数量")
+    parser.add_argument("--words", type=int, default=150, help="每份简历的词数")
+    parser.add_argument("--top-k", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--saves", type=int, default=50, help="逐份导入后保存的次数（测增量保存耗时）")
+    args = parser.parse_args()
+
+    rnd = random.Random(7)
+    docs = [(f"r{i}", " ".join(rnd.choice(WORDS) for _ in range(args.words))) for i in range(args.n)]
+
+    index = BM25Index()
+    start = time.perf_counter()
+    for i in range(0, args.n, 5000):
+        index.add_documents(docs[i:i + 5000])
+    index.compact()
+    t_build = time.perf_counter() - start
+
+    index.search(JD, args.top_k)
+    start = time.perf_counter()
+    for _ in range(args.queries):
+        hits = index.search(JD, args.top_k)
+    t_query = (time.perf_counter() - start) / args.queries
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        index.save(Path(tmp))
+        t_base = time.perf_counter() - start
+        start = time.perf_counter()
+        for i in range(args.saves):
+            index.add_documents([(f"new{i}", docs[i][1])])
+            index.save(Path(tmp))
+        t_save = (time.perf_counter() - start) / max(args.saves, 1)
+
+    print(f"简历数 {args.n} | 每份约 {args.words} 词 | 词表 {len(index.vocab)}")
+    print(f"建索引 : {t_build:.2f}s（批量增量写入 + 合并）")
+    print(f"检索   : {t_query * 1000:.1f} ms/次（Top-{args.top_k}，命中 {len(hits)}）")
+    print(f"保存   : 基线 {t_base * 1000:.0f} ms，逐份导入后增量保存 {t_save * 1000:.2f} ms/次")
+
+if __name__ == "__main__":
+    main()
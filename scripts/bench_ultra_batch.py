@@ -0,0 +1,49 @@
+import argparse, io, os, random, time
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+from backend.services.ai_matcher_ultra import ai_match_resumes_df_ultra, ai_match_resumes_df_ultra_batch
+
+FRAGMENTS = [
+    "负责家长电话邀约和试听课转化，月均签单30单", "带领5人团队完成季度业绩目标", "熟悉CRM系统并优化跟进流程",
+    "主导续费项目，续费率提升15%", "参与跨部门项目，推动社群运营", "在某教育公司工作3年",
+    "通过培训学习提升沟通能力", "组织学员活动并复盘总结", "2019年毕业于某师范大学", "爱好阅读与跑步",
+    "协助主管处理客户投诉与回访", "编写课程销售话术手册", "维护老学员关系并促成转介绍",
+]
+JD = "岗位职责：负责家长电话邀约与试听课转化，负责学员跟进。任职要求：3年以上教育行业销售经验，熟悉CRM系统，擅长沟通。"
+
+def main():
+    parser = argparse.ArgumentParser(description="对比 Ultra 规则评分的逐份串行与进程池批量模式")
+    parser.add_argument("--n", type=int, default=400, help="简历数量")
+    parser.add_argument("--sentences", type=int, default=30, help="每份简历的句子数")
+    parser.add_argument("--workers", type=int, default=None, help="进程数，默认读取 ULTRA_SCORE_WORKERS")
+    args = parser.parse_args()
+
+    # 只测规则评分：清空 API Key，避免调用 LLM
+    os.environ["SILICONFLOW_API_KEY"] = ""
+    os.environ["OPENAI_API_KEY"] = ""
+
+    rnd = random.Random(5)
+    df = pd.DataFrame({
+        "candidate_id": range(args.n),
+        "resume_text": ["。".join(rnd.choice(FRAGMENTS) for _ in range(args.sentences)) for _ in range(args.n)],
+    })
+
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        serial = ai_match_resumes_df_ultra(JD, df, "课程顾问")
+    t_serial = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = ai_match_resumes_df_ultra_batch(JD, df, "课程顾问", max_workers=args.workers)
+    t_batch = time.perf_counter() - start
+
+    same = serial.to_dict("records") == batch.to_dict("records")
+    print(f"简历数 {args.n} | CPU 核数 {os.cpu_count()}")
+    print(f"串行（含逐份日志）: {t_serial:.2f}s ({t_serial / args.n * 1000:.1f} ms/份)")
+    print(f"批量（进程池）    : {t_batch:.2f}s ({t_batch / args.n * 1000:.1f} ms/份)")
+    print(f"加速比 {t_serial / t_batch:.2f}x | 结果一致: {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import argparse, time
+from pathlib import Path
+
+from backend.services.parse_cache import get_parse_cache
+from backend.services.resume_parser import SUPPORTED_EXT, infer_candidate_name, parse_files_parallel
+
+def main():
+    parser = argparse.ArgumentParser(description="预热简历解析缓存：解析目录下的简历并写入缓存")
+    parser.add_argument("--dir", default="data/uploads", help="简历目录，默认 data/uploads")
+    parser.add_argument("--recursive", action="store_true", help="递归扫描子目录（上传文件按内容哈希分子目录保存于 data/uploads）")
+    parser.add_argument("--workers", type=int, default=None, help="解析进程数，默认读取 RESUME_PARSE_WORKERS")
+    parser.add_argument("--timeout", type=float, default=None, help="单文件解析超时秒数，默认读取 RESUME_PARSE_TIMEOUT")
+    args = parser.parse_args()
+
+    root = Path(args.dir)
+    pattern = "**/*" if args.recursive else "*"
+    paths = sorted(p for p in root.glob(pattern) if p.is_file() and p.suffix.lower() in SUPPORTED_EXT)
+    if not paths:
+        print(f"目录中没有可解析的简历：{root}")
+        return
+
+    cache = get_parse_cache()
+    start = time.time()
+    results = parse_files_parallel(paths, max_workers=args.workers, timeout=args.timeout)
+    for path, result in zip(paths, results):
+        # 同时预热姓名，上传同名文件时可直接复用
+        if result.get("cache_key") and result.get("text") and not result.get("name"):
+            cache.set_name(result["cache_key"], infer_candidate_name(result["text"], path.name), file=path.name)
+    stats = cache.stats()
+    print(
+        f"预热完成：{len(paths)} 个文件 | 命中 {stats['hits']} | 新解析 {stats['misses']} | "
+        f"缓存条目 {stats['entries']} | 用时 {time.time()-start:.2f}s"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+测试公共夹具：数据库、索引、上传文件都按相对路径落在工作目录下，
+每个用例切换到独立的临时目录，结束后写完审计日志、关闭数据库连接并恢复工作目录。
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from backend.services import resume_parser
+from backend.services.parse_cache import ParseCache
+from backend.services.pipeline import RecruitPipeline
+from backend.storage.db import close_all, init_db
+from backend.utils.audit import flush_audit
+
+CFG_PATH = Path(__file__).resolve().parents[1] / "backend" / "configs" / "model_config.json"
+
+
+class FakeUpload:
+    """Streamlit UploadedFile 的替身：只提供 name 与 getbuffer()"""
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self._data = text.encode("utf-8")
+
+    def getbuffer(self):
+        return memoryview(self._data)
+
+
+class TempDirTestCase(unittest.TestCase):
+    """在临时工作目录中运行；清理放在 addCleanup 里，子类的 tearDown 先于它执行"""
+
+    def setUp(self):
+        super().setUp()
+        self._cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        self.addCleanup(self._restore_workdir)
+
+    def _restore_workdir(self):
+        flush_audit()
+        close_all()
+        os.chdir(self._cwd)
+        self.tmp.cleanup()
+
+
+class DbTestCase(TempDirTestCase):
+    """临时目录中已初始化数据库"""
+
+    def setUp(self):
+        super().setUp()
+        init_db()
+
+
+class PipelineTestCase(TempDirTestCase):
+    """临时目录中的 RecruitPipeline（self.pipe）；需要自定义配置时覆盖 make_pipeline"""
+
+    def setUp(self):
+        super().setUp()
+        self.pipe = self.make_pipeline()
+
+    def make_pipeline(self) -> RecruitPipeline:
+        return RecruitPipeline(cfg_path=str(CFG_PATH))
+
+
+class ParseCacheTestCase(TempDirTestCase):
+    """resume_parser 使用临时目录中的解析缓存（self.cache）"""
+
+    def setUp(self):
+        super().setUp()
+        self.cache = ParseCache(Path(self.tmp.name) / "parse_cache.db")
+        patcher = mock.patch.object(resume_parser, "get_parse_cache", return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
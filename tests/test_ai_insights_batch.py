@@ -0,0 +1,78 @@
+"""
+AI 洞察批量模式测试
+"""
+
+import json
+import unittest
+from unittest import mock
+
+from backend.services import ai_insights
+from backend.services.ai_client import AIConfig
+
+
+def _payload(cid=None, score=20):
+    item = {
+        "score_detail": {
+            dim: {"score": score, "evidence": []}
+            for dim in ("skill_match", "experience_match", "stability", "growth_potential")
+        },
+        "resume_mini": f"摘要{cid}",
+        "match_summary": "推荐",
+    }
+    if cid is not None:
+        item["candidate_id"] = cid
+    return item
+
+
+def _reply(content):
+    return {"choices": [{"message": {"content": content, "role": "assistant"}}]}
+
+
+class TestInsightBatch(unittest.TestCase):
+
+    def setUp(self):
+        cfg = AIConfig(provider="openai", api_key="k", base_url="http://localhost:1/v1", model="m", temperature=0.3)
+        patcher = mock.patch.object(ai_insights, "get_client_and_cfg", return_value=(object(), cfg))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_parse_json_array_variants(self):
+        self.assertEqual(ai_insights._parse_llm_json_array('```json\n[{"a": 1}]\n```'), [{"a": 1}])
+        self.assertEqual(ai_insights._parse_llm_json_array('结果如下 [1, 2] 完'), [1, 2])
+        self.assertEqual(ai_insights._parse_llm_json_array('{"results": [3]}'), [3])
+
+    def test_batch_splits_and_retries_only_failed_items(self):
+        bad = _payload("b")
+        bad["score_detail"]["stability"]["score"] = "N/A"
+        batch_reply = json.dumps([_payload("a"), bad], ensure_ascii=False)
+        prompts = []
+
+        def fake_chat(client, cfg, messages, **kwargs):
+            prompts.append(messages[-1]["content"])
+            if len(prompts) == 1:
+                return _reply(batch_reply)
+            return _reply(json.dumps(_payload(score=10), ensure_ascii=False))
+
+        candidates = [("a", "简历A 负责学员管理"), ("b", "简历B 电话回访家长"), ("c", "简历C 组织活动")]
+        with mock.patch.object(ai_insights, "chat_completion", side_effect=fake_chat):
+            results = ai_insights.generate_ai_insights_batch("班主任", candidates, "岗位JD：负责学员管理", batch_size=3)
+
+        # 一次批量请求 + b、c 各一次单独重试
+        self.assertEqual(len(prompts), 3)
+        self.assertEqual(prompts[0].count("岗位JD：负责学员管理"), 1)
+        self.assertIn('<candidate id="c">', prompts[0])
+        self.assertIn("简历B", prompts[1])
+        self.assertIn("简历C", prompts[2])
+        self.assertEqual(results["a"]["scores"]["skill_match"], 80.0)
+        self.assertEqual(results["b"]["scores"]["skill_match"], 40.0)
+        self.assertFalse(results["c"]["fallback"])
+
+    def test_empty_resume_uses_fallback_without_request(self):
+        with mock.patch.object(ai_insights, "chat_completion") as chat:
+            results = ai_insights.generate_ai_insights_batch("班主任", [("x", "  ")], "JD")
+        chat.assert_not_called()
+        self.assertTrue(results["x"]["fallback"])
+
+
+if __name__ == "__main__":
+    unittest.main()
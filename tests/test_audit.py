@@ -0,0 +1,61 @@
+"""
+异步审计日志测试
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from backend.storage.db import close_all, get_db, init_db
+from backend.utils import audit
+from backend.utils.audit import AuditWriter, audit_log, flush_audit, set_audit_sync
+from tests.fixtures import DbTestCase
+
+
+class TestAuditLog(DbTestCase):
+
+    def tearDown(self):
+        set_audit_sync(False)
+
+    def _count(self, action):
+        return get_db().execute("SELECT COUNT(*) FROM audit WHERE action = ?", (action,)).fetchone()[0]
+
+    def test_async_events_written_after_flush(self):
+        for i in range(5):
+            audit_log("step", {"i": i})
+        self.assertTrue(flush_audit())
+        self.assertEqual(self._count("step"), 5)
+
+    def test_sync_mode_writes_immediately(self):
+        set_audit_sync(True)
+        audit_log("sync_step", {"ok": True})
+        self.assertEqual(self._count("sync_step"), 1)
+
+    def test_batches_by_size_in_single_transactions(self):
+        writer = AuditWriter(flush_interval_ms=10_000, batch_size=4)
+        with mock.patch.object(audit, "_writer", writer):
+            for i in range(10):
+                audit_log("batched", {"i": i})
+            writer.flush()
+        self.assertEqual(self._count("batched"), 10)
+        self.assertEqual(writer.batches, 3)
+        writer.flush(stop=True)
+
+    def test_event_keeps_database_of_caller(self):
+        audit_log("here", {})
+        other = tempfile.TemporaryDirectory()
+        try:
+            os.chdir(other.name)
+            init_db()
+            flush_audit()
+            self.assertEqual(self._count("here"), 0)
+        finally:
+            os.chdir(self.tmp.name)
+            close_all()
+            other.cleanup()
+        self.assertEqual(self._count("here"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
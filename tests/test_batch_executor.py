@@ -0,0 +1,99 @@
+"""
+并发批处理执行器与限流器测试
+"""
+
+import threading
+import time
+import unittest
+
+from backend.services.batch_executor import run_bounded, run_bounded_processes
+from backend.services.rate_limiter import RateLimiter
+
+
+class TestRunBounded(unittest.TestCase):
+
+    def test_keeps_input_order(self):
+        items = list(range(20))
+
+        def worker(i):
+            time.sleep(0.002 * (20 - i))
+            return i * i
+
+        results = run_bounded(items, worker, lambda i, e: None, max_workers=8)
+        self.assertEqual(results, [i * i for i in items])
+
+    def test_failure_falls_back_per_item(self):
+        def worker(i):
+            if i == 2:
+                raise RuntimeError("boom")
+            return f"ai-{i}"
+
+        results = run_bounded([1, 2, 3], worker, lambda i, e: f"fallback-{i}:{e}", max_workers=2)
+        self.assertEqual(results, ["ai-1", "fallback-2:boom", "ai-3"])
+
+    def test_timeout_does_not_stall_batch(self):
+        release = threading.Event()
+
+        def worker(i):
+            if i == 0:
+                release.wait(5)
+            return i
+
+        start = time.monotonic()
+        results = run_bounded([0, 1, 2, 3], worker, lambda i, e: "timeout", max_workers=2, timeout=0.2)
+        release.set()
+        self.assertLess(time.monotonic() - start, 2.0)
+        self.assertEqual(results, ["timeout", 1, 2, 3])
+
+    def test_concurrency_is_bounded(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def worker(i):
+            with lock:
+                active.append(i)
+                peak.append(len(active))
+            time.sleep(0.01)
+            with lock:
+                active.remove(i)
+            return i
+
+        run_bounded(list(range(12)), worker, lambda i, e: None, max_workers=3)
+        self.assertLessEqual(max(peak), 3)
+
+
+def _square_or_fail(i):
+    if i == 3:
+        raise ValueError("bad file")
+    if i == 5:
+        time.sleep(30)
+    return i * i
+
+
+class TestRunBoundedProcesses(unittest.TestCase):
+
+    def test_order_failure_and_timeout(self):
+        start = time.monotonic()
+        results = run_bounded_processes(
+            list(range(8)), _square_or_fail, lambda i, e: f"fallback-{i}", max_workers=2, timeout=1.0
+        )
+        self.assertLess(time.monotonic() - start, 15.0)
+        expected = [i * i for i in range(8)]
+        expected[3] = "fallback-3"
+        expected[5] = "fallback-5"
+        self.assertEqual(results, expected)
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_rate_limiter_spaces_requests(self):
+        limiter = RateLimiter(rate_per_minute=600, burst=1)  # 每 0.1 秒一个
+        start = time.monotonic()
+        for _ in range(4):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
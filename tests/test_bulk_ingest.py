@@ -0,0 +1,58 @@
+"""
+批量导入测试
+"""
+
+import sqlite3
+import unittest
+
+import pandas as pd
+
+from backend.storage.bulk import executemany_chunked, resume_rows
+from backend.storage.db import get_db
+from backend.utils.audit import flush_audit
+from tests.fixtures import PipelineTestCase
+
+
+class TestBulkIngest(PipelineTestCase):
+
+    def test_executemany_commits_per_chunk(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE t (v INTEGER)")
+        statements = []
+        conn.set_trace_callback(statements.append)
+        written = executemany_chunked(conn, "INSERT INTO t VALUES (?)", ((i,) for i in range(10)), chunk_size=4)
+        self.assertEqual(written, 10)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 10)
+        self.assertEqual(sum(1 for s in statements if s.upper().startswith("COMMIT")), 3)
+
+    def test_resume_rows_match_row_wise_conversion(self):
+        df = pd.DataFrame([{"name": "张伟", "years": "", "phone": 13800000000}, {"name": None, "years": 2.5, "phone": "x"}])
+        rows = resume_rows(df, source="csv")
+        self.assertEqual(rows[0][1:8], ("张伟", "", "13800000000", "", "", 0.0, ""))
+        self.assertEqual((rows[1][1], rows[1][6]), (str(df["name"][1]), 2.5))
+        self.assertEqual(rows[1][10], "csv")
+
+    def test_ingest_csv_in_chunks(self):
+        n = 2500
+        pd.DataFrame({
+            "name": [f"候选人{i}" for i in range(n)],
+            "phone": [f"0{i:010d}" for i in range(n)],
+            "years": [i % 7 for i in range(n)],
+            "skills": "沟通",
+        }).to_csv("resumes.csv", index=False)
+        self.assertEqual(self.pipe.ingest_resumes_csv("resumes.csv", chunksize=1000), n)
+        flush_audit()
+        conn = get_db()
+        count, phone, email = conn.execute(
+            "SELECT COUNT(*), MIN(phone), MIN(email) FROM resume"
+        ).fetchone()
+        years = conn.execute("SELECT SUM(years) FROM resume").fetchone()[0]
+        audit = conn.execute("SELECT COUNT(*) FROM audit WHERE action = 'ingest_resumes_csv'").fetchone()[0]
+        conn.close()
+        self.assertEqual((count, phone, email), (n, "00000000000", ""))
+        self.assertEqual(years, float(sum(i % 7 for i in range(n))))
+        self.assertEqual(audit, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+级联评分测试
+"""
+
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from backend.services import ai_matcher, cascade_scorer
+
+
+class TestSelectForLLM(unittest.TestCase):
+
+    def test_top_k_union_band(self):
+        scores = [90, 20, 65, 70, 10, 88]
+        selected = cascade_scorer.select_for_llm(scores, {"top_k": 2, "uncertainty_band": [60, 72]})
+        self.assertEqual(selected, {0, 5, 2, 3})
+
+    def test_defaults_are_merged(self):
+        cfg = cascade_scorer.load_cascade_config("does/not/exist.json")
+        self.assertFalse(cfg["enabled"])
+        self.assertIn("uncertainty_band", cfg)
+
+
+class TestCascadeMatch(unittest.TestCase):
+
+    def test_only_selected_rows_reach_llm(self):
+        df = pd.DataFrame({
+            "candidate_id": [1, 2, 3],
+            "resume_text": [
+                "负责学员管理，家长沟通，学习督导，复盘改进，长期稳定任职" * 5,
+                "无关内容",
+                "家长沟通 学员管理",
+            ],
+        })
+        scored = []
+
+        def fake_score(client, cfg, jd, text, job, insights=None):
+            scored.append(text)
+            return {"总分": 99, "维度得分": {}, "short_eval": "llm"}
+
+        cascade = {"enabled": True, "stage1": "heuristic", "top_k": 1, "uncertainty_band": [0, 0]}
+        with mock.patch.object(ai_matcher, "get_client_and_cfg", return_value=(None, None)), \
+                mock.patch.object(ai_matcher, "ai_score_one", side_effect=fake_score):
+            out = ai_matcher.ai_match_resumes_df("负责学员管理、家长沟通、学习督导", df, "班主任", cascade=cascade)
+
+        self.assertEqual(len(scored), 1)
+        self.assertEqual(list(out["candidate_id"]), [1, 2, 3])
+        self.assertEqual(
+            list(out["score_stage"]),
+            [cascade_scorer.STAGE_LLM, cascade_scorer.STAGE_HEURISTIC, cascade_scorer.STAGE_HEURISTIC],
+        )
+        self.assertEqual(out.loc[0, "总分"], 99)
+
+
+if __name__ == "__main__":
+    unittest.main()
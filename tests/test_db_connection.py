@@ -0,0 +1,68 @@
+"""
+数据库连接管理测试
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+
+from backend.storage import db
+from backend.storage.db import close_all, get_db, init_db
+from tests.fixtures import DbTestCase
+
+
+class TestConnectionManager(DbTestCase):
+
+    def test_same_thread_reuses_connection_and_pragmas(self):
+        conn = get_db()
+        conn.close()
+        self.assertIs(get_db(), conn)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+        self.assertGreater(conn.execute("PRAGMA busy_timeout").fetchone()[0], 0)
+
+    def test_close_discards_uncommitted_changes(self):
+        conn = get_db()
+        conn.execute("INSERT INTO audit (id, ts, actor, action, payload) VALUES ('a', '', '', 'x', '{}')")
+        conn.close()
+        self.assertEqual(get_db().execute("SELECT COUNT(*) FROM audit").fetchone()[0], 0)
+
+    def test_threads_get_own_connections(self):
+        seen = []
+        t = threading.Thread(target=lambda: seen.append(get_db()))
+        t.start(); t.join()
+        self.assertIsNot(seen[0], get_db())
+
+    def test_reads_proceed_during_open_write(self):
+        writer = get_db()
+        writer.execute("BEGIN IMMEDIATE")
+        writer.execute("INSERT INTO audit (id, ts, actor, action, payload) VALUES ('w', '', '', 'x', '{}')")
+        counts = []
+        t = threading.Thread(target=lambda: counts.append(get_db().execute("SELECT COUNT(*) FROM audit").fetchone()[0]))
+        t.start(); t.join(timeout=5)
+        writer.commit()
+        self.assertEqual(counts, [0])
+
+    def test_new_working_directory_gets_new_database(self):
+        first = get_db()
+        other = tempfile.TemporaryDirectory()
+        try:
+            os.chdir(other.name)
+            init_db()
+            self.assertIsNot(get_db(), first)
+        finally:
+            os.chdir(self.tmp.name)
+            close_all()
+            other.cleanup()
+
+    def test_close_all_reopens_on_next_use(self):
+        conn = get_db()
+        close_all()
+        self.assertTrue(conn.closed)
+        self.assertEqual(get_db().execute("SELECT 1").fetchone()[0], 1)
+        self.assertTrue(db.DB_PATH.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+schema 迁移测试
+"""
+
+import sqlite3
+import unittest
+from pathlib import Path
+
+from backend.storage.db import DB_PATH, get_db, init_db
+from backend.storage.migrations import LATEST_VERSION, apply_migrations, current_version
+from tests.fixtures import TempDirTestCase
+
+LEGACY_DDL = """
+CREATE TABLE jd (id TEXT PRIMARY KEY, job TEXT, jd_long TEXT, jd_short TEXT, rubric_json TEXT, created_at TEXT);
+CREATE TABLE resume (id TEXT PRIMARY KEY, name TEXT, email TEXT, phone TEXT, edu TEXT, companies TEXT, years REAL,
+  skills TEXT, projects TEXT, text_raw TEXT, source TEXT, created_at TEXT);
+CREATE TABLE score (id TEXT PRIMARY KEY, resume_id TEXT, job TEXT, score_total REAL, skill_fit REAL, exp_relevance REAL,
+  stability REAL, growth REAL, evidence_json TEXT, confidence REAL, created_at TEXT);
+CREATE TABLE audit (id TEXT PRIMARY KEY, ts TEXT, actor TEXT, action TEXT, payload TEXT);
+"""
+
+
+class TestMigrations(TempDirTestCase):
+
+    def test_fresh_database_is_at_latest_version(self):
+        init_db()
+        conn = get_db()
+        self.assertEqual(current_version(conn), LATEST_VERSION)
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertTrue({"idx_score_job_total", "idx_score_resume_job", "idx_resume_phone",
+                         "idx_resume_email", "idx_audit_action_ts"} <= indexes)
+
+    def test_rerun_is_noop(self):
+        init_db()
+        self.assertEqual(apply_migrations(get_db()), [])
+        init_db()
+        count = get_db().execute("SELECT COUNT(*) FROM schema_version").fetchone()[0]
+        self.assertEqual(count, LATEST_VERSION)
+
+    def test_legacy_database_is_upgraded_and_backfilled(self):
+        Path(DB_PATH).parent.mkdir(parents=True)
+        legacy = sqlite3.connect(DB_PATH)
+        legacy.executescript(LEGACY_DDL)
+        legacy.execute("INSERT INTO resume (id, created_at) VALUES ('old', '2024-01-02 03:04:05')")
+        legacy.execute("INSERT INTO resume (id, created_at) VALUES ('older', '2023-12-31 23:59:59')")
+        legacy.execute("INSERT INTO resume (id, created_at) VALUES ('bad', '')")
+        legacy.commit(); legacy.close()
+
+        init_db()
+        conn = get_db()
+        cols = {row[1] for row in conn.execute("PRAGMA table_info(score)")}
+        self.assertTrue({"rules_hash", "weights_hash", "is_current", "created_ts"} <= cols)
+        ordered = [r[0] for r in conn.execute("SELECT id FROM resume WHERE created_ts IS NOT NULL ORDER BY created_ts")]
+        self.assertEqual(ordered, ["older", "old"])
+        self.assertIsNone(conn.execute("SELECT created_ts FROM resume WHERE id = 'bad'").fetchone()[0])
+
+    def test_job_score_lookup_uses_index(self):
+        init_db()
+        plan = " ".join(str(r) for r in get_db().execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM score WHERE job = ? ORDER BY score_total DESC", ("x",)))
+        self.assertIn("idx_score_job_total", plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
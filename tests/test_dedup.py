@@ -0,0 +1,121 @@
+"""
+候选人去重测试：归一化、上传批次去重、入库索引去重
+"""
+
+import json
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+from backend.core.dedup import dedup_frame, key_hash, normalize_email, normalize_phone
+from backend.services import resume_parser
+from backend.storage.db import get_db
+from backend.utils.audit import flush_audit
+from tests.fixtures import ParseCacheTestCase, PipelineTestCase
+
+
+class TestNormalization(unittest.TestCase):
+
+    def test_phone_variants_share_hash(self):
+        self.assertEqual(normalize_phone("+86 138-0013-8000"), "13800138000")
+        self.assertEqual(key_hash("phone", "138 0013 8000"), key_hash("phone", "8613800138000"))
+        self.assertEqual(key_hash("phone", "无"), "")
+
+    def test_float_phone_matches_string(self):
+        self.assertEqual(key_hash("phone", 13800000000.0), key_hash("phone", "13800000000"))
+        self.assertEqual(key_hash("phone", "13800000000.0"), key_hash("phone", "13800000000"))
+        self.assertEqual(key_hash("phone", float("nan")), "")
+        self.assertEqual(key_hash("email", float("nan")), "")
+
+    def test_email_case_insensitive(self):
+        self.assertEqual(normalize_email("  Li.Na@Example.COM "), "li.na@example.com")
+        self.assertEqual(key_hash("email", "nobody"), "")
+
+    def test_dedup_frame_keeps_first_and_records_merge(self):
+        df = pd.DataFrame([
+            {"file": "a.pdf", "phone": "13800138000", "email": ""},
+            {"file": "b.pdf", "phone": "", "email": "x@y.com"},
+            {"file": "a_copy.pdf", "phone": "138-0013-8000", "email": ""},
+            {"file": "b2.docx", "phone": "13900000000", "email": "X@Y.com"},
+            {"file": "c.pdf", "phone": "", "email": ""},
+        ])
+        kept, dropped = dedup_frame(df, ["phone", "email"])
+        self.assertEqual(list(kept["file"]), ["a.pdf", "b.pdf", "c.pdf"])
+        self.assertEqual(list(kept["duplicate_files"]), ["a_copy.pdf", "b2.docx", ""])
+        self.assertEqual(list(dropped["dedup_key"]), ["phone", "email"])
+        self.assertEqual(list(dropped["duplicate_of"]), ["a.pdf", "b.pdf"])
+
+    def test_dedup_frame_respects_configured_keys(self):
+        df = pd.DataFrame([{"file": "a", "phone": "13800138000", "email": "a@x.com"},
+                           {"file": "b", "phone": "13800138000", "email": "b@x.com"}])
+        kept, dropped = dedup_frame(df, ["email"])
+        self.assertEqual(len(kept), 2)
+        self.assertTrue(dropped.empty)
+
+
+class TestIngestDedup(PipelineTestCase):
+
+    def _count(self):
+        return get_db().execute("SELECT COUNT(*) FROM resume").fetchone()[0]
+
+    def test_csv_skips_duplicates_within_file_and_against_db(self):
+        self.pipe.ingest_resumes_df(pd.DataFrame([{"name": "甲", "phone": "13800138000", "email": "jia@x.com"}]))
+        pd.DataFrame([
+            {"name": "甲", "phone": "+86 13800138000", "email": ""},
+            {"name": "乙", "phone": "13900000000", "email": "yi@x.com"},
+            {"name": "乙", "phone": "", "email": "YI@x.com"},
+            {"name": "丙", "phone": "", "email": ""},
+        ]).to_csv("resumes.csv", index=False)
+        inserted = self.pipe.ingest_resumes_csv("resumes.csv", chunksize=2)
+        self.assertEqual(inserted, 2)
+        self.assertEqual(self.pipe.last_ingest["skipped_duplicates"], 2)
+        self.assertEqual(self._count(), 3)
+        flush_audit()
+        payload = get_db().execute(
+            "SELECT payload FROM audit WHERE action = 'ingest_resumes_csv'").fetchone()[0]
+        self.assertIn('"skipped_duplicates": 2', payload)
+
+    def test_text_resume_duplicate_skipped(self):
+        txt = "姓名：张三\n手机：13800138000\n邮箱：zs@example.com"
+        self.assertEqual(self.pipe.ingest_text_resume(txt), 1)
+        self.assertEqual(self.pipe.ingest_text_resume(txt.replace("13800138000", "138 0013 8000")), 0)
+        self.assertEqual(self._count(), 1)
+        flush_audit()
+        payloads = [json.loads(p) for (p,) in get_db().execute(
+            "SELECT payload FROM audit WHERE action = 'ingest_text_resume' ORDER BY rowid")]
+        self.assertEqual(payloads, [{"count": 1, "skipped_duplicates": 0}, {"count": 0, "skipped_duplicates": 1}])
+
+    def test_float_phone_column_dedups_against_text_ingest(self):
+        # 含缺失值的手机号列为 float：13800000000.0
+        df = pd.DataFrame({"name": ["甲", "乙"], "phone": [13800000000, None], "email": ["jia@x.com", None]})
+        self.assertEqual(df["phone"].dtype, float)
+        self.assertEqual(self.pipe.ingest_resumes_df(df), 2)
+        rows = get_db().execute("SELECT phone, email FROM resume ORDER BY rowid").fetchall()
+        self.assertEqual([tuple(r) for r in rows], [("13800000000", "jia@x.com"), ("", "")])
+        self.assertEqual(self.pipe.ingest_text_resume("姓名：甲\n手机：13800000000"), 0)
+        self.assertEqual(self._count(), 2)
+
+    def test_lookup_uses_hash_index(self):
+        plan = " ".join(str(r) for r in get_db().execute(
+            "EXPLAIN QUERY PLAN SELECT phone_hash FROM resume WHERE phone_hash IN (?)", ("x",)))
+        self.assertIn("idx_resume_phone_hash", plan)
+
+
+class TestIdenticalUploadsParsedOnce(ParseCacheTestCase):
+
+    def test_same_bytes_parsed_once(self):
+        paths = []
+        for name in ("a.txt", "b.txt", "c.txt"):
+            Path(name).write_text("邮箱：same@example.com" if name != "c.txt" else "邮箱：c@example.com",
+                                  encoding="utf-8")
+            paths.append(Path(name))
+        with mock.patch.object(resume_parser, "_parse_saved_file", wraps=resume_parser._parse_saved_file) as spy:
+            results = resume_parser.parse_files_parallel(paths, max_workers=1, timeout=0)
+        self.assertEqual(spy.call_count, 2)
+        self.assertEqual([r["email"] for r in results], ["same@example.com", "same@example.com", "c@example.com"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+ScoringGraph 动作识别（单次正则扫描）测试
+"""
+
+import random
+import re
+import unittest
+
+from backend.services.scoring_graph import ACTION_INDICATORS, VERB_DICT, DetectedAction, ScoringGraph, find_verbs
+
+FRAGMENTS = [
+    "负责家长电话邀约和试听课转化，月均签单30单", "带领5人团队完成季度业绩目标", "熟悉CRM系统并优化跟进流程",
+    "参与跨部门项目，推动社群运营", "通过培训学习提升沟通能力", "2019年毕业于某师范大学",
+    "协助主管处理客户投诉与回访", "维护老学员关系并促成转介绍",
+]
+
+
+def legacy_detect_actions(graph, text):
+    """改造前的实现：每句逐个尝试 VERB_DICT 中的动词，全部识别完再去重截断"""
+    actions = []
+    for sentence in re.split(r'[。！？；\n]', text):
+        sentence = sentence.strip()
+        if len(sentence) < 8:
+            continue
+        for verb in VERB_DICT:
+            if verb in sentence:
+                verb_pos = sentence.find(verb)
+                phrase = sentence[max(0, verb_pos - 2):min(len(sentence), verb_pos + len(verb) + 20)]
+                phrase = re.sub(r'^[，。！？；：、\s]+', '', phrase)
+                phrase = re.sub(r'[，。！？；：、\s]+$', '', phrase)
+                if (len(phrase) >= 6 and verb in phrase and any(i in phrase for i in ACTION_INDICATORS)
+                        and not re.match(r'^[，。！？；：、\s\d]+$', phrase)):
+                    tags = graph.action_mapping.map_action_to_abilities(verb, sentence)
+                    if len(tags) < 2:
+                        tags.extend(graph.ability_pool.match_abilities(sentence)[:3 - len(tags)])
+                    actions.append(DetectedAction(action=phrase[:50], sentence=sentence, resume_quote=sentence[:100],
+                                                  ability_tags=tags[:3], confidence=1.0))
+                    break
+    unique, seen = [], set()
+    for a in actions:
+        key = (a.action, a.sentence[:50])
+        if key not in seen:
+            unique.append(a)
+            seen.add(key)
+    return unique[:20]
+
+
+def legacy_find_verbs(sentence):
+    return [(v, sentence.find(v)) for v in dict.fromkeys(VERB_DICT) if v in sentence]
+
+
+class TestFindVerbs(unittest.TestCase):
+
+    def test_dictionary_order_and_first_position(self):
+        sentence = "协助主管处理客户投诉，负责回访并再次处理投诉"
+        self.assertEqual(find_verbs(sentence), legacy_find_verbs(sentence))
+        self.assertEqual(find_verbs(sentence)[0], ("负责", 11))
+
+    def test_no_verb(self):
+        self.assertEqual(find_verbs("2019年毕业于某师范大学"), [])
+
+
+class TestDetectActions(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = ScoringGraph("课程顾问")
+
+    def test_falls_back_when_first_verb_phrase_invalid(self):
+        # "管理"排在词典最前，但所在短语太短无效，应退回到后面的"负责"
+        text = "管理。主要负责学员的日常沟通与课程跟进工作"
+        self.assertEqual(self.graph._step2_detect_actions(text), legacy_detect_actions(self.graph, text))
+
+    def test_matches_legacy_on_random_resumes(self):
+        rnd = random.Random(3)
+        for sentences in (5, 40, 200):
+            text = "。".join(f"{rnd.choice(FRAGMENTS)}（第{rnd.randint(1, 9)}期）" for _ in range(sentences))
+            self.assertEqual(self.graph._step2_detect_actions(text), legacy_detect_actions(self.graph, text))
+
+    def test_capped_at_twenty(self):
+        text = "。".join(f"负责第{i}期学员的课程跟进与家长沟通" for i in range(50))
+        actions = self.graph._step2_detect_actions(text)
+        self.assertEqual(len(actions), 20)
+        self.assertEqual(actions, legacy_detect_actions(self.graph, text))
+
+
+if __name__ == "__main__":
+    unittest.main()
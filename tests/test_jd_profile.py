@@ -0,0 +1,61 @@
+"""
+JDProfile 预编译测试
+"""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from backend.services import scoring_graph
+from backend.services.scoring_graph import JDProfile, ScoringGraph, get_jd_profile
+
+JD = (
+    "岗位职责：负责家长电话邀约与试听课转化，负责学员跟进。"
+    "任职要求：具备3年以上教育行业销售经验，熟悉CRM系统，擅长沟通。"
+)
+RESUME = "负责家长电话邀约和试听课转化，月均签单30单。熟悉CRM系统并优化跟进流程。参与跨部门项目，推动社群运营。"
+
+
+class TestJDProfile(unittest.TestCase):
+
+    def test_keywords_deduplicated_and_weights_cached(self):
+        profile = JDProfile.build("课程顾问", JD)
+        self.assertEqual(len(profile.duty_keywords), len(set(profile.duty_keywords)))
+        self.assertIn("负责家长电", profile.duty_keywords)
+        self.assertEqual(profile.jd_years, 3.0)
+        self.assertEqual(profile.weight_matrix, ScoringGraph("课程顾问", JD)._step4_weight_matrix())
+        self.assertIs(get_jd_profile("课程顾问", JD), get_jd_profile("课程顾问", JD))
+
+    def test_cached_weight_matrix_is_read_only(self):
+        profile = get_jd_profile("课程顾问", JD)
+        with self.assertRaises(TypeError):
+            profile.weight_matrix["skill_match"] = 1.0
+        self.assertEqual(get_jd_profile("课程顾问", JD).weight_matrix["skill_match"], 0.25)
+
+    def test_empty_jd(self):
+        profile = JDProfile.build("班主任", "")
+        self.assertEqual((profile.skill_keywords, profile.duty_keywords, profile.jd_years), ((), (), None))
+        self.assertTrue(profile.core_abilities)
+
+    def test_batch_reuses_profile_without_reanalysing_jd(self):
+        profile = get_jd_profile("课程顾问", JD)
+        graph = ScoringGraph("课程顾问", JD)
+        with mock.patch.object(scoring_graph.JDProfile, "build", side_effect=AssertionError("JD 不应重复分析")), \
+                redirect_stdout(io.StringIO()):
+            first = graph.execute(RESUME, profile)
+            second = graph.execute(RESUME + "带领5人团队完成季度目标。", profile)
+        self.assertNotEqual(first.error_code, "SCORING_ERROR")
+        self.assertNotEqual(second.error_code, "SCORING_ERROR")
+        self.assertGreater(first.final_score, 0)
+
+    def test_explicit_profile_matches_default(self):
+        with redirect_stdout(io.StringIO()):
+            default = ScoringGraph("课程顾问", JD).execute(RESUME)
+            explicit = ScoringGraph("课程顾问", JD).execute(RESUME, JDProfile.build("课程顾问", JD))
+        self.assertEqual(default.final_score, explicit.final_score)
+        self.assertEqual(default.score_explanation, explicit.score_explanation)
+
+
+if __name__ == "__main__":
+    unittest.main()
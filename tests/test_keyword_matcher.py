@@ -0,0 +1,77 @@
+"""
+Aho-Corasick 关键词匹配与 compute_scores 测试
+"""
+
+import random
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from backend.core.scoring import compute_scores, compute_scores_frame
+from backend.utils.text_utils import KeywordMatcher, compile_keywords, contains_any, normalize
+
+
+class TestKeywordMatcher(unittest.TestCase):
+
+    def test_overlapping_and_nested_patterns(self):
+        kws = ["销售", "售额", "销售额", "额", "ROI", "从0到1", "不存在"]
+        text = "负责 销售额 提升，roi 提升 30%，从0到1 搭建团队"
+        self.assertEqual(KeywordMatcher(kws).hits(text), contains_any(text, kws))
+        self.assertEqual(KeywordMatcher(kws).hits(text), ["销售", "售额", "销售额", "额", "ROI", "从0到1"])
+
+    def test_matches_contains_any_on_random_texts(self):
+        rnd = random.Random(3)
+        alphabet = "销售转化沟通abAB 试听\t\n"
+        kws = ["".join(rnd.choice(alphabet) for _ in range(rnd.randint(1, 3))) for _ in range(30)] + ["", "  ", "转化"]
+        matcher = KeywordMatcher(kws)
+        for _ in range(200):
+            text = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 60)))
+            self.assertEqual(matcher.hits(text), contains_any(text, kws))
+            self.assertEqual(matcher.hits(normalize(text), normalized=True), contains_any(text, kws))
+
+    def test_duplicates_kept_and_automaton_reused(self):
+        self.assertEqual(KeywordMatcher(["CRM", "crm", "CRM"]).hits("熟悉crm"), ["CRM", "crm", "CRM"])
+        self.assertIs(compile_keywords(["沟通", "转化"]), compile_keywords(("沟通", "转化")))
+
+
+class TestComputeScores(unittest.TestCase):
+
+    def test_scores_and_evidence(self):
+        rule = {"must_have": "沟通;转化;CRM", "nice_to_have": "续费", "exclude_keywords": "频繁跳槽", "min_years": "1"}
+        weights = {"skill_fit": 0.45, "exp_relevance": 0.25, "stability": 0.15, "growth": 0.15}
+        row = {"skills": "沟通 crm", "projects": "转化提升、复盘、培训", "text_raw": "频繁跳槽", "companies": "在线教育", "years": 3}
+        scores, evidence, conf = compute_scores(rule, row, weights, ["在线教育"])
+        self.assertEqual(scores["skill_fit"], 0.375)
+        self.assertEqual(scores["growth"], 0.6)
+        self.assertEqual(evidence, ["命中:沟通", "命中:转化", "命中:CRM", "触发排除:频繁跳槽"])
+        self.assertEqual(conf, 0.6)
+
+    def test_vectorized_matches_row_wise(self):
+        rnd = random.Random(11)
+        rule = {"must_have": "沟通;转化;CRM;沟通", "nice_to_have": "续费;K12", "exclude_keywords": "频繁跳槽;实习", "min_years": "2"}
+        weights = {"skill_fit": 0.45, "exp_relevance": 0.25, "stability": 0.15, "growth": 0.15}
+        whitelist = ["在线教育", "K12"]
+        words = ["沟通", "crm", "转化", "续费", "k12", "频繁跳槽", "复盘", "ROI", "主导", "学习", "  ", "销售"]
+        rows = []
+        for _ in range(300):
+            rows.append({
+                "id": str(rnd.random()),
+                "skills": " ".join(rnd.choice(words) for _ in range(rnd.randint(0, 6))),
+                "projects": " ".join(rnd.choice(words) for _ in range(rnd.randint(0, 6))),
+                "text_raw": rnd.choice([None, " ".join(rnd.choice(words) for _ in range(rnd.randint(0, 20)))]),
+                "companies": rnd.choice(["", "在线教育", "A/B", "A/ /B/C", "K12/在线教育/", " / "]),
+                "years": rnd.choice([0, 0.5, 1, 2, 3.5, 8, 12]),
+            })
+        df = pd.DataFrame(rows)
+        frame = compute_scores_frame(rule, df, weights, whitelist, evidence_max=2)
+        for i, row in enumerate(rows):
+            scores, evidence, conf = compute_scores(rule, row, weights, whitelist, evidence_max=2)
+            for key, value in scores.items():
+                self.assertTrue(np.isclose(frame.iloc[i][key], value, atol=1e-4), (i, key))
+            self.assertEqual(frame.iloc[i]["evidence"], evidence)
+            self.assertAlmostEqual(frame.iloc[i]["confidence"], conf, places=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+LLM 响应缓存测试
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from backend.services import ai_client
+from backend.services.ai_client import AIConfig, chat_completion
+from backend.services.llm_cache import LLMResponseCache, make_cache_key, should_cache
+
+
+class _FakeCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **params):
+        self.calls += 1
+        message = SimpleNamespace(content=f"answer-{self.calls}", role="assistant")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _fake_client():
+    return SimpleNamespace(chat=SimpleNamespace(completions=_FakeCompletions()))
+
+
+def _response(content):
+    return {"choices": [{"message": {"content": content, "role": "assistant"}}]}
+
+
+class TestLLMResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = LLMResponseCache(Path(self.tmp.name) / "llm.db")
+
+    def tearDown(self):
+        if self.cache._conn is not None:
+            self.cache._conn.close()
+        self.tmp.cleanup()
+
+    def test_key_normalizes_whitespace(self):
+        a = make_cache_key("openai", "m", [{"role": "user", "content": "你好  世界\r\n"}], 0, 32)
+        b = make_cache_key("openai", "m", [{"role": "user", "content": "你好 世界"}], 0, 32)
+        c = make_cache_key("openai", "m", [{"role": "user", "content": "你好 世界"}], 0, 64)
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_hit_miss_counters(self):
+        self.assertIsNone(self.cache.get("k"))
+        self.cache.put("k", _response("v"))
+        self.assertEqual(self.cache.get("k")["choices"][0]["message"]["content"], "v")
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+
+    def test_ttl_expiry(self):
+        self.cache.ttl_seconds = 10
+        with mock.patch("backend.services.llm_cache.time.time", return_value=1000.0):
+            self.cache.put("k", _response("v"))
+        with mock.patch("backend.services.llm_cache.time.time", return_value=1011.0):
+            self.assertIsNone(self.cache.get("k"))
+
+    def test_lru_eviction(self):
+        self.cache.max_entries = 2
+        self.cache.ttl_seconds = 0
+        with mock.patch("backend.services.llm_cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0, 5.0]):
+            self.cache.put("a", _response("1"))
+            self.cache.put("b", _response("2"))
+            self.cache.get("a")
+            self.cache.put("c", _response("3"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNotNone(self.cache.get("c"))
+
+    def test_should_cache_modes(self):
+        with mock.patch.dict(os.environ, {"LLM_CACHE_MODE": "deterministic"}):
+            self.assertTrue(should_cache(0.0))
+            self.assertFalse(should_cache(0.4))
+            self.assertTrue(should_cache(0.4, cache=True))
+            self.assertFalse(should_cache(0.0, cache=False))
+        with mock.patch.dict(os.environ, {"LLM_CACHE_MODE": "off"}):
+            self.assertFalse(should_cache(0.0))
+
+    def test_chat_completion_uses_cache_for_deterministic_calls(self):
+        client = _fake_client()
+        cfg = AIConfig(provider="openai", api_key="x", base_url="http://localhost", model="m", temperature=0.7)
+        messages = [{"role": "user", "content": "提取姓名"}]
+        with mock.patch.object(ai_client, "get_llm_cache", return_value=self.cache), \
+                mock.patch.dict(os.environ, {"LLM_CACHE_MODE": "deterministic"}):
+            first = chat_completion(client, cfg, messages=messages, temperature=0.0, max_tokens=32)
+            second = chat_completion(client, cfg, messages=messages, temperature=0.0, max_tokens=32)
+            chat_completion(client, cfg, messages=messages, temperature=0.0, max_tokens=32, cache=False)
+            chat_completion(client, cfg, messages=messages, temperature=0.7, max_tokens=32)
+        self.assertEqual(first, second)
+        self.assertEqual(client.chat.completions.calls, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
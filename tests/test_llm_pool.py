@@ -0,0 +1,79 @@
+"""
+LLM 客户端连接池与异步调用测试
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import httpx
+
+from backend.services import ai_client, llm_pool
+from backend.services.ai_client import AIConfig, achat_completion
+
+
+class TestLLMPool(unittest.TestCase):
+
+    def tearDown(self):
+        llm_pool.close_all()
+
+    def test_sync_client_is_reused(self):
+        a = llm_pool.get_openai_client("k1", "http://localhost:1/v1")
+        b = llm_pool.get_openai_client("k1", "http://localhost:1/v1")
+        c = llm_pool.get_openai_client("k2", "http://localhost:1/v1")
+        self.assertIs(a, b)
+        self.assertIsNot(a, c)
+        # 不同 key 的客户端共享同一个 httpx 连接池
+        self.assertIs(a._client, c._client)
+
+    def test_old_sdk_without_default_client_falls_back_to_httpx(self):
+        old_sdk = SimpleNamespace()
+        with mock.patch.dict("sys.modules", {"anthropic": old_sdk}):
+            sync_client = llm_pool._sdk_http_client("anthropic", is_async=False)
+            async_client = llm_pool._sdk_http_client("anthropic", is_async=True)
+        try:
+            self.assertIs(type(sync_client), httpx.Client)
+            self.assertIs(type(async_client), httpx.AsyncClient)
+            self.assertTrue(sync_client.follow_redirects)
+        finally:
+            sync_client.close()
+            asyncio.run(async_client.aclose())
+
+    def test_async_client_is_reused_within_loop(self):
+        async def _get_pair():
+            return (
+                llm_pool.get_async_openai_client("k", "http://localhost:1/v1"),
+                llm_pool.get_async_openai_client("k", "http://localhost:1/v1"),
+            )
+
+        first, second = asyncio.run(_get_pair())
+        self.assertIs(first, second)
+
+
+class _FakeAsyncCompletions:
+    def __init__(self):
+        self.params = None
+
+    async def create(self, **params):
+        self.params = params
+        message = SimpleNamespace(content="异步结果", role="assistant")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class TestAchatCompletion(unittest.TestCase):
+
+    def test_returns_chat_completion_shape(self):
+        completions = _FakeAsyncCompletions()
+        fake = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        cfg = AIConfig(provider="siliconflow", api_key="k", base_url="http://localhost:1/v1", model="m", temperature=0.5)
+        messages = [{"role": "developer", "content": "系统提示"}, {"role": "user", "content": "你好"}]
+        with mock.patch.object(ai_client, "get_async_openai_client", return_value=fake):
+            result = asyncio.run(achat_completion(cfg, messages, max_tokens=16, cache=False))
+        self.assertEqual(result["choices"][0]["message"]["content"], "异步结果")
+        self.assertEqual(completions.params["messages"][0]["role"], "system")
+        self.assertEqual(completions.params["max_tokens"], 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
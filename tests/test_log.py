@@ -0,0 +1,84 @@
+"""
+结构化日志测试
+"""
+
+import io
+import json
+import logging
+import unittest
+from unittest import mock
+
+from backend.utils.log import configure_logging, get_logger, parse_module_levels
+
+
+class _Counted:
+    """记录被格式化的次数"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "counted"
+
+
+class TestLog(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = io.StringIO()
+
+    def tearDown(self):
+        configure_logging(level="INFO", module_levels="", json_format=False, log_file="")
+
+    def test_parse_module_levels(self):
+        levels = parse_module_levels("a.b=DEBUG, c = warning,bad,d=NOPE")
+        self.assertEqual(levels, {"a.b": logging.DEBUG, "c": logging.WARNING})
+
+    def test_debug_is_lazy_when_disabled(self):
+        configure_logging(level="INFO", module_levels="", json_format=False, log_file="", stream=self.stream)
+        logger = get_logger("backend.services.scoring_graph")
+        value = _Counted()
+        logger.debug("S5: %s", value)
+        self.assertEqual(value.calls, 0)
+        self.assertEqual(self.stream.getvalue(), "")
+        logger.info("done %s", value)
+        self.assertEqual(value.calls, 1)
+        self.assertIn("[INFO] backend.services.scoring_graph: done counted", self.stream.getvalue())
+
+    def test_module_level_override(self):
+        configure_logging(level="WARNING", module_levels="backend.services.scoring_graph=DEBUG",
+                          json_format=False, log_file="", stream=self.stream)
+        get_logger("backend.services.scoring_graph").debug("graph debug")
+        get_logger("backend.services.field_generators").info("fields info")
+        output = self.stream.getvalue()
+        self.assertIn("graph debug", output)
+        self.assertNotIn("fields info", output)
+
+        # 重新配置后之前的模块级别不再生效
+        configure_logging(level="WARNING", module_levels="", json_format=False, log_file="", stream=self.stream)
+        self.assertFalse(get_logger("backend.services.scoring_graph").isEnabledFor(logging.DEBUG))
+
+    def test_json_sink(self):
+        configure_logging(level="DEBUG", module_levels="", json_format=True, log_file="", stream=self.stream)
+        get_logger("backend.services.ai_matcher_ultra").info("评分完成 %d份", 3, extra={"resumes": 3})
+        entry = json.loads(self.stream.getvalue().strip())
+        self.assertEqual(entry["level"], "INFO")
+        self.assertEqual(entry["logger"], "backend.services.ai_matcher_ultra")
+        self.assertEqual(entry["msg"], "评分完成 3份")
+        self.assertEqual(entry["resumes"], 3)
+
+    def test_engine_error_is_warning_at_default_level(self):
+        from backend.services.ai_matcher_ultra import ai_score_one_ultra
+
+        configure_logging(level="INFO", module_levels="", json_format=False, log_file="", stream=self.stream)
+        engine = mock.Mock()
+        engine.score.return_value = {"error_code": "SCORING_ERROR", "error_message": "boom", "总分": 0}
+        ai_score_one_ultra("JD", "简历", "课程顾问", engine=engine)
+        output = self.stream.getvalue()
+        self.assertIn("[WARNING] backend.services.ai_matcher_ultra: Ultra引擎返回错误: SCORING_ERROR - boom", output)
+        self.assertIn("未生成highlight_tags", output)
+        self.assertNotIn("[DEBUG]", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
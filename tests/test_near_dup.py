@@ -0,0 +1,113 @@
+"""
+近似重复简历检测测试（MinHash + LSH）
+"""
+
+import os
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from backend.core.near_dup import (
+    NUM_PERM,
+    cluster_signatures,
+    estimate_jaccard,
+    mark_near_duplicates,
+    minhash_signature,
+    propagate_scores,
+    split_representatives,
+)
+from backend.services import resume_parser
+from tests.fixtures import FakeUpload, ParseCacheTestCase
+
+BASE = (
+    "张伟，五年K12在线教育课程顾问经验，负责家长电话邀约、试听课转化与续费。"
+    "2019-2024 在某教育科技公司担任高级课程顾问，月均签单30单，转化率提升15%。"
+    "熟悉CRM系统、社群运营与私域流量转化，带领三人小组完成季度业绩目标。"
+    "本科，市场营销专业，普通话二甲，能适应周末排班。"
+)
+EDITED = BASE.replace("月均签单30单", "月均签单32单")
+OTHER = (
+    "李娜，三年Java后端开发经验，熟悉Spring Boot、MySQL、Redis与Kafka，"
+    "参与订单系统重构，接口平均响应时间降低40%，负责微服务拆分与监控告警体系建设。"
+)
+
+
+class TestMinHash(unittest.TestCase):
+
+    def test_signature_shape_and_determinism(self):
+        sig = minhash_signature(BASE)
+        self.assertEqual(sig.shape, (NUM_PERM,))
+        np.testing.assert_array_equal(sig, minhash_signature(BASE))
+        self.assertIsNone(minhash_signature("  \n"))
+
+    def test_whitespace_and_punctuation_ignored(self):
+        spaced = BASE.replace("，", " , ").replace("。", "\n")
+        self.assertEqual(estimate_jaccard(minhash_signature(BASE), minhash_signature(spaced)), 1.0)
+
+    def test_small_edit_clusters_but_different_resume_does_not(self):
+        sigs = [minhash_signature(t) for t in (BASE, OTHER, EDITED, "")]
+        self.assertGreater(estimate_jaccard(sigs[0], sigs[2]), 0.85)
+        self.assertEqual(cluster_signatures(sigs, threshold=0.85), [0, 1, 0, 3])
+
+
+class TestScorePropagation(unittest.TestCase):
+
+    def test_only_representatives_scored_and_scores_copied(self):
+        df = pd.DataFrame({
+            "candidate_id": [1, 2, 3],
+            "file": ["a.pdf", "b.pdf", "a.docx"],
+            "name": ["张伟", "李娜", "张伟"],
+            "resume_text": [BASE, OTHER, EDITED],
+        })
+        marked = mark_near_duplicates(df, threshold=0.85)
+        self.assertEqual(list(marked["near_dup_of"]), [1, 2, 1])
+
+        reps, dups = split_representatives(marked)
+        self.assertEqual(list(reps["candidate_id"]), [1, 2])
+        scored = reps.assign(总分=[88, 60])
+        merged = propagate_scores(scored, dups)
+        self.assertEqual(list(merged["candidate_id"]), [1, 2, 3])
+        self.assertEqual(list(merged["总分"]), [88, 60, 88])
+        self.assertEqual(merged.iloc[2]["file"], "a.docx")
+        self.assertEqual(merged.iloc[2]["near_duplicate_of"], "a.pdf")
+
+
+class TestSignatureFromParsing(ParseCacheTestCase):
+
+    def test_worker_signature_matches_parent_and_cache_hits(self):
+        Path("a.txt").write_text(BASE, encoding="utf-8")
+        first = resume_parser.parse_files_parallel([Path("a.txt")], max_workers=2, timeout=30, signatures=True)[0]
+        cached = resume_parser.parse_files_parallel([Path("a.txt")], max_workers=2, timeout=30, signatures=True)[0]
+        expected = minhash_signature(first["text"])
+        np.testing.assert_array_equal(first["minhash"], expected)
+        np.testing.assert_array_equal(cached["minhash"], expected)
+
+    def test_signatures_returned_outside_dataframe(self):
+        uploads = [FakeUpload("a.txt", BASE), FakeUpload("b.txt", EDITED), FakeUpload("c.txt", OTHER)]
+        with mock.patch.dict(os.environ, {"RESUME_NEAR_DUP": "1"}):
+            df, signatures = resume_parser.parse_uploaded_files_with_signatures(uploads, max_workers=1, timeout=0)
+        self.assertNotIn("minhash", df.columns)
+        self.assertEqual(sorted(signatures), [1, 2, 3])
+        np.testing.assert_array_equal(signatures[3], minhash_signature(OTHER))
+        marked = mark_near_duplicates(df, signatures, threshold=0.85)
+        self.assertEqual(list(marked["near_dup_of"]), [1, 1, 3])
+
+        plain = resume_parser.parse_uploaded_files_to_df(uploads, max_workers=1, timeout=0)
+        self.assertNotIn("minhash", plain.columns)
+
+    def test_signatures_skipped_when_disabled(self):
+        with mock.patch.dict(os.environ, {"RESUME_NEAR_DUP": "0"}), \
+                mock.patch.object(resume_parser, "minhash_signature") as signature:
+            df, signatures = resume_parser.parse_uploaded_files_with_signatures(
+                [FakeUpload("a.txt", BASE)], max_workers=1, timeout=0
+            )
+        self.assertEqual(signatures, {})
+        self.assertNotIn("minhash", df.columns)
+        signature.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
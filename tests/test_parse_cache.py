@@ -0,0 +1,77 @@
+"""
+简历解析缓存测试
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from backend.services import resume_parser
+from backend.services.parse_cache import ParseCache, parse_cache_key
+from tests.fixtures import FakeUpload, ParseCacheTestCase
+
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ParseCache(Path(self.tmp.name) / "parse_cache.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_depends_on_bytes_and_parser_version(self):
+        self.assertEqual(parse_cache_key(b"abc", "1"), parse_cache_key(b"abc", "1"))
+        self.assertNotEqual(parse_cache_key(b"abc", "1"), parse_cache_key(b"abd", "1"))
+        self.assertNotEqual(parse_cache_key(b"abc", "1"), parse_cache_key(b"abc", "2"))
+
+    def test_put_get_and_set_name(self):
+        result = {"text": "正文", "email": "a@b.com", "phone": "13800000000", "method": "ocr"}
+        self.cache.put("k", result, file="a.pdf")
+        self.cache.set_name("k", "张伟", file="a.pdf")
+        cached = ParseCache(self.cache.path).get("k")
+        self.assertEqual(cached["text"], "正文")
+        self.assertEqual(cached["method"], "ocr")
+        self.assertEqual((cached["name"], cached["file"]), ("张伟", "a.pdf"))
+        self.assertIsNone(self.cache.get("missing"))
+
+    def test_size_bounded_eviction(self):
+        cache = ParseCache(self.cache.path, max_entries=100, max_bytes=25)
+        with mock.patch("backend.services.parse_cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+            cache.put("old", {"text": "x" * 10}, file="old.txt")
+            cache.put("mid", {"text": "y" * 10}, file="mid.txt")
+            cache.get("old")
+            cache.put("new", {"text": "z" * 10}, file="new.txt")
+        self.assertIsNone(cache.get("mid"))
+        self.assertIsNotNone(cache.get("old"))
+        self.assertIsNotNone(cache.get("new"))
+        self.assertEqual(cache.evictions, 1)
+
+
+class TestResumeParserUsesCache(ParseCacheTestCase):
+
+    def test_parse_one_to_text_hits_cache(self):
+        path = Path("resume.txt")
+        path.write_text("姓名：张伟\n手机：13800001234", encoding="utf-8")
+        first = resume_parser.parse_one_to_text(path)
+        with mock.patch.object(resume_parser, "_parse_file_with_method") as parse:
+            second = resume_parser.parse_one_to_text(Path("resume.txt"))
+        parse.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertEqual(second[1]["phone"], "13800001234")
+
+    def test_reupload_reuses_text_and_name(self):
+        upload = FakeUpload("李娜简历.txt", "姓名：李娜\n邮箱：lina@example.com\n课程顾问")
+        first = resume_parser.parse_uploaded_files_to_df([upload], max_workers=1, timeout=0)
+        with mock.patch.object(resume_parser, "_parse_file_with_method") as parse, \
+                mock.patch.object(resume_parser, "infer_candidate_name") as infer:
+            second = resume_parser.parse_uploaded_files_to_df([upload], max_workers=1, timeout=0)
+        parse.assert_not_called()
+        infer.assert_not_called()
+        self.assertTrue(first.equals(second))
+        self.assertEqual(second.iloc[0]["name"], "李娜")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+RecruitPipeline 增量评分测试
+"""
+
+import json
+import sqlite3
+import unittest
+import uuid
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+from backend.services.pipeline import RecruitPipeline
+from backend.storage.db import get_db
+from tests.fixtures import CFG_PATH, PipelineTestCase
+
+RESUMES = pd.DataFrame([
+    {"name": "甲", "skills": "沟通 CRM", "companies": "在线教育", "years": 3, "text_raw": "转化 复盘"},
+    {"name": "乙", "skills": "销售", "companies": "A/B", "years": 1, "text_raw": "频繁跳槽"},
+])
+
+
+class TestIncrementalScoreAll(PipelineTestCase):
+
+    def make_pipeline(self) -> RecruitPipeline:
+        Path("data/templates").mkdir(parents=True)
+        self._write_rule("沟通;转化;CRM")
+        self.cfg_path = Path(self.tmp.name) / "model_config.json"
+        self.cfg_path.write_text(CFG_PATH.read_text(encoding="utf-8"), encoding="utf-8")
+        return RecruitPipeline(cfg_path=str(self.cfg_path))
+
+    def _write_rule(self, must: str):
+        Path("data/templates/岗位配置示例.csv").write_text(
+            f"job,must_have,nice_to_have,exclude_keywords,min_years\n课程顾问,{must},续费,频繁跳槽,1\n", encoding="utf-8"
+        )
+
+    def _score_rows(self):
+        conn = get_db()
+        rows = conn.execute("SELECT resume_id, is_current FROM score").fetchall()
+        conn.close()
+        return rows
+
+    def test_only_new_resumes_are_scored(self):
+        self.pipe.ingest_resumes_df(RESUMES.copy())
+        first = self.pipe.score_all("课程顾问")
+        self.assertEqual(list(first["name"]), ["甲", "乙"])
+        self.assertEqual(list(first["blocked_by_threshold"]), [False, True])
+
+        again = self.pipe.score_all("课程顾问")
+        self.assertEqual(len(self._score_rows()), 2)
+        pd.testing.assert_frame_equal(first, again)
+
+        self.pipe.ingest_resumes_df(pd.DataFrame([{"name": "丙", "skills": "沟通 转化 CRM", "years": 5, "companies": "K12"}]))
+        merged = self.pipe.score_all("课程顾问")
+        self.assertEqual(len(self._score_rows()), 3)
+        self.assertEqual(merged.iloc[0]["name"], "丙")
+        self.assertEqual(len(merged), 3)
+
+    def test_rule_or_weight_change_supersedes_scores(self):
+        self.pipe.ingest_resumes_df(RESUMES.copy())
+        self.pipe.score_all("课程顾问")
+        self._write_rule("沟通")
+        rescored = self.pipe.score_all("课程顾问")
+        rows = self._score_rows()
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(sum(current for _, current in rows), 2)
+        self.assertEqual(len(rescored), 2)
+
+        cfg = json.loads(self.cfg_path.read_text(encoding="utf-8"))
+        cfg["scoring_weights"]["growth"] = 0.3
+        self.pipe.cfg = cfg
+        self.pipe.score_all("课程顾问")
+        self.assertEqual(sum(current for _, current in self._score_rows()), 2)
+
+    def test_force_rescores_everything(self):
+        self.pipe.ingest_resumes_df(RESUMES.copy())
+        self.pipe.score_all("课程顾问")
+        out = self.pipe.score_all("课程顾问", force=True)
+        self.assertEqual(len(out), 2)
+        self.assertEqual(len(self._score_rows()), 4)
+
+    def test_failed_insert_keeps_previous_scores_current(self):
+        self.pipe.ingest_resumes_df(RESUMES.copy())
+        self.pipe.score_all("课程顾问")
+        # 新评分主键重复，写到第二行时失败：旧评分的失效也应一并回滚
+        with mock.patch("uuid.uuid4", return_value=uuid.UUID(int=1)), self.assertRaises(sqlite3.IntegrityError):
+            self.pipe.score_all("课程顾问", force=True)
+        rows = self._score_rows()
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(sum(current for _, current in rows), 2)
+        self.assertEqual(len(self.pipe.score_all("课程顾问")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
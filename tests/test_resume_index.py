@@ -0,0 +1,162 @@
+"""
+BM25 简历索引测试
+"""
+
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+from backend.services import resume_index
+from backend.services.resume_index import BM25Index, tokenize
+from tests.fixtures import PipelineTestCase
+
+DOCS = [
+    ("sales", "在线教育课程顾问，负责家长邀约与试听转化，熟悉CRM"),
+    ("java", "Java后端开发，熟悉Spring与MySQL，负责订单系统"),
+    ("teacher", "K12数学老师，负责课程设计与学员跟进"),
+    ("ops", "社群运营，负责私域拉新与活动策划"),
+]
+
+
+class TestBM25Index(unittest.TestCase):
+
+    def test_tokenize_cjk_bigrams_and_words(self):
+        self.assertEqual(tokenize("熟悉CRM系统 A"), ["熟悉", "crm", "系统"])
+        self.assertEqual(tokenize("会 Java"), ["会", "java"])
+
+    def test_search_ranks_relevant_resume_first(self):
+        index = BM25Index()
+        index.add_documents(DOCS)
+        hits = index.search("招聘课程顾问：试听转化、CRM", top_k=2)
+        self.assertEqual(hits[0][0], "sales")
+        self.assertLessEqual(len(hits), 2)
+        self.assertEqual(index.search("区块链", top_k=5), [])
+
+    def test_incremental_segments_match_full_build(self):
+        full = BM25Index()
+        full.add_documents(DOCS)
+        full.compact()
+        incremental = BM25Index()
+        with mock.patch.object(resume_index, "COMPACT_THRESHOLD", 10):
+            for doc in DOCS:
+                incremental.add_documents([doc])
+        incremental.add_documents([DOCS[0]])  # 重复 id 忽略
+        self.assertEqual(len(incremental), len(DOCS))
+        query = "负责课程与学员跟进，熟悉Java"
+        expected = full.search(query, 4)
+        actual = incremental.search(query, 4)
+        self.assertEqual([d for d, _ in actual], [d for d, _ in expected])
+        for (_, a), (_, b) in zip(actual, expected):
+            self.assertAlmostEqual(a, b, places=4)
+
+    def test_save_and_load_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            index = BM25Index()
+            index.add_documents(DOCS[:2])
+            index.compact()
+            index.add_documents(DOCS[2:])
+            index.last_rowid = 4
+            index.save(Path(tmp))
+            loaded = BM25Index.load(Path(tmp))
+            self.assertEqual(loaded.last_rowid, 4)
+            self.assertEqual(loaded.search("课程 跟进", 4), index.search("课程 跟进", 4))
+
+    def test_incremental_save_appends_delta_only(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            index = BM25Index()
+            index.add_documents(DOCS[:2])
+            index.last_rowid = 2
+            index.save(directory)
+            base_names = ("main.npz", "docs.npz", "vocab.json", "meta.json")
+            base_files = {name: (directory / name).stat().st_mtime_ns for name in base_names}
+
+            for rowid, doc in enumerate(DOCS[2:], start=3):
+                index.add_documents([doc])
+                index.last_rowid = rowid
+                index.save(directory)
+
+            self.assertEqual({name: (directory / name).stat().st_mtime_ns for name in base_files}, base_files)
+            self.assertEqual(len((directory / "delta.jsonl").read_text(encoding="utf-8").splitlines()), 2)
+            loaded = BM25Index.load(directory)
+            self.assertEqual(len(loaded), len(DOCS))
+            self.assertEqual(loaded.last_rowid, 4)
+            self.assertEqual(loaded.search("课程 跟进 运营", 4), index.search("课程 跟进 运营", 4))
+
+            # 合并后重写基线并清空日志
+            loaded.compact()
+            loaded.save(directory)
+            self.assertEqual((directory / "delta.jsonl").read_text(encoding="utf-8"), "")
+            self.assertEqual(BM25Index.load(directory).search("课程 跟进", 4), index.search("课程 跟进", 4))
+
+    def test_rebuild_after_rowid_rollback_replaces_base(self):
+        def resume_db(ids):
+            conn = sqlite3.connect(":memory:")
+            conn.execute("CREATE TABLE resume (id TEXT, skills TEXT, projects TEXT, companies TEXT, edu TEXT, text_raw TEXT)")
+            conn.executemany("INSERT INTO resume VALUES (?, '', '', '', '', ?)", [(i, f"课程顾问 {i}") for i in ids])
+            return conn
+
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(resume_index._indexes, clear=True):
+            directory = Path(tmp)
+            resume_index.refresh_resume_index(resume_db([f"old{i}" for i in range(5)]), directory)
+            # 库被重建：rowid 回退，内存中换成新建的索引
+            rebuilt = resume_index.refresh_resume_index(resume_db(["new0", "new1"]), directory)
+            self.assertEqual(rebuilt.doc_ids, ["new0", "new1"])
+            loaded = BM25Index.load(directory)
+            self.assertEqual(loaded.doc_ids, ["new0", "new1"])
+            self.assertEqual(loaded.last_rowid, 2)
+
+    def test_old_format_is_replaced_on_first_save(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            (directory / "meta.json").write_text(json.dumps({"version": 1, "docs": 0}), encoding="utf-8")
+            for _ in range(3):  # 模拟多次进程启动
+                index = BM25Index.load(directory)
+                index.add_documents(DOCS)
+                index.save(directory)
+            self.assertEqual(json.loads((directory / "meta.json").read_text(encoding="utf-8"))["version"],
+                             resume_index.INDEX_FORMAT_VERSION)
+            self.assertEqual((directory / "delta.jsonl").read_text(encoding="utf-8"), "")
+            self.assertEqual(len(BM25Index.load(directory)), len(DOCS))
+
+    def test_torn_delta_tail_is_dropped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            index = BM25Index()
+            index.add_documents(DOCS[:2])
+            index.last_rowid = 2
+            index.save(directory)
+            index.add_documents(DOCS[2:3])
+            index.last_rowid = 3
+            index.save(directory)
+            with open(directory / "delta.jsonl", "a", encoding="utf-8") as f:
+                f.write('{"generation": "x", "doc_ids": ["ops"')
+
+            loaded = BM25Index.load(directory)
+            self.assertEqual(len(loaded), 3)
+            self.assertEqual(loaded.last_rowid, 3)
+            loaded.add_documents(DOCS[3:])
+            loaded.last_rowid = 4
+            loaded.save(directory)
+            self.assertEqual(len(BM25Index.load(directory)), len(DOCS))
+
+
+class TestPipelineRetrieval(PipelineTestCase):
+
+    def test_ingest_updates_index_and_retrieve_returns_rows(self):
+        self.pipe.ingest_resumes_df(pd.DataFrame([{"name": n, "text_raw": t} for n, t in DOCS]))
+        self.assertTrue((resume_index.DEFAULT_INDEX_DIR / "meta.json").exists())
+        self.pipe.ingest_text_resume("姓名：王五\n课程顾问，试听转化率第一")
+        out = self.pipe.retrieve_resumes("课程顾问 试听转化", top_k=2)
+        self.assertEqual(len(out), 2)
+        self.assertEqual(set(out["name"]), {"sales", "王五"})
+        self.assertTrue(out["bm25_score"].is_monotonic_decreasing)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+PDF 页面级选择性 OCR 测试
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import fitz
+from PIL import Image
+
+from backend.services import resume_parser
+
+TEXT_PAGE = "张伟 课程顾问 手机 13800001234 三年教育行业销售经验，负责试听转化与续费。" * 3
+
+
+def _png_bytes() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (200, 100), "white").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class TestSelectiveOcr(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "mixed.pdf"
+        doc = fitz.open()
+        page = doc.new_page()  # 第 0 页：有文字层
+        page.insert_textbox(fitz.Rect(72, 72, 520, 400), TEXT_PAGE, fontname="china-s")
+        page = doc.new_page()  # 第 1 页：扫描页（只有图片）
+        page.insert_image(fitz.Rect(0, 0, 595, 842), stream=_png_bytes())
+        doc.new_page()  # 第 2 页：空白页
+        doc.save(str(self.path))
+        doc.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_only_scanned_pages_are_rasterized(self):
+        with mock.patch.object(resume_parser, "_ocr_image", return_value="扫描页识别出的工作经历 " * 5) as ocr:
+            extracted = resume_parser._extract_pdf(self.path)
+        self.assertEqual((extracted["ocr_pages"], extracted["pages"]), (1, 3))
+        self.assertEqual(ocr.call_count, 1)
+        self.assertEqual(extracted["method"], "fitz+ocr")
+        self.assertIn("扫描页识别出的工作经历", extracted["text"])
+        self.assertIn("课程顾问", extracted["text"])
+
+    def test_document_is_opened_once(self):
+        real_open = fitz.open
+        with mock.patch.object(resume_parser, "_ocr_image", return_value="扫描页识别出的工作经历 " * 5), \
+                mock.patch.object(resume_parser.fitz, "open", side_effect=real_open) as opened:
+            result = resume_parser._parse_file_with_method(self.path)
+        self.assertEqual(opened.call_count, 1)
+        self.assertEqual(result["method"], "fitz+ocr")
+        self.assertEqual(result["phone"], "13800001234")
+
+    def test_metrics_count_winning_strategy(self):
+        resume_parser.reset_parse_metrics()
+        with mock.patch.object(resume_parser, "_ocr_image", return_value=""):
+            resume_parser.parse_one_to_text(self.path, use_cache=False)
+        metrics = resume_parser.get_parse_metrics()
+        self.assertEqual(metrics["files"], 1)
+        self.assertEqual(metrics["method:fitz"], 1)
+        self.assertEqual((metrics["pdf_pages"], metrics["ocr_pages"]), (3, 1))
+
+    def test_force_includes_low_text_pages_without_images(self):
+        layers = [
+            resume_parser.PdfPageLayers(text=""),
+            resume_parser.PdfPageLayers(text="x" * 50),
+            resume_parser.PdfPageLayers(text="", has_images=True),
+        ]
+        self.assertEqual(resume_parser._select_ocr_pages(layers, force=False), [2])
+        self.assertEqual(resume_parser._select_ocr_pages(layers, force=True), [0, 2])
+
+    def test_dpi_adapts_to_page_size(self):
+        doc = fitz.open()
+        doc.new_page(width=595, height=842)
+        doc.new_page(width=1191, height=1684)
+        doc.new_page(width=200, height=300)
+        a4, a2, small = doc[0], doc[1], doc[2]
+        self.assertEqual(resume_parser._ocr_dpi(a4), 299)
+        self.assertLess(resume_parser._ocr_dpi(a2), 200)
+        self.assertEqual(resume_parser._ocr_dpi(small), resume_parser.OCR_MAX_DPI)
+        image = resume_parser._render_page_for_ocr(a4)
+        self.assertEqual(image.mode, "L")
+        self.assertAlmostEqual(image.height, 842 * 299 / 72, delta=2)
+        doc.close()
+
+    def test_ocr_threads_split_across_parse_processes(self):
+        with mock.patch.object(resume_parser.os, "cpu_count", return_value=8), \
+                mock.patch.dict(os.environ, {"RESUME_OCR_WORKERS": "4"}):
+            self.assertEqual(resume_parser.ocr_workers_per_process(1), 4)
+            self.assertEqual(resume_parser.ocr_workers_per_process(4), 2)
+            self.assertEqual(resume_parser.ocr_workers_per_process(16), 1)
+
+    def test_process_pool_caps_ocr_threads(self):
+        with mock.patch.object(resume_parser, "run_bounded_processes", return_value=[{"text": ""}] * 2) as pool, \
+                mock.patch.object(resume_parser.os, "cpu_count", return_value=4), \
+                mock.patch.dict(os.environ, {"RESUME_OCR_WORKERS": "4", "RESUME_PARSE_CACHE": "0"}):
+            resume_parser.parse_files_parallel([self.path, self.path], max_workers=2, timeout=30)
+        self.assertEqual(pool.call_args.args[1].keywords["ocr_workers"], 2)
+
+        with mock.patch.object(resume_parser, "_ocr_image", return_value="扫描页识别出的工作经历 " * 5), \
+                mock.patch.object(resume_parser, "run_bounded", wraps=resume_parser.run_bounded) as threads:
+            resume_parser._parse_saved_file(str(self.path), ocr_workers=1)
+        self.assertEqual(threads.call_args.kwargs["max_workers"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+简历并行解析测试：顺序、candidate_id 与姓名推断
+"""
+
+import os
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from backend.services.resume_parser import parse_uploaded_files_to_df
+from tests.fixtures import FakeUpload, ParseCacheTestCase
+
+
+class TestParseUploadedFilesParallel(ParseCacheTestCase):
+
+    def test_keeps_order_and_candidate_ids(self):
+        names = ["张伟", "李娜", "王芳", "刘洋"]
+        files = [
+            FakeUpload(f"resume_{i}.txt", f"姓名：{name}\n手机：1380000{i:04d}\n课程顾问，三年销售经验。")
+            for i, name in enumerate(names)
+        ]
+        files.insert(2, FakeUpload("notes.md", "不支持的格式"))
+
+        df = parse_uploaded_files_to_df(files, max_workers=2, timeout=30)
+
+        self.assertEqual(list(df["candidate_id"]), [1, 2, 3, 4])
+        self.assertEqual(list(df["file"]), [f"resume_{i}.txt" for i in range(4)])
+        self.assertEqual(list(df["name"]), names)
+        self.assertEqual(df.iloc[3]["phone"], "13800000003")
+        self.assertEqual(len(list(Path("data/uploads").glob("*/resume_0.txt"))), 1)
+
+    def test_same_filename_in_one_batch(self):
+        files = [
+            FakeUpload("简历.txt", "姓名：张伟\n手机：13800000001\n邮箱：zw@example.com"),
+            FakeUpload("简历.txt", "姓名：李娜\n手机：13900000002\n邮箱：ln@example.com"),
+        ]
+
+        df = parse_uploaded_files_to_df(files, max_workers=1, timeout=0)
+
+        self.assertEqual(list(df["file"]), ["简历.txt", "简历.txt"])
+        self.assertEqual(list(df["name"]), ["张伟", "李娜"])
+        self.assertEqual(list(df["phone"]), ["13800000001", "13900000002"])
+        self.assertEqual(list(df["email"]), ["zw@example.com", "ln@example.com"])
+
+    def test_serial_path_matches_parallel(self):
+        files = [FakeUpload(f"r{i}.txt", f"姓名：陈{'一二三'[i]}明\n邮箱：c{i}@example.com") for i in range(3)]
+        with mock.patch.dict(os.environ, {"RESUME_PARSE_CACHE": "0"}):
+            serial = parse_uploaded_files_to_df(files, max_workers=1, timeout=0)
+            parallel = parse_uploaded_files_to_df(files, max_workers=3, timeout=30)
+        self.assertTrue(serial.equals(parallel))
+
+
+if __name__ == "__main__":
+    unittest.main()
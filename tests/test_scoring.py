@@ -6,7 +6,7 @@ import unittest
 from backend.services.scoring_graph import ScoringGraph, ScoringResult
 from backend.services.ultra_scoring_engine import UltraScoringEngine
 from backend.services.robust_parser import RobustParser
-from backend.services.ability_pool import AbilityPool
+from backend.services.ability_pool import ABILITY_POOL, ACTION_MAPPING, AbilityIndex, AbilityPool
 from backend.services.ultra_format_validator import UltraFormatValidator
 
 
@@ -201,6 +201,26 @@ class TestAbilityPool(unittest.TestCase):
         text = "负责学员管理，定期电话回访家长，跟进学习进度"
         abilities = self.pool.match_abilities(text)
         self.assertGreater(len(abilities), 0)
+    
+    def test_match_abilities_same_as_keyword_scan(self):
+        """测试预编译索引与逐关键词扫描结果一致"""
+        for text in ["负责学员管理，定期电话回访家长，跟进学习进度", "组织协调各部门推进方案落实", "爱好阅读", ""]:
+            expected = [a for a, kws in AbilityPool.ABILITY_KEYWORDS.items() if any(kw in text for kw in kws)]
+            self.assertEqual(self.pool.match_abilities(text), expected)
+    
+    def test_index_overlapping_keywords(self):
+        """测试重叠与包含关系的关键词都能命中"""
+        index = AbilityIndex.build({"甲": ["协调"], "乙": ["调研"], "丙": ["组织协调"]})
+        self.assertEqual(index.abilities_from_mask(index.match_mask("协调研")), ["甲", "乙"])
+        self.assertEqual(index.abilities_from_mask(index.match_mask("组织协调")), ["甲", "丙"])
+        self.assertEqual(index.match_mask("无关"), 0)
+    
+    def test_shared_instances(self):
+        """测试评分引擎共享模块级能力池"""
+        graph = ScoringGraph("班主任")
+        self.assertIs(graph.ability_pool, ABILITY_POOL)
+        self.assertIs(graph.action_mapping, ACTION_MAPPING)
+        self.assertEqual(ACTION_MAPPING.map_action_to_abilities("爱好", "阅读"), ["执行力"])
 
 
 class TestUltraFormatValidator(unittest.TestCase):
@@ -0,0 +1,58 @@
+"""
+岗位标准能力模型缓存测试
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from backend.services.standard_model_cache import StandardModelCache, jd_cache_key
+from backend.services.ultra_scoring_engine import UltraScoringEngine
+
+
+MODEL = {"skill_match": 85.0, "experience_match": 80.0, "stability": 75.0, "growth_potential": 70.0}
+
+
+class TestStandardModelCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "standard_model.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_ignores_surrounding_whitespace(self):
+        self.assertEqual(jd_cache_key("班主任", "JD内容"), jd_cache_key(" 班主任 ", "JD内容\n"))
+        self.assertNotEqual(jd_cache_key("班主任", "JD内容"), jd_cache_key("销售", "JD内容"))
+
+    def test_put_then_get_from_disk(self):
+        StandardModelCache(self.path).put("班主任", "JD内容", MODEL)
+        fresh = StandardModelCache(self.path)
+        self.assertEqual(fresh.get("班主任", "JD内容"), MODEL)
+        self.assertIsNone(fresh.get("班主任", "另一份JD"))
+        self.assertEqual((fresh.hits, fresh.misses), (1, 1))
+
+    def test_eviction(self):
+        cache = StandardModelCache(self.path, max_memory_entries=2, max_disk_entries=2)
+        for i in range(3):
+            cache.put("岗位", f"JD{i}", MODEL)
+        self.assertEqual(len(cache._memory), 2)
+        self.assertIsNone(StandardModelCache(self.path).get("岗位", "JD0"))
+        self.assertEqual(StandardModelCache(self.path).get("岗位", "JD2"), MODEL)
+
+
+class TestEngineStandardModelReuse(unittest.TestCase):
+
+    def test_engine_generates_standard_model_once(self):
+        engine = UltraScoringEngine("课程顾问", "负责学员管理、家长沟通、学习督导")
+        with mock.patch.object(engine, "_generate_standard_model", return_value=dict(MODEL)) as gen:
+            first = engine.get_standard_model()
+            first["skill_match"] = 0
+            self.assertEqual(engine.get_standard_model(), MODEL)
+        self.assertEqual(gen.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
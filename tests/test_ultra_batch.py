@@ -0,0 +1,63 @@
+"""
+Ultra 规则评分批量模式（进程池）测试
+"""
+
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import pandas as pd
+
+from backend.services import ai_matcher_ultra
+from backend.services.ai_matcher_ultra import ai_match_resumes_df_ultra, ai_match_resumes_df_ultra_batch
+
+JD = "岗位职责：负责家长电话邀约与试听课转化，负责学员跟进。任职要求：3年以上教育行业销售经验，熟悉CRM系统。"
+RESUMES = [
+    "张三，5年教育行业经验。负责家长电话邀约和试听课转化，月均签单30单。熟悉CRM系统并优化跟进流程。",
+    "李四，2年销售经验。带领5人团队完成季度业绩目标，续费率提升15%。参与跨部门项目，推动社群运营。",
+    "",
+    "王五，应届毕业生。2019年毕业于某师范大学，爱好阅读与跑步。",
+    "赵六，3年班主任经验。协助主管处理客户投诉与回访，组织学员活动并复盘总结。",
+]
+
+# 清空 API Key：两条路径都只走规则生成，不发起网络请求
+NO_LLM_ENV = {"SILICONFLOW_API_KEY": "", "OPENAI_API_KEY": ""}
+
+
+class TestUltraBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "candidate_id": list(range(1, len(RESUMES) + 1)),
+            "name": [f"候选人{i}" for i in range(len(RESUMES))],
+            "resume_text": RESUMES,
+        })
+
+    def test_batch_matches_serial(self):
+        with mock.patch.dict(os.environ, NO_LLM_ENV), redirect_stdout(io.StringIO()):
+            self.assertFalse(ai_matcher_ultra.llm_configured())
+            serial = ai_match_resumes_df_ultra(JD, self.df, "课程顾问")
+            batch = ai_match_resumes_df_ultra_batch(JD, self.df, "课程顾问", max_workers=2, shard_size=2)
+        self.assertEqual(len(batch), 4)
+        self.assertEqual(list(batch.columns), list(serial.columns))
+        self.assertEqual(batch.to_dict("records"), serial.to_dict("records"))
+
+    def test_failed_shard_scores_zero(self):
+        with mock.patch.dict(os.environ, NO_LLM_ENV), redirect_stdout(io.StringIO()), \
+                mock.patch.object(ai_matcher_ultra, "_worker_engine", side_effect=RuntimeError("boom")):
+            batch = ai_match_resumes_df_ultra_batch(JD, self.df, "课程顾问", max_workers=1)
+        self.assertEqual(len(batch), 4)
+        self.assertTrue((batch["总分"] == 0).all())
+        self.assertTrue(batch["short_eval"].str.contains("boom").all())
+
+    def test_llm_configured_falls_back_to_serial(self):
+        with mock.patch.object(ai_matcher_ultra, "llm_configured", return_value=True), \
+                mock.patch.object(ai_matcher_ultra, "ai_match_resumes_df_ultra", return_value="serial") as serial:
+            self.assertEqual(ai_match_resumes_df_ultra_batch(JD, self.df, "课程顾问"), "serial")
+        serial.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()